@@ -1,55 +1,38 @@
 import time
 import numpy as np
-from scipy.sparse import csr_matrix
 from scipy.sparse.csgraph import dijkstra
 from comes_path.core.solver import ComesSolver
 from comes_path.core.baselines import numba_dijkstra
+from comes_path.benchmarking.generators import grid_graph
 
-def generate_grid_graph(dim):
-    n = dim * dim
-    print(f"Generating grid graph with {n} nodes...")
-    rows = []
-    cols = []
-    data = []
-    for r in range(dim):
-        for c in range(dim):
-            u = r * dim + c
-            if c + 1 < dim:
-                v = r * dim + (c + 1)
-                rows.append(u); cols.append(v)
-                data.append(np.random.rand() + 1.0)
-            if r + 1 < dim:
-                v = (r + 1) * dim + c
-                rows.append(u); cols.append(v)
-                data.append(np.random.rand() + 1.0)
-    adj = csr_matrix((data, (rows, cols)), shape=(n, n))
-    adj = adj + adj.T
-    return adj.tocsr()
+# Single-source smoke check; `python -m comes_path.benchmarking.suite` is the
+# full multi-graph, multi-source regression suite.
 
 def run_benchmark():
     dim = 1000
     n = dim * dim
     source = 0
-    adj_csr = generate_grid_graph(dim)
+    print(f"Generating grid graph with {n} nodes...")
+    adj_csr = grid_graph(dim)
     
     print("Starting SciPy Dijkstra (C++ Heap)...")
-    start = time.time()
+    start = time.perf_counter()
     d_scipy = dijkstra(adj_csr, indices=source, directed=False)
-    print(f"SciPy Dijkstra: {time.time() - start:.4f}s")
+    print(f"SciPy Dijkstra: {time.perf_counter() - start:.4f}s")
     
     print("\nStarting Numba Dijkstra (Baseline Heap)...")
     numba_dijkstra(adj_csr.indices, adj_csr.indptr, adj_csr.data, source, 10)
-    start = time.time()
+    start = time.perf_counter()
     d_numba = numba_dijkstra(adj_csr.indices, adj_csr.indptr, adj_csr.data, source, n)
-    numba_time = time.time() - start
+    numba_time = time.perf_counter() - start
     print(f"Numba Dijkstra: {numba_time:.4f}s")
     
     print("\nStarting ComesSolver (Frontier Partitioning)...")
     solver = ComesSolver(adj_csr)
-    solver.shortest_path(source, target=10)
-    start = time.time()
+    solver.warmup()
+    start = time.perf_counter()
     d_comes = solver.shortest_path(source)
-    comes_time = time.time() - start
+    comes_time = time.perf_counter() - start
     print(f"ComesSolver: {comes_time:.4f}s")
     
     improvement_vs_numba = (numba_time - comes_time) / numba_time * 100
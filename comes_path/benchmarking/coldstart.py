@@ -0,0 +1,76 @@
+"""
+Vecture Laboratories // Cold-Start Benchmark
+
+Operational Directive:
+Measure time from process start to first answer for a serving process
+that opens a .comes archive, warms the solver and answers one target
+query, with an empty numba cache and again with a populated one.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+from ..utils.binary import save_graph
+from .generators import grid_graph
+
+# Runs in a fresh interpreter; every stage is timed from interpreter start.
+_CHILD = """
+import sys, time, json
+start = time.perf_counter()
+from comes_path.core.solver import ComesSolver
+from comes_path.utils.binary import load_graph
+imported = time.perf_counter()
+graph = load_graph(sys.argv[1])
+solver = ComesSolver()
+solver.set_graph(graph, params=graph.params, pivots=graph.pivots)
+loaded = time.perf_counter()
+solver.warmup()
+warm = time.perf_counter()
+solver.shortest_path(0, target=graph.num_nodes - 1)
+answered = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "load_seconds": loaded - imported,
+    "warmup_seconds": warm - loaded,
+    "query_seconds": answered - warm,
+    "scipy_sparse_imported": "scipy.sparse" in sys.modules,
+    "networkx_imported": "networkx" in sys.modules,
+}))
+"""
+
+def time_to_first_answer(path, cache_dir):
+    """One fresh process against `path`; its stage timings plus wall-clock total."""
+    env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD, path], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    record = json.loads(out.strip().splitlines()[-1])
+    record["total_seconds"] = time.perf_counter() - start
+    return record
+
+def run_benchmark(dim=300, runs=3):
+    workdir = tempfile.mkdtemp(prefix="comes_coldstart_")
+    try:
+        path = os.path.join(workdir, "grid.comes")
+        save_graph(path, grid_graph(dim))
+        cache_dir = os.path.join(workdir, "numba_cache")
+        print(f"[VECTURE] grid_{dim}x{dim}: {dim * dim} nodes, process start -> first answer")
+        records = [("cold cache", time_to_first_answer(path, cache_dir))]
+        records += [("warm cache", time_to_first_answer(path, cache_dir)) for _ in range(runs)]
+        for label, r in records:
+            print(
+                f" - {label:<10} total {r['total_seconds']:6.2f}s  import {r['import_seconds']:.2f}s  "
+                f"load {r['load_seconds']:.3f}s  warmup {r['warmup_seconds']:6.2f}s  "
+                f"query {r['query_seconds'] * 1e3:.2f}ms  scipy.sparse imported: {r['scipy_sparse_imported']}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    run_benchmark()
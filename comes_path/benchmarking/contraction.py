@@ -0,0 +1,54 @@
+"""
+Vecture Laboratories // Contraction Hierarchy Benchmark
+
+Operational Directive:
+Measure hierarchy preprocessing and contrast its upward queries with
+plain bidirectional search on road-like topologies.
+"""
+
+import time
+import numpy as np
+from ..core.solver import ComesSolver
+from .generators import road_graph
+
+def benchmark_hierarchy(adj, num_queries=2000, seed=0):
+    """Build cost, shortcut overhead and mean per-query latency."""
+    n = adj.shape[0]
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(n, size=(num_queries, 2))
+    solver = ComesSolver(adj)
+    start = time.perf_counter()
+    hierarchy = solver.build_hierarchy()
+    results = {
+        "build_seconds": time.perf_counter() - start,
+        "edge_ratio": len(hierarchy.edge_src) / adj.nnz,
+    }
+    workspace = solver.create_workspace()
+    modes = {
+        "bidirectional": dict(bidirectional=True),
+        "hierarchy": dict(),
+    }
+    for mode, options in modes.items():
+        solver.shortest_path(int(pairs[0, 0]), target=int(pairs[0, 1]), workspace=workspace, **options)
+        start = time.perf_counter()
+        for source, target in pairs:
+            solver.shortest_path(int(source), target=int(target), workspace=workspace, **options)
+        results[mode] = (time.perf_counter() - start) / num_queries
+    solver.route(int(pairs[0, 0]), int(pairs[0, 1]), workspace=workspace)
+    start = time.perf_counter()
+    for source, target in pairs:
+        solver.route(int(source), int(target), workspace=workspace)
+    results["hierarchy_unpacked"] = (time.perf_counter() - start) / num_queries
+    return results
+
+def run_benchmark():
+    for dim in (100, 300):
+        adj = road_graph(dim)
+        print(f"\n[VECTURE] road_{dim}x{dim}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        results = benchmark_hierarchy(adj)
+        print(f" - build {results.pop('build_seconds'):.2f}s, {results.pop('edge_ratio'):.2f}x edges")
+        for mode, seconds in results.items():
+            print(f" - {mode:<18} {seconds * 1e6:.1f}us/query")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,45 @@
+"""
+Vecture Laboratories // Frontier Layout Benchmark
+
+Operational Directive:
+Contrast dense and pooled bucket storage in runtime and peak memory.
+"""
+
+import time
+import numpy as np
+from ..core.solver import ComesSolver
+from .generators import grid_graph, power_law_graph
+
+def benchmark_layouts(adj, num_sources=5, seed=0):
+    """Time full SSSP queries per layout and capture the frontier high-water mark."""
+    n = adj.shape[0]
+    sources = np.random.default_rng(seed).choice(n, size=num_sources, replace=False)
+    results = {}
+    for layout in ("dense", "pooled"):
+        solver = ComesSolver(adj, frontier_layout=layout)
+        workspace = solver.create_workspace()
+        solver.shortest_path(int(sources[0]), workspace=workspace)
+        start = time.perf_counter()
+        for source in sources:
+            solver.shortest_path(int(source), workspace=workspace)
+        results[layout] = {
+            "seconds_per_query": (time.perf_counter() - start) / num_sources,
+            "peak_frontier_bytes": workspace.frontier.peak_bytes,
+        }
+    return results
+
+def run_benchmark():
+    graphs = {
+        "grid_500x500": grid_graph(500),
+        "power_law_50k": power_law_graph(50_000),
+    }
+    for name, adj in graphs.items():
+        print(f"\n[VECTURE] {name}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        for layout, stats in benchmark_layouts(adj).items():
+            print(
+                f" - {layout:<6} {stats['seconds_per_query']:.4f}s/query, "
+                f"peak frontier {stats['peak_frontier_bytes'] / 2**20:.1f} MiB"
+            )
+
+if __name__ == "__main__":
+    run_benchmark()
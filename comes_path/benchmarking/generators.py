@@ -0,0 +1,130 @@
+"""
+Vecture Laboratories // Synthetic Topology Generators
+
+Operational Directive:
+Fabricate benchmark topologies in vectorized or compiled form, free of
+Python loops.
+"""
+
+import numpy as np
+from numba import njit
+from scipy.spatial import cKDTree
+from ..utils.loaders import coo_to_csr
+
+def _symmetric_csr(u, v, w, n):
+    # Parallel edges keep their lightest copy rather than summing.
+    return coo_to_csr(np.concatenate([u, v]), np.concatenate([v, u]), np.concatenate([w, w]), n)
+
+def _lattice_edges(rows, cols):
+    ids = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    u = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    v = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    return u, v
+
+def grid_graph(dim, seed=0):
+    """Undirected dim x dim lattice with uniform weights in [1, 2)."""
+    rng = np.random.default_rng(seed)
+    u, v = _lattice_edges(dim, dim)
+    w = rng.random(len(u)) + 1.0
+    return _symmetric_csr(u, v, w, dim * dim)
+
+def chain_graph(n, width=2, seed=0):
+    """
+    High-diameter ladder: width parallel lanes of n // width nodes joined by
+    rungs, uniform weights in [1, 2). Diameter grows linearly with n.
+    """
+    rng = np.random.default_rng(seed)
+    length = max(1, n // width)
+    u, v = _lattice_edges(width, length)
+    w = rng.random(len(u)) + 1.0
+    return _symmetric_csr(u, v, w, width * length)
+
+def geometric_graph(n, avg_degree=8, seed=0):
+    """
+    Undirected random geometric graph: n points in the unit square joined
+    within the radius giving avg_degree, weighted by Euclidean length.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    radius = np.sqrt(avg_degree / (np.pi * n))
+    pairs = cKDTree(points).query_pairs(radius, output_type="ndarray")
+    u, v = pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64)
+    w = np.linalg.norm(points[u] - points[v], axis=1) + 1e-9
+    return _symmetric_csr(u, v, w, n)
+
+@njit(cache=True)
+def _preferential_attachment(n, m, seed):
+    np.random.seed(seed)
+    # Every edge endpoint is appended to `ends`; uniform draws from it are
+    # degree-proportional draws of nodes.
+    ends = np.empty(2 * m * n, dtype=np.int64)
+    u = np.empty(m * (n - m), dtype=np.int64)
+    v = np.empty(m * (n - m), dtype=np.int64)
+    num_ends = 0
+    for k in range(m):
+        ends[num_ends] = k
+        num_ends += 1
+    e = 0
+    for node in range(m, n):
+        pool = num_ends
+        for _ in range(m):
+            target = ends[np.random.randint(0, pool)]
+            u[e] = node
+            v[e] = target
+            e += 1
+            ends[num_ends] = node
+            ends[num_ends + 1] = target
+            num_ends += 2
+    return u, v
+
+def barabasi_albert_graph(n, m=4, seed=0):
+    """
+    Undirected Barabasi-Albert graph: each new node attaches m edges to
+    existing nodes chosen proportionally to degree. Weights in [1, 2).
+    """
+    u, v = _preferential_attachment(n, m, seed)
+    keep = u != v
+    w = np.random.default_rng(seed).random(int(keep.sum())) + 1.0
+    return _symmetric_csr(u[keep], v[keep], w, n)
+
+def with_heavy_tailed_weights(adj, exponent=1.5, seed=0):
+    """
+    Copy of adj with Pareto(exponent) + 1 weights: a max/min ratio in the
+    thousands, beyond what a fixed-width circular buffer handles.
+    """
+    rng = np.random.default_rng(seed)
+    adj = adj.copy()
+    adj.data = rng.pareto(exponent, adj.nnz) + 1.0
+    return adj
+
+def power_law_graph(n, avg_degree=8, exponent=2.5, seed=0):
+    """
+    Undirected Chung-Lu graph with a power-law degree sequence.
+    Endpoints are drawn proportionally to Pareto-distributed node weights.
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.pareto(exponent - 1.0, n) + 1.0
+    p = weights / weights.sum()
+    m = n * avg_degree // 2
+    u = rng.choice(n, size=m, p=p)
+    v = rng.choice(n, size=m, p=p)
+    keep = u != v
+    w = rng.random(int(keep.sum())) + 1.0
+    return _symmetric_csr(u[keep], v[keep], w, n)
+
+def road_graph(dim, keep=0.7, subdivisions=2, seed=0):
+    """
+    Road-network stand-in: a dim x dim lattice thinned to a `keep` fraction
+    of its streets, each street split into subdivisions + 1 segments by
+    degree-2 shape nodes, as in OSM extracts.
+    """
+    rng = np.random.default_rng(seed)
+    u, v = _lattice_edges(dim, dim)
+    streets = rng.random(len(u)) < keep
+    u, v = u[streets], v[streets]
+    k = len(u)
+    chain = [u] + [dim * dim + i * k + np.arange(k) for i in range(subdivisions)] + [v]
+    src = np.concatenate(chain[:-1])
+    dst = np.concatenate(chain[1:])
+    w = rng.random(len(src)) + 0.5
+    return _symmetric_csr(src, dst, w, dim * dim + subdivisions * k)
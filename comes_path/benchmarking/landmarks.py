@@ -0,0 +1,64 @@
+"""
+Vecture Laboratories // Goal-Directed Query Benchmark
+
+Operational Directive:
+Contrast plain, bidirectional and landmark (ALT) target queries.
+"""
+
+import time
+import numpy as np
+from ..core.solver import ComesSolver
+from .generators import grid_graph, power_law_graph
+
+def benchmark_target_queries(adj, num_queries=200, num_landmarks=16, seed=0):
+    """Mean latency and settled-node count per target-query mode."""
+    n = adj.shape[0]
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(n, size=(num_queries, 2))
+    solver = ComesSolver(adj)
+    start = time.perf_counter()
+    solver.build_landmarks(num_landmarks, seed=seed)
+    build_seconds = time.perf_counter() - start
+    workspace = solver.create_workspace()
+
+    modes = {
+        "plain": dict(use_landmarks=False),
+        "bidirectional": dict(bidirectional=True),
+        "alt": dict(),
+    }
+    results = {"landmark_build_seconds": build_seconds}
+    for mode, options in modes.items():
+        solver.shortest_path(int(pairs[0, 0]), target=int(pairs[0, 1]), workspace=workspace, **options)
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            solver.shortest_path(int(source), target=int(target), workspace=workspace, **options)
+            if mode == "bidirectional":
+                settled += workspace.settled_count + workspace.reverse.settled_count
+            elif mode == "alt":
+                settled += workspace.goal_directed.settled_count
+            else:
+                settled += workspace.settled_count
+        results[mode] = {
+            "seconds_per_query": (time.perf_counter() - start) / num_queries,
+            "mean_settled": settled / num_queries,
+        }
+    return results
+
+def run_benchmark():
+    graphs = {
+        "grid_500x500": grid_graph(500),
+        "power_law_250k": power_law_graph(250_000),
+    }
+    for name, adj in graphs.items():
+        print(f"\n[VECTURE] {name}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        results = benchmark_target_queries(adj)
+        print(f" - landmark build {results.pop('landmark_build_seconds'):.2f}s")
+        for mode, stats in results.items():
+            print(
+                f" - {mode:<13} {stats['seconds_per_query'] * 1e3:.3f}ms/query, "
+                f"{stats['mean_settled']:.0f} settled"
+            )
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,62 @@
+"""
+Vecture Laboratories // Ingestion Throughput Benchmark
+
+Operational Directive:
+Track loader throughput in edges per second against the np.loadtxt baseline.
+"""
+
+import os
+import time
+import tempfile
+import numpy as np
+from ..utils.loaders import load_adj, load_graphml
+from .generators import power_law_graph
+
+def write_edge_list(adj, path):
+    coo = adj.tocoo()
+    np.savetxt(path, np.column_stack([coo.row, coo.col, coo.data]), fmt=["%d", "%d", "%.6f"])
+
+def write_graphml(adj, path):
+    coo = adj.tocoo()
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        f.write('<key id="d0" for="edge" attr.name="weight" attr.type="double"/>\n')
+        f.write('<graph edgedefault="directed">\n')
+        f.writelines(f'<node id="n{i}"/>\n' for i in range(adj.shape[0]))
+        f.writelines(
+            f'<edge source="n{u}" target="n{v}"><data key="d0">{w:.6f}</data></edge>\n'
+            for u, v, w in zip(coo.row, coo.col, coo.data)
+        )
+        f.write("</graph>\n</graphml>\n")
+
+def _throughput(loader, path, num_edges):
+    loader(path)
+    start = time.perf_counter()
+    loader(path)
+    return num_edges / (time.perf_counter() - start)
+
+def benchmark_loaders(adj, workers=None):
+    """Edges/sec per loader on one synthetic graph (second, warm run)."""
+    workers = workers or os.cpu_count()
+    with tempfile.TemporaryDirectory() as path:
+        edge_list = os.path.join(path, "graph.adj")
+        graphml = os.path.join(path, "graph.graphml")
+        write_edge_list(adj, edge_list)
+        write_graphml(adj, graphml)
+        return {
+            "np.loadtxt": _throughput(np.loadtxt, edge_list, adj.nnz),
+            "load_adj": _throughput(load_adj, edge_list, adj.nnz),
+            f"load_adj[{workers} workers]": _throughput(
+                lambda p: load_adj(p, workers=workers), edge_list, adj.nnz
+            ),
+            "load_graphml": _throughput(load_graphml, graphml, adj.nnz),
+        }
+
+def run_benchmark():
+    adj = power_law_graph(250_000)
+    print(f"\n[VECTURE] power_law_250k: {adj.shape[0]} nodes, {adj.nnz} edges")
+    for loader, rate in benchmark_loaders(adj).items():
+        print(f" - {loader:<22} {rate / 1e6:.2f}M edges/s")
+
+if __name__ == "__main__":
+    run_benchmark()
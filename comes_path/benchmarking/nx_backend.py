@@ -0,0 +1,64 @@
+"""
+Vecture Laboratories // NetworkX Backend Benchmark
+
+Operational Directive:
+Time unchanged NetworkX calls on nx.Graph objects with and without the
+comes backend, including the one-time conversion.
+"""
+
+import time
+import warnings
+import numpy as np
+import networkx as nx
+from ..utils.nx_backend import BackendInterface
+
+def weighted_grid(dim, seed=0):
+    G = nx.grid_2d_graph(dim, dim)
+    rng = np.random.default_rng(seed)
+    for (u, v), length in zip(G.edges, rng.uniform(1.0, 10.0, G.number_of_edges())):
+        G[u][v]["length"] = float(length)
+    return G
+
+def benchmark_backend(G, source, target, repeats=3):
+    """{call: (networkx seconds, comes seconds)}, best of repeats; plus conversion seconds."""
+    calls = {
+        "single_source_dijkstra_path_length": lambda: nx.single_source_dijkstra_path_length(G, source, weight="length"),
+        "single_source_dijkstra (paths)": lambda: nx.single_source_dijkstra(G, source, weight="length"),
+        "dijkstra_path_length": lambda: nx.dijkstra_path_length(G, source, target, weight="length"),
+        "dijkstra_path": lambda: nx.dijkstra_path(G, source, target, weight="length"),
+    }
+    start = time.perf_counter()
+    BackendInterface.convert_from_nx(G, edge_attrs={"length": 1}).solver.warmup()
+    conversion = time.perf_counter() - start
+    results = {}
+    previous = list(nx.config.backend_priority.algos)
+    try:
+        for name, call in calls.items():
+            timings = []
+            for priority in ([], ["comes"]):
+                nx.config.backend_priority.algos = priority
+                call()
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    call()
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+            results[name] = tuple(timings)
+    finally:
+        nx.config.backend_priority.algos = previous
+    return results, conversion
+
+def run_benchmark(dim=300):
+    if "comes" not in nx.utils.backends.backends:
+        raise SystemExit("The comes backend is not registered; install the package (pip install -e .).")
+    warnings.filterwarnings("ignore", message="Note: conversions to backend graphs")
+    G = weighted_grid(dim)
+    print(f"[VECTURE] nx.grid_2d_graph({dim}, {dim}): {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+    results, conversion = benchmark_backend(G, (0, 0), (dim - 1, dim - 1))
+    print(f" - one-time conversion + solver setup {conversion:.3f}s")
+    for name, (plain, comes) in results.items():
+        print(f" - {name:<36} networkx {plain:.4f}s  comes {comes:.4f}s  ({plain / comes:.1f}x)")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,65 @@
+"""
+Vecture Laboratories // Locality Reordering Benchmark
+
+Operational Directive:
+Measure how node relabelling changes full-query time on graphs whose ids
+carry no locality, as with ids assigned by an external data source.
+"""
+
+import time
+import numpy as np
+from scipy.sparse import csr_matrix
+from ..core.solver import ComesSolver
+from ..core.reordering import permute_csr
+from .generators import grid_graph, road_graph
+
+def shuffled(adj, coordinates=None, seed=0):
+    """adj (and per-node coordinates) under a uniformly random relabelling."""
+    n = adj.shape[0]
+    order = np.random.default_rng(seed).permutation(n)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(n)
+    indptr, indices, data = permute_csr(adj.indptr, adj.indices, adj.data, order, rank)
+    relabelled = csr_matrix((data, indices, indptr), shape=adj.shape)
+    return relabelled, (None if coordinates is None else coordinates[order])
+
+def benchmark_reorderings(adj, coordinates=None, num_sources=5, seed=0):
+    """Setup and per-query time for the original ids and every applicable reordering."""
+    n = adj.shape[0]
+    sources = np.random.default_rng(seed).choice(n, size=num_sources, replace=False)
+    methods = [None, "rcm", "degree"] + (["hilbert"] if coordinates is not None else [])
+    results = {}
+    for method in methods:
+        start = time.perf_counter()
+        solver = ComesSolver(adj, reorder=method, coordinates=coordinates)
+        setup = time.perf_counter() - start
+        solver.shortest_path(int(sources[0]))
+        start = time.perf_counter()
+        for source in sources:
+            solver.shortest_path(int(source))
+        results[method or "none"] = {
+            "setup_seconds": setup,
+            "seconds_per_query": (time.perf_counter() - start) / num_sources,
+        }
+    return results
+
+def run_benchmark():
+    dim = 1000
+    grid_coordinates = np.column_stack(np.divmod(np.arange(dim * dim), dim)).astype(np.float64)
+    graphs = {
+        "grid_1000x1000 (row-major ids)": (grid_graph(dim), grid_coordinates),
+        "grid_1000x1000 (shuffled ids)": shuffled(grid_graph(dim), grid_coordinates),
+        "road_400x400 (shuffled ids)": shuffled(road_graph(400)),
+    }
+    for name, (adj, coordinates) in graphs.items():
+        print(f"\n[VECTURE] {name}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        results = benchmark_reorderings(adj, coordinates)
+        baseline = results["none"]["seconds_per_query"]
+        for method, stats in results.items():
+            print(
+                f" - {method:<8} {stats['seconds_per_query']:.4f}s/query "
+                f"({baseline / stats['seconds_per_query']:.2f}x), setup {stats['setup_seconds']:.2f}s"
+            )
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,78 @@
+"""
+Vecture Laboratories // Thread Scaling Benchmark
+
+Operational Directive:
+Measure delta-stepping speedup as worker threads are added, and query
+throughput as caller threads share one solver.
+"""
+
+import time
+import numba
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from ..core.solver import ComesSolver
+from .generators import grid_graph, power_law_graph
+
+def benchmark_scaling(adj, source=0, repeats=3, thread_counts=None):
+    """Best-of-repeats single-source latency of the delta engine per thread count."""
+    max_threads = numba.config.NUMBA_NUM_THREADS
+    if thread_counts is None:
+        thread_counts = sorted({1 << k for k in range(max_threads.bit_length())} | {max_threads})
+    sequential = ComesSolver(adj)
+    sequential.shortest_path(source)
+    start = time.perf_counter()
+    sequential.shortest_path(source)
+    results = {"sequential": time.perf_counter() - start}
+
+    solver = ComesSolver(adj, engine="delta")
+    previous = numba.get_num_threads()
+    try:
+        for threads in thread_counts:
+            numba.set_num_threads(threads)
+            solver.shortest_path(source)
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                solver.shortest_path(source)
+                best = min(best, time.perf_counter() - start)
+            results[threads] = best
+    finally:
+        numba.set_num_threads(previous)
+    return results
+
+def benchmark_concurrent_queries(adj, num_queries=64, thread_counts=None, seed=0):
+    """Full-query throughput (queries/s) of one shared solver per number of caller threads."""
+    max_threads = numba.config.NUMBA_NUM_THREADS
+    if thread_counts is None:
+        thread_counts = sorted({1 << k for k in range(max_threads.bit_length())} | {max_threads})
+    sources = np.random.default_rng(seed).integers(0, adj.shape[0], size=num_queries).tolist()
+    solver = ComesSolver(adj)
+    solver.shortest_path(sources[0])
+    results = {}
+    for threads in thread_counts:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(solver.shortest_path, sources[:threads]))
+            start = time.perf_counter()
+            list(pool.map(solver.shortest_path, sources))
+            results[threads] = num_queries / (time.perf_counter() - start)
+    return results
+
+def run_benchmark():
+    graphs = {
+        "grid_1000x1000": grid_graph(1000),
+        "power_law_1m": power_law_graph(1_000_000),
+    }
+    for name, adj in graphs.items():
+        print(f"\n[VECTURE] {name}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        results = benchmark_scaling(adj)
+        baseline = results.pop("sequential")
+        print(f" - sequential  {baseline:.4f}s")
+        for threads, seconds in results.items():
+            print(f" - delta x{threads:<3} {seconds:.4f}s ({baseline / seconds:.2f}x vs sequential)")
+        results = benchmark_concurrent_queries(adj)
+        single = results[min(results)]
+        for threads, rate in results.items():
+            print(f" - {threads:>3} caller thread(s) {rate:8.1f} queries/s ({rate / single:.2f}x)")
+
+if __name__ == "__main__":
+    run_benchmark()
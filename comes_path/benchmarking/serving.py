@@ -0,0 +1,69 @@
+"""
+Vecture Laboratories // Query Server Benchmark
+
+Operational Directive:
+Drive a QueryServer with concurrent asyncio clients and report throughput
+and latency percentiles against the number of worker processes.
+"""
+
+import time
+import asyncio
+import numpy as np
+from ..utils.serving import QueryServer
+from .generators import grid_graph
+
+async def _drive(server, queries, concurrency):
+    """Run (source, target) queries with at most `concurrency` in flight; per-query latencies."""
+    latencies = np.empty(len(queries))
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i, source, target):
+        async with gate:
+            start = time.perf_counter()
+            await server.shortest_path(source, target)
+            latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i, source, target) for i, (source, target) in enumerate(queries)))
+    return latencies, time.perf_counter() - start
+
+def benchmark_server(adj, num_workers, queries, concurrency=64, max_batch=64):
+    """Throughput, p50/p99 latency and mean batch size for one worker count."""
+    async def run():
+        async with QueryServer(adj, num_workers=num_workers, max_batch=max_batch) as server:
+            await _drive(server, queries[:concurrency], concurrency)
+            batches, requests = server.batches, server.requests
+            latencies, elapsed = await _drive(server, queries, concurrency)
+            mean_batch = (server.requests - requests) / max(1, server.batches - batches)
+        return latencies, elapsed, mean_batch
+
+    latencies, elapsed, mean_batch = asyncio.run(run())
+    p50, p99 = np.percentile(latencies, (50, 99))
+    return {
+        "queries_per_second": len(queries) / elapsed,
+        "p50_seconds": float(p50),
+        "p99_seconds": float(p99),
+        "mean_batch": mean_batch,
+    }
+
+def run_benchmark(dim=300, num_queries=2000, worker_counts=(1, 2, 4), seed=0):
+    adj = grid_graph(dim)
+    n = adj.shape[0]
+    rng = np.random.default_rng(seed)
+    workloads = {
+        "point-to-point": [(int(s), int(t)) for s, t in rng.integers(0, n, size=(num_queries, 2))],
+        "full distances": [(int(s), None) for s in rng.integers(0, n, size=num_queries // 10)],
+    }
+    print(f"[VECTURE] grid_{dim}x{dim}: {n} nodes, 64 concurrent asyncio clients")
+    for name, queries in workloads.items():
+        print(f"\n{name}: {len(queries)} queries")
+        for workers in worker_counts:
+            r = benchmark_server(adj, workers, queries)
+            print(
+                f" - {workers} worker(s): {r['queries_per_second']:8.1f} q/s  "
+                f"p50 {r['p50_seconds'] * 1e3:8.2f}ms  p99 {r['p99_seconds'] * 1e3:8.2f}ms  "
+                f"mean batch {r['mean_batch']:.1f}"
+            )
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,211 @@
+"""
+Vecture Laboratories // Regression Benchmark Suite
+
+Operational Directive:
+Time ComesSolver against numba_dijkstra and SciPy on every synthetic
+topology, record percentile latencies and peak RSS as JSON, and diff two
+recorded runs to surface regressions.
+
+Usage:
+    python -m comes_path.benchmarking.suite run --preset quick -o before.json
+    python -m comes_path.benchmarking.suite diff before.json after.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+import numba
+import scipy
+from scipy.sparse.csgraph import dijkstra
+from ..core.solver import ComesSolver
+from ..core.baselines import numba_dijkstra
+from .generators import (
+    grid_graph, chain_graph, geometric_graph, barabasi_albert_graph,
+    road_graph, with_heavy_tailed_weights,
+)
+
+PRESETS = {
+    "quick": {
+        "grid_200x200": lambda: grid_graph(200),
+        "geometric_50k": lambda: geometric_graph(50_000),
+        "barabasi_albert_50k": lambda: barabasi_albert_graph(50_000),
+        "chain_50k": lambda: chain_graph(50_000),
+        "road_100x100": lambda: road_graph(100),
+        "heavy_tailed_grid_200x200": lambda: with_heavy_tailed_weights(grid_graph(200)),
+    },
+    "full": {
+        "grid_1000x1000": lambda: grid_graph(1000),
+        "geometric_1m": lambda: geometric_graph(1_000_000),
+        "barabasi_albert_1m": lambda: barabasi_albert_graph(1_000_000),
+        "chain_1m": lambda: chain_graph(1_000_000),
+        "road_400x400": lambda: road_graph(400),
+        "heavy_tailed_grid_1000x1000": lambda: with_heavy_tailed_weights(grid_graph(1000)),
+    },
+}
+PERCENTILES = (50, 90, 99)
+
+def reset_peak_rss():
+    """
+    Restart the kernel's peak-RSS counter (Linux), so peak_rss_bytes covers
+    one case instead of the whole process. False where it cannot be reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss_bytes():
+    """Peak resident set size since the last reset_peak_rss, or None where unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def _solvers(adj):
+    """name -> (setup seconds, single-source query callable)."""
+    n = adj.shape[0]
+    start = time.perf_counter()
+    solver = ComesSolver(adj)
+    setup = time.perf_counter() - start
+    indices, indptr, data = adj.indices, adj.indptr, adj.data
+    return {
+        "comes": (setup, solver.shortest_path),
+        "numba_dijkstra": (0.0, lambda source: numba_dijkstra(indices, indptr, data, source, n)),
+        "scipy": (0.0, lambda source: dijkstra(adj, indices=source)),
+    }
+
+def benchmark_graph(adj, num_sources=20, warmup=2, seed=0):
+    """
+    Per-solver record for one graph. The first query (JIT compilation
+    included) is reported separately; `warmup` more queries run untimed,
+    then every sampled source is timed on its own. peak_rss_bytes is the
+    process peak while that solver ran (the graph included), or None where
+    the peak cannot be reset between cases.
+    """
+    n = adj.shape[0]
+    sources = np.random.default_rng(seed).choice(n, size=min(num_sources, n), replace=False)
+    reference = dijkstra(adj, indices=int(sources[0]))
+    finite = np.isfinite(reference)
+    records = {}
+    for name, (setup, query) in _solvers(adj).items():
+        tracked = reset_peak_rss()
+        start = time.perf_counter()
+        first = query(int(sources[0]))
+        first_call = time.perf_counter() - start
+        for _ in range(warmup):
+            query(int(sources[0]))
+        latencies = np.empty(len(sources))
+        for i, source in enumerate(sources):
+            start = time.perf_counter()
+            query(int(source))
+            latencies[i] = time.perf_counter() - start
+        record = {
+            "setup_seconds": setup,
+            "first_call_seconds": first_call,
+            "mean_seconds": float(latencies.mean()),
+            "peak_rss_bytes": peak_rss_bytes() if tracked else None,
+            "valid": bool(np.array_equal(np.isfinite(first), finite)
+                          and np.allclose(first[finite], reference[finite], atol=1e-5)),
+        }
+        for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            record[f"p{q}_seconds"] = float(value)
+        records[name] = record
+    return records
+
+def run_suite(preset="quick", num_sources=20, warmup=2, seed=0, log=print):
+    """Benchmark every graph of a preset; returns a JSON-serialisable run."""
+    run = {
+        "meta": {
+            "preset": preset,
+            "num_sources": num_sources,
+            "warmup": warmup,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "numba": numba.__version__,
+            "scipy": scipy.__version__,
+            "threads": numba.get_num_threads(),
+        },
+        "graphs": {},
+    }
+    for name, build in PRESETS[preset].items():
+        adj = build()
+        log(f"\n[VECTURE] {name}: {adj.shape[0]} nodes, {adj.nnz} edges")
+        records = benchmark_graph(adj, num_sources, warmup, seed)
+        run["graphs"][name] = {"nodes": adj.shape[0], "edges": adj.nnz, "solvers": records}
+        for solver, record in records.items():
+            log(
+                f" - {solver:<15} p50 {record['p50_seconds'] * 1e3:9.3f}ms  "
+                f"p99 {record['p99_seconds'] * 1e3:9.3f}ms  "
+                f"first {record['first_call_seconds']:.3f}s"
+                + ("" if record["valid"] else "  [INVALID]")
+            )
+    return run
+
+def diff_runs(before, after, metric="p50_seconds", threshold=0.10):
+    """
+    Rows of (graph, solver, before, after, ratio, regressed) for every
+    (graph, solver) present in both runs; ratio = after / before.
+    """
+    rows = []
+    for graph, entry in after["graphs"].items():
+        old_entry = before["graphs"].get(graph)
+        if old_entry is None:
+            continue
+        for solver, record in entry["solvers"].items():
+            old = old_entry["solvers"].get(solver)
+            if old is None:
+                continue
+            ratio = record[metric] / old[metric] if old[metric] > 0 else float("inf")
+            rows.append((graph, solver, old[metric], record[metric], ratio, ratio > 1.0 + threshold))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m comes_path.benchmarking.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="benchmark a preset and write JSON")
+    run_cmd.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    run_cmd.add_argument("--sources", type=int, default=20)
+    run_cmd.add_argument("--warmup", type=int, default=2)
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("-o", "--output", default="benchmark.json")
+    diff_cmd = commands.add_parser("diff", help="compare two recorded runs")
+    diff_cmd.add_argument("before")
+    diff_cmd.add_argument("after")
+    diff_cmd.add_argument("--metric", default="p50_seconds")
+    diff_cmd.add_argument("--threshold", type=float, default=0.10,
+                          help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run = run_suite(args.preset, args.sources, args.warmup, args.seed)
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\n[VECTURE] Run written to {args.output}")
+        return 0
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    rows = diff_runs(before, after, args.metric, args.threshold)
+    for graph, solver, old, new, ratio, regressed in rows:
+        print(f"{graph:<28} {solver:<15} {old * 1e3:9.3f}ms -> {new * 1e3:9.3f}ms  "
+              f"{ratio:5.2f}x" + ("  REGRESSION" if regressed else ""))
+    regressions = sum(row[-1] for row in rows)
+    print(f"\n[VECTURE] {regressions} regression(s) beyond {args.threshold:.0%} on {args.metric}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Vecture Laboratories // Engine Autotuning
+
+Operational Directive:
+Replace static engine heuristics with measurements on the actual topology:
+time every frontier engine and parameter set from sampled sources and fix
+the fastest.
+"""
+
+import time
+import numpy as np
+from .partitioning import partition_graph, MAX_BUCKETS
+from .relaxation import identify_pivots
+from .solver import ComesSolver
+
+# Degree percentiles tried as pivot thresholds; None disables the look-ahead.
+PIVOT_PERCENTILES = (None, 99.0, 95.0, 90.0)
+# Bucket widths tried, as divisors of the widest valid width (min_w).
+WIDTH_DIVISORS = (1, 2, 4)
+# Ring sizes tried, as multiples of the smallest ring covering max_w.
+BUCKET_MULTIPLIERS = (1, 4)
+
+class _CSRView:
+    """The indptr/indices/data/shape a scratch solver needs, without scipy."""
+    def __init__(self, indptr, indices, data):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, len(indptr) - 1)
+
+def pivot_threshold(indptr, percentile):
+    """Degree threshold for a percentile; None maps above every degree (no pivots)."""
+    degrees = np.diff(indptr)
+    if percentile is None:
+        return float(degrees.max(initial=0) + 1)
+    return float(np.percentile(degrees, percentile))
+
+def _ring_candidates(params, engine, max_w):
+    """(bucket_width, num_buckets) pairs that keep the ring valid for engine."""
+    min_w = params["bucket_width"]
+    gcd = params["weight_gcd"]
+    candidates = []
+    for divisor in WIDTH_DIVISORS:
+        width = min_w / divisor
+        if engine == "dial":
+            # Dial widths are whole multiples of the weight GCD.
+            width = float(max(gcd, (int(width) // gcd) * gcd))
+        needed = int(max_w / width) + 2
+        if needed > MAX_BUCKETS:
+            continue
+        base = 1024
+        while base < needed:
+            base *= 2
+        for multiplier in BUCKET_MULTIPLIERS:
+            pair = (width, min(base * multiplier, MAX_BUCKETS))
+            if pair not in candidates:
+                candidates.append(pair)
+    return candidates
+
+def _time_config(view, engine, params, pivots, sources, frontier_layout, repeats):
+    """Best-of-repeats seconds for full queries from every sampled source."""
+    solver = ComesSolver(frontier_layout=frontier_layout, engine=engine)
+    solver.set_graph(view, params=params, pivots=pivots)
+    # Compiles (or loads) this engine's kernels outside the timed rounds.
+    solver.shortest_path(sources[0])
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for source in sources:
+            solver.shortest_path(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def autotune_engine(indptr, indices, data, frontier_layout="pooled", num_sources=4, repeats=2, seed=0):
+    """
+    Time the heap, bucket, dial and radix engines on this graph and return
+    (params, timings). params is partition_graph output with the winning
+    "engine", "bucket_width", "num_buckets" and "pivot_threshold" fixed and
+    "tuned" set, ready for ComesSolver.set_graph or a .comes archive.
+    timings lists (engine, bucket_width, num_buckets, pivot_threshold,
+    seconds) for every configuration tried.
+
+    Each frontier engine first sweeps the pivot thresholds at its default
+    ring, then the ring sizes at its best threshold. Every configuration is
+    scored by full single-source queries from the same sampled sources.
+    The delta engine is left out: it parallelises single queries rather
+    than competing with the sequential frontiers.
+    """
+    view = _CSRView(indptr, indices, data)
+    n = view.shape[0]
+    base = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in partition_graph(view).items()}
+    rng = np.random.default_rng(seed)
+    candidates = np.flatnonzero(np.diff(indptr) > 0)
+    sources = rng.choice(candidates, size=min(num_sources, len(candidates)), replace=False).tolist()
+
+    engines = ["radix"]
+    if base["engine"] != "radix":
+        engines.insert(0, "bucket")
+        if base["weight_gcd"]:
+            engines.insert(0, "dial")
+    thresholds = {p: pivot_threshold(indptr, p) for p in PIVOT_PERCENTILES}
+    masks = {}
+    timings = []
+
+    def run(engine, width, num_buckets, threshold):
+        params = dict(base, engine=engine, bucket_width=width, num_buckets=num_buckets,
+                      pivot_threshold=threshold, tuned=True)
+        if threshold not in masks:
+            masks[threshold] = identify_pivots(indptr, threshold)
+        pivots = np.zeros(n, dtype=np.bool_) if engine == "heap" else masks[threshold]
+        seconds = _time_config(view, engine, params, pivots, sources, frontier_layout, repeats)
+        timings.append((engine, width, num_buckets, threshold, seconds))
+        return seconds, params
+
+    # The heap engine runs plain Dijkstra, without pivots.
+    best = run("heap", base["bucket_width"], base["num_buckets"], thresholds[None])
+    for engine in engines:
+        width, num_buckets = base["bucket_width"], base["num_buckets"]
+        scores = [run(engine, width, num_buckets, t) for t in thresholds.values()]
+        engine_best = min(scores, key=lambda score: score[0])
+        if engine != "radix":
+            threshold = engine_best[1]["pivot_threshold"]
+            for pair in _ring_candidates(base, engine, float(np.max(data))):
+                if pair != (width, num_buckets):
+                    engine_best = min(engine_best, run(engine, *pair, threshold), key=lambda score: score[0])
+        best = min(best, engine_best, key=lambda score: score[0])
+    return best[1], timings
@@ -8,7 +8,7 @@ Provide JIT-optimized standard Dijkstra implementation for clinical comparison.
 import numpy as np
 from numba import njit, int64, float64
 
-@njit(fastmath=True, cache=True)
+@njit(fastmath=True, nogil=True, cache=True)
 def heappush(heap, counts, item_dist, item_node):
     idx = counts[0]
     heap[idx, 0] = item_dist
@@ -29,7 +29,7 @@ def heappush(heap, counts, item_dist, item_node):
         else:
             break
 
-@njit(fastmath=True, cache=True)
+@njit(fastmath=True, nogil=True, cache=True)
 def heappop(heap, counts):
     if counts[0] <= 0:
         return -1.0, -1
@@ -66,7 +66,7 @@ def heappop(heap, counts):
             
     return res_dist, res_node
 
-@njit(fastmath=True, cache=True)
+@njit(fastmath=True, nogil=True, cache=True)
 def numba_dijkstra(indices, indptr, data, source, num_nodes):
     distances = np.full(num_nodes, np.inf, dtype=np.float64)
     distances[source] = 0.0
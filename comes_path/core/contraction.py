@@ -0,0 +1,465 @@
+"""
+Vecture Laboratories // Contraction Hierarchy Protocol
+
+Operational Directive:
+Contract static topologies once; answer point-to-point queries by upward
+searches over the resulting hierarchy.
+"""
+
+import os
+import numpy as np
+from numba import njit
+from .structures import IndexedHeap
+from .workspace import QueryWorkspace
+
+@njit(cache=True)
+def _grow(arr, size):
+    grown = np.empty(max(2 * len(arr), size), dtype=arr.dtype)
+    grown[:len(arr)] = arr
+    return grown
+
+@njit(cache=True)
+def _gather_neighbors(x, heads, next_edges, ends, weights, contracted, best, best_edge, nodes, node_edges, node_weights):
+    """Collect uncontracted neighbors of x through one adjacency direction, keeping the lightest parallel edge."""
+    count = 0
+    prev = -1
+    e = heads[x]
+    while e != -1:
+        y = ends[e]
+        if contracted[y]:
+            # Edges into the contracted part are dead; unlink them for good.
+            nxt = next_edges[e]
+            if prev == -1:
+                heads[x] = nxt
+            else:
+                next_edges[prev] = nxt
+            e = nxt
+            continue
+        if y != x:
+            if best_edge[y] == -1:
+                nodes[count] = y
+                count += 1
+                best[y] = weights[e]
+                best_edge[y] = e
+            elif weights[e] < best[y]:
+                best[y] = weights[e]
+                best_edge[y] = e
+        prev = e
+        e = next_edges[e]
+    for k in range(count):
+        y = nodes[k]
+        node_edges[k] = best_edge[y]
+        node_weights[k] = best[y]
+        best_edge[y] = -1
+    return count
+
+@njit(cache=True)
+def _witness_search(source, excluded, limit, settle_limit, num_targets, is_target, out_head, out_next,
+                    edge_dst, edge_w, contracted, distances, touched, heap):
+    """
+    Bounded Dijkstra from source that avoids excluded. Stops past limit,
+    after settle_limit nodes, or once every marked target is settled.
+    Returns the touched count.
+    """
+    distances[source] = 0.0
+    touched[0] = source
+    count = 1
+    heap.insert(source, 0.0)
+    settled = 0
+    while not heap.is_empty():
+        d = heap.lower_bound()
+        u = heap.pop_min()
+        if d > limit or settled >= settle_limit:
+            break
+        settled += 1
+        if is_target[u]:
+            num_targets -= 1
+            if num_targets == 0:
+                break
+        e = out_head[u]
+        while e != -1:
+            v = edge_dst[e]
+            if v != excluded and not contracted[v]:
+                nd = d + edge_w[e]
+                if nd < distances[v]:
+                    if distances[v] == np.inf:
+                        touched[count] = v
+                        count += 1
+                    distances[v] = nd
+                    heap.insert(v, nd)
+            e = out_next[e]
+    while not heap.is_empty():
+        heap.pop_min()
+    return count
+
+@njit(cache=True)
+def _simulate_contraction(x, settle_limit, in_head, in_next, out_head, out_next, edge_src, edge_dst, edge_w,
+                          contracted, best, best_edge, in_nodes, in_edges, in_weights,
+                          out_nodes, out_edges, out_weights, is_target, distances, touched, heap,
+                          shortcut_a, shortcut_b):
+    """
+    List the shortcuts contracting x would require: one per in/out neighbor
+    pair whose path through x has no witness path of equal or lower cost.
+    Returns (num_in, num_out, num_shortcuts, shortcut_a, shortcut_b).
+    """
+    num_in = _gather_neighbors(x, in_head, in_next, edge_src, edge_w, contracted,
+                               best, best_edge, in_nodes, in_edges, in_weights)
+    num_out = _gather_neighbors(x, out_head, out_next, edge_dst, edge_w, contracted,
+                                best, best_edge, out_nodes, out_edges, out_weights)
+    max_out = 0.0
+    for k in range(num_out):
+        max_out = max(max_out, out_weights[k])
+        is_target[out_nodes[k]] = True
+    num_shortcuts = 0
+    for a in range(num_in):
+        u = in_nodes[a]
+        touched_count = _witness_search(
+            u, x, in_weights[a] + max_out, settle_limit, num_out, is_target, out_head, out_next,
+            edge_dst, edge_w, contracted, distances, touched, heap
+        )
+        for b in range(num_out):
+            v = out_nodes[b]
+            if v != u and distances[v] > in_weights[a] + out_weights[b]:
+                if num_shortcuts == len(shortcut_a):
+                    shortcut_a = _grow(shortcut_a, num_shortcuts + 1)
+                    shortcut_b = _grow(shortcut_b, num_shortcuts + 1)
+                shortcut_a[num_shortcuts] = in_edges[a]
+                shortcut_b[num_shortcuts] = out_edges[b]
+                num_shortcuts += 1
+        for k in range(touched_count):
+            distances[touched[k]] = np.inf
+    for k in range(num_out):
+        is_target[out_nodes[k]] = False
+    return num_in, num_out, num_shortcuts, shortcut_a, shortcut_b
+
+@njit(cache=True)
+def build_hierarchy(indptr, indices, data, settle_limit=64):
+    """
+    Contract every node in edge-difference order with lazy priority updates.
+
+    The priority of x is shortcuts(x) - degree(x) + contracted neighbors(x);
+    neighbors of every contracted node are re-evaluated immediately.
+    Priority estimates use a witness budget of settle_limit // 8; the
+    contraction itself uses the full settle_limit.
+    Returns (rank, edge_src, edge_dst, edge_w, child_a, child_b): the
+    contraction rank of each node and the pool of original edges followed
+    by shortcuts, where a shortcut names the two pool edges it replaces.
+    """
+    num_nodes = len(indptr) - 1
+    capacity = max(16, 2 * len(indices))
+    edge_src = np.empty(capacity, dtype=np.int64)
+    edge_dst = np.empty(capacity, dtype=np.int64)
+    edge_w = np.empty(capacity, dtype=np.float64)
+    child_a = np.empty(capacity, dtype=np.int64)
+    child_b = np.empty(capacity, dtype=np.int64)
+    out_next = np.empty(capacity, dtype=np.int64)
+    in_next = np.empty(capacity, dtype=np.int64)
+    out_head = np.full(num_nodes, -1, dtype=np.int64)
+    in_head = np.full(num_nodes, -1, dtype=np.int64)
+    num_edges = 0
+    for u in range(num_nodes):
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if v == u:
+                continue
+            edge_src[num_edges] = u
+            edge_dst[num_edges] = v
+            edge_w[num_edges] = data[i]
+            child_a[num_edges] = -1
+            child_b[num_edges] = -1
+            out_next[num_edges] = out_head[u]
+            out_head[u] = num_edges
+            in_next[num_edges] = in_head[v]
+            in_head[v] = num_edges
+            num_edges += 1
+
+    contracted = np.zeros(num_nodes, dtype=np.bool_)
+    deleted_neighbors = np.zeros(num_nodes, dtype=np.int64)
+    rank = np.full(num_nodes, -1, dtype=np.int64)
+    best = np.empty(num_nodes, dtype=np.float64)
+    best_edge = np.full(num_nodes, -1, dtype=np.int64)
+    in_nodes = np.empty(num_nodes, dtype=np.int64)
+    in_edges = np.empty(num_nodes, dtype=np.int64)
+    in_weights = np.empty(num_nodes, dtype=np.float64)
+    out_nodes = np.empty(num_nodes, dtype=np.int64)
+    out_edges = np.empty(num_nodes, dtype=np.int64)
+    out_weights = np.empty(num_nodes, dtype=np.float64)
+    is_target = np.zeros(num_nodes, dtype=np.bool_)
+    distances = np.full(num_nodes, np.inf, dtype=np.float64)
+    touched = np.empty(num_nodes, dtype=np.int64)
+    witness_heap = IndexedHeap(num_nodes)
+    shortcut_a = np.empty(16, dtype=np.int64)
+    shortcut_b = np.empty(16, dtype=np.int64)
+    neighbors = np.empty(2 * num_nodes, dtype=np.int64)
+    estimate_limit = max(1, settle_limit // 8)
+
+    order = IndexedHeap(num_nodes)
+    for x in range(num_nodes):
+        num_in, num_out, num_shortcuts, shortcut_a, shortcut_b = _simulate_contraction(
+            x, estimate_limit, in_head, in_next, out_head, out_next, edge_src, edge_dst, edge_w,
+            contracted, best, best_edge, in_nodes, in_edges, in_weights,
+            out_nodes, out_edges, out_weights, is_target, distances, touched, witness_heap, shortcut_a, shortcut_b
+        )
+        order.insert(x, float(num_shortcuts - num_in - num_out))
+
+    next_rank = 0
+    while not order.is_empty():
+        x = order.pop_min()
+        num_in, num_out, num_shortcuts, shortcut_a, shortcut_b = _simulate_contraction(
+            x, settle_limit, in_head, in_next, out_head, out_next, edge_src, edge_dst, edge_w,
+            contracted, best, best_edge, in_nodes, in_edges, in_weights,
+            out_nodes, out_edges, out_weights, is_target, distances, touched, witness_heap, shortcut_a, shortcut_b
+        )
+        priority = float(num_shortcuts - num_in - num_out + deleted_neighbors[x])
+        if not order.is_empty() and priority > order.lower_bound():
+            # Lazy update: the stored priority was stale; requeue.
+            order.insert(x, priority)
+            continue
+        contracted[x] = True
+        rank[x] = next_rank
+        next_rank += 1
+        num_neighbors = 0
+        for k in range(num_in):
+            neighbors[num_neighbors] = in_nodes[k]
+            num_neighbors += 1
+        for k in range(num_out):
+            neighbors[num_neighbors] = out_nodes[k]
+            num_neighbors += 1
+        for k in range(num_neighbors):
+            deleted_neighbors[neighbors[k]] += 1
+        for k in range(num_shortcuts):
+            if num_edges == len(edge_src):
+                edge_src = _grow(edge_src, num_edges + 1)
+                edge_dst = _grow(edge_dst, num_edges + 1)
+                edge_w = _grow(edge_w, num_edges + 1)
+                child_a = _grow(child_a, num_edges + 1)
+                child_b = _grow(child_b, num_edges + 1)
+                out_next = _grow(out_next, num_edges + 1)
+                in_next = _grow(in_next, num_edges + 1)
+            ea = shortcut_a[k]
+            eb = shortcut_b[k]
+            u = edge_src[ea]
+            v = edge_dst[eb]
+            edge_src[num_edges] = u
+            edge_dst[num_edges] = v
+            edge_w[num_edges] = edge_w[ea] + edge_w[eb]
+            child_a[num_edges] = ea
+            child_b[num_edges] = eb
+            out_next[num_edges] = out_head[u]
+            out_head[u] = num_edges
+            in_next[num_edges] = in_head[v]
+            in_head[v] = num_edges
+            num_edges += 1
+        # Refresh neighbor priorities against the contracted graph.
+        for k in range(num_neighbors):
+            y = neighbors[k]
+            if contracted[y]:
+                continue
+            y_in, y_out, y_shortcuts, shortcut_a, shortcut_b = _simulate_contraction(
+                y, estimate_limit, in_head, in_next, out_head, out_next, edge_src, edge_dst, edge_w,
+                contracted, best, best_edge, in_nodes, in_edges, in_weights,
+                out_nodes, out_edges, out_weights, is_target, distances, touched, witness_heap, shortcut_a, shortcut_b
+            )
+            order.update(y, float(y_shortcuts - y_in - y_out + deleted_neighbors[y]))
+    return (rank, edge_src[:num_edges].copy(), edge_dst[:num_edges].copy(), edge_w[:num_edges].copy(),
+            child_a[:num_edges].copy(), child_b[:num_edges].copy())
+
+def _csr_by(rows, cols, weights, edge_ids, num_nodes):
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return indptr, cols[order], weights[order], edge_ids[order]
+
+@njit(nogil=True, cache=True)
+def _upward_step(distances, settled, touched, touched_count, frontier, predecessors,
+                 indptr, indices, weights, edge_ids, stall_indptr, stall_indices, stall_weights,
+                 other_distances, best, meet):
+    u = frontier.pop_min()
+    if u == -1 or settled[u]:
+        return best, meet
+    settled[u] = True
+    touched[touched_count[0]] = u
+    touched_count[0] += 1
+    du = distances[u]
+    if du + other_distances[u] < best:
+        best = du + other_distances[u]
+        meet = u
+    # Stall-on-demand: a higher-ranked node reaches u more cheaply, so no
+    # shortest path continues upward through u.
+    for i in range(stall_indptr[u], stall_indptr[u + 1]):
+        if distances[stall_indices[i]] + stall_weights[i] < du:
+            return best, meet
+    for i in range(indptr[u], indptr[u + 1]):
+        v = indices[i]
+        nd = du + weights[i]
+        if nd < distances[v]:
+            distances[v] = nd
+            predecessors[v] = edge_ids[i]
+            frontier.insert(v, nd)
+    return best, meet
+
+@njit(nogil=True, cache=True)
+def query_hierarchy(dist_f, settled_f, touched_f, count_f, frontier_f, pred_f, up_indptr, up_indices, up_weights, up_edges,
+                    dist_b, settled_b, touched_b, count_b, frontier_b, pred_b, dn_indptr, dn_indices, dn_weights, dn_edges):
+    """
+    Bidirectional upward search. Each direction only climbs in rank and
+    retires once its frontier floor reaches the best meeting distance.
+    Returns (distance, meeting node).
+    """
+    best = np.inf
+    meet = -1
+    forward = True
+    while True:
+        active_f = not frontier_f.is_empty() and frontier_f.lower_bound() < best
+        active_b = not frontier_b.is_empty() and frontier_b.lower_bound() < best
+        if not active_f and not active_b:
+            break
+        if active_f and (forward or not active_b):
+            best, meet = _upward_step(dist_f, settled_f, touched_f, count_f, frontier_f, pred_f,
+                                      up_indptr, up_indices, up_weights, up_edges,
+                                      dn_indptr, dn_indices, dn_weights, dist_b, best, meet)
+        else:
+            best, meet = _upward_step(dist_b, settled_b, touched_b, count_b, frontier_b, pred_b,
+                                      dn_indptr, dn_indices, dn_weights, dn_edges,
+                                      up_indptr, up_indices, up_weights, dist_f, best, meet)
+        forward = not forward
+    return best, meet
+
+@njit(nogil=True, cache=True)
+def unpack_path(source, target, meet, pred_f, pred_b, edge_src, edge_dst, child_a, child_b):
+    """Expand the meeting-point route into original nodes, resolving shortcuts recursively."""
+    stack = np.empty(64, dtype=np.int64)
+    nodes = np.empty(64, dtype=np.int64)
+    nodes[0] = source
+    count = 1
+    # Forward half, collected target-to-source then reversed.
+    chain = np.empty(64, dtype=np.int64)
+    length = 0
+    v = meet
+    while v != source:
+        if length == len(chain):
+            chain = _grow(chain, length + 1)
+        chain[length] = pred_f[v]
+        length += 1
+        v = edge_src[pred_f[v]]
+    forward_len = length
+    chain[:forward_len] = chain[:forward_len][::-1].copy()
+    v = meet
+    while v != target:
+        if length == len(chain):
+            chain = _grow(chain, length + 1)
+        chain[length] = pred_b[v]
+        length += 1
+        v = edge_dst[pred_b[v]]
+    for k in range(length):
+        top = 1
+        stack[0] = chain[k]
+        while top > 0:
+            top -= 1
+            e = stack[top]
+            if child_a[e] == -1:
+                if count == len(nodes):
+                    nodes = _grow(nodes, count + 1)
+                nodes[count] = edge_dst[e]
+                count += 1
+            else:
+                if top + 2 > len(stack):
+                    stack = _grow(stack, top + 2)
+                stack[top] = child_b[e]
+                stack[top + 1] = child_a[e]
+                top += 2
+    return nodes[:count].copy()
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over a static CSR topology.
+
+    Holds the contraction rank, an upward CSR for forward searches, a
+    downward CSR (stored reversed) for backward searches, and the edge pool
+    needed to unpack shortcuts. Arrays persist as .npy files and load
+    memory-mapped.
+    """
+    ARRAYS = ("rank", "up_indptr", "up_indices", "up_weights", "up_edges",
+              "down_indptr", "down_indices", "down_weights", "down_edges",
+              "edge_src", "edge_dst", "child_a", "child_b")
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @property
+    def num_nodes(self):
+        return len(self.rank)
+
+    @classmethod
+    def build(cls, indptr, indices, data, settle_limit=64):
+        """Contract a CSR topology; settle_limit bounds every witness search."""
+        rank, edge_src, edge_dst, edge_w, child_a, child_b = build_hierarchy(indptr, indices, data, settle_limit)
+        num_nodes = len(indptr) - 1
+        edge_ids = np.arange(len(edge_src), dtype=np.int64)
+        up = rank[edge_src] < rank[edge_dst]
+        down = ~up
+        up_indptr, up_indices, up_weights, up_edges = _csr_by(
+            edge_src[up], edge_dst[up], edge_w[up], edge_ids[up], num_nodes
+        )
+        down_indptr, down_indices, down_weights, down_edges = _csr_by(
+            edge_dst[down], edge_src[down], edge_w[down], edge_ids[down], num_nodes
+        )
+        return cls(
+            rank=rank, up_indptr=up_indptr, up_indices=up_indices, up_weights=up_weights, up_edges=up_edges,
+            down_indptr=down_indptr, down_indices=down_indices, down_weights=down_weights, down_edges=down_edges,
+            edge_src=edge_src, edge_dst=edge_dst, child_a=child_a, child_b=child_b
+        )
+
+    def save(self, path):
+        """Write every array as a .npy file under directory path."""
+        os.makedirs(path, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Open a hierarchy written by save(), memory-mapped by default."""
+        return cls(**{name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls.ARRAYS})
+
+    def create_workspace(self):
+        return HierarchyWorkspace(self.num_nodes)
+
+    def query(self, source, target, workspace, unpack=False):
+        """
+        Shortest distance from source to target, plus the original node
+        path when unpack=True (None if target is unreachable).
+        """
+        forward = workspace.forward
+        backward = workspace.backward
+        forward.distances[source] = 0.0
+        forward.frontier.insert(source, 0.0)
+        backward.distances[target] = 0.0
+        backward.frontier.insert(target, 0.0)
+        try:
+            dist, meet = query_hierarchy(
+                forward.distances, forward.settled, forward.touched, forward.touched_count, forward.frontier,
+                workspace.pred_forward, self.up_indptr, self.up_indices, self.up_weights, self.up_edges,
+                backward.distances, backward.settled, backward.touched, backward.touched_count, backward.frontier,
+                workspace.pred_backward, self.down_indptr, self.down_indices, self.down_weights, self.down_edges
+            )
+            if not unpack:
+                return dist
+            if meet == -1:
+                return dist, None
+            path = unpack_path(
+                source, target, meet, workspace.pred_forward, workspace.pred_backward,
+                self.edge_src, self.edge_dst, self.child_a, self.child_b
+            )
+            return dist, path
+        finally:
+            forward.reset()
+            backward.reset()
+
+class HierarchyWorkspace:
+    """Forward/backward query buffers plus predecessor edges for unpacking."""
+    def __init__(self, num_nodes):
+        self.forward = QueryWorkspace(num_nodes, IndexedHeap(num_nodes))
+        self.backward = QueryWorkspace(num_nodes, IndexedHeap(num_nodes))
+        self.pred_forward = np.empty(num_nodes, dtype=np.int64)
+        self.pred_backward = np.empty(num_nodes, dtype=np.int64)
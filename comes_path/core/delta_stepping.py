@@ -0,0 +1,200 @@
+"""
+Vecture Laboratories // Parallel Delta-Stepping Protocol
+
+Operational Directive:
+Settle whole distance buckets at once across all cores.
+"""
+
+import numpy as np
+from numba import njit, prange
+from .structures import PooledFrontierBucket
+
+@njit(parallel=True, cache=True)
+def split_light_heavy(indices, indptr, data, delta):
+    """
+    Reorder every adjacency row so light edges (w <= delta) precede heavy
+    ones. Returns the reordered indices/data, the per-row light boundary
+    and, per reordered slot, the CSR position of its edge.
+    """
+    num_nodes = len(indptr) - 1
+    split_indices = np.empty_like(indices)
+    split_data = np.empty_like(data)
+    light_end = np.empty(num_nodes, dtype=np.int64)
+    edges = np.empty(len(indices), dtype=np.int64)
+    for u in prange(num_nodes):
+        lo = indptr[u]
+        hi = indptr[u + 1]
+        k = lo
+        for i in range(lo, hi):
+            if data[i] <= delta:
+                split_indices[k] = indices[i]
+                split_data[k] = data[i]
+                edges[k] = i
+                k += 1
+        light_end[u] = k
+        for i in range(lo, hi):
+            if data[i] > delta:
+                split_indices[k] = indices[i]
+                split_data[k] = data[i]
+                edges[k] = i
+                k += 1
+    return split_indices, split_data, light_end, edges
+
+@njit(nogil=True, cache=True)
+def update_light_heavy(split_indices, split_data, light_end, edges, indptr, rows, positions, weights, delta):
+    """
+    Patch a split_light_heavy layout in place for new weights of the CSR
+    edges at positions (in rows), swapping an edge across its row's light
+    boundary when its class changes. Costs the updated rows' degrees.
+    """
+    for i in range(len(positions)):
+        u = rows[i]
+        k = indptr[u]
+        while edges[k] != positions[i]:
+            k += 1
+        split_data[k] = weights[i]
+        light = weights[i] <= delta
+        if light and k >= light_end[u]:
+            j = light_end[u]
+            light_end[u] += 1
+        elif not light and k < light_end[u]:
+            j = light_end[u] - 1
+            light_end[u] -= 1
+        else:
+            continue
+        split_indices[k], split_indices[j] = split_indices[j], split_indices[k]
+        split_data[k], split_data[j] = split_data[j], split_data[k]
+        edges[k], edges[j] = edges[j], edges[k]
+
+@njit(parallel=True, nogil=True, cache=True)
+def _gather_requests(nodes, count, heavy, distances, indices, indptr, data, light_end, offsets, req_nodes, req_dist):
+    """Emit one relaxation request per light (or heavy) edge of the given nodes."""
+    for k in prange(count):
+        u = nodes[k]
+        if heavy:
+            lo = light_end[u]
+            hi = indptr[u + 1]
+        else:
+            lo = indptr[u]
+            hi = light_end[u]
+        base = offsets[k] - lo
+        du = distances[u]
+        for e in range(lo, hi):
+            v = indices[e]
+            nd = du + data[e]
+            if nd < distances[v]:
+                req_nodes[base + e] = v
+                req_dist[base + e] = nd
+            else:
+                req_nodes[base + e] = -1
+
+@njit(parallel=True, nogil=True, cache=True)
+def _apply_requests(num_requests, req_nodes, req_dist, distances):
+    """
+    Racy parallel min over the request buffer, repeated to a fixpoint.
+    A lost race can only leave a larger value behind, which the next
+    sweep detects and corrects.
+    """
+    changed = 1
+    while changed > 0:
+        changed = 0
+        for r in prange(num_requests):
+            v = req_nodes[r]
+            if v >= 0 and req_dist[r] < distances[v]:
+                distances[v] = req_dist[r]
+                changed += 1
+
+@njit(nogil=True, cache=True)
+def _relax_phase(nodes, count, heavy, distances, indices, indptr, data, light_end,
+                 frontier, req_nodes, req_dist, stamp, phase):
+    offsets = np.empty(count + 1, dtype=np.int64)
+    offsets[0] = 0
+    for k in range(count):
+        u = nodes[k]
+        if heavy:
+            offsets[k + 1] = offsets[k] + indptr[u + 1] - light_end[u]
+        else:
+            offsets[k + 1] = offsets[k] + light_end[u] - indptr[u]
+    num_requests = offsets[count]
+    if num_requests > len(req_nodes):
+        req_nodes = np.empty(2 * num_requests, dtype=np.int64)
+        req_dist = np.empty(2 * num_requests, dtype=np.float64)
+    _gather_requests(nodes, count, heavy, distances, indices, indptr, data, light_end, offsets, req_nodes, req_dist)
+    _apply_requests(num_requests, req_nodes, req_dist, distances)
+    # Winning requests name the improved nodes; stamps deduplicate them.
+    for r in range(num_requests):
+        v = req_nodes[r]
+        if v >= 0 and req_dist[r] == distances[v] and stamp[v] != phase:
+            stamp[v] = phase
+            frontier.insert(v, distances[v])
+    return req_nodes, req_dist
+
+@njit(nogil=True, cache=True)
+def delta_stepping(source, target, indices, indptr, data, light_end, delta, num_buckets):
+    """
+    Shared-memory parallel delta-stepping SSSP.
+
+    Buckets of width delta are settled in order. Within a bucket, light
+    edges are relaxed in parallel rounds until the bucket stops refilling;
+    heavy edges of every node removed from it are then relaxed once.
+    Stops early once the current bucket lies beyond a settled target.
+    """
+    num_nodes = len(indptr) - 1
+    distances = np.full(num_nodes, np.inf, dtype=np.float64)
+    distances[source] = 0.0
+    frontier = PooledFrontierBucket(num_buckets, delta, 4096)
+    frontier.insert(source, 0.0)
+
+    current = np.empty(4096, dtype=np.int64)
+    removed = np.empty(4096, dtype=np.int64)
+    req_nodes = np.empty(4096, dtype=np.int64)
+    req_dist = np.empty(4096, dtype=np.float64)
+    round_stamp = np.full(num_nodes, -1, dtype=np.int64)
+    removed_stamp = np.full(num_nodes, -1, dtype=np.int64)
+    insert_stamp = np.full(num_nodes, -1, dtype=np.int64)
+    phase = 0
+
+    while not frontier.is_empty():
+        if len(current) < frontier.count_in_frontier:
+            current = np.empty(2 * frontier.count_in_frontier, dtype=np.int64)
+        drained = frontier.drain_current(current)
+        bucket = frontier.current_index
+        if target >= 0 and bucket * delta > distances[target]:
+            break
+        num_removed = 0
+        while drained > 0:
+            # Deduplicate lazily repeated entries for this round.
+            count = 0
+            for k in range(drained):
+                v = current[k]
+                if int(distances[v] / delta) < bucket:
+                    # Stale entry; v was settled in an earlier bucket.
+                    continue
+                if round_stamp[v] != phase:
+                    round_stamp[v] = phase
+                    current[count] = v
+                    count += 1
+                    if removed_stamp[v] != bucket:
+                        removed_stamp[v] = bucket
+                        if num_removed == len(removed):
+                            grown = np.empty(2 * len(removed), dtype=np.int64)
+                            grown[:num_removed] = removed[:num_removed]
+                            removed = grown
+                        removed[num_removed] = v
+                        num_removed += 1
+            req_nodes, req_dist = _relax_phase(
+                current, count, False, distances, indices, indptr, data, light_end,
+                frontier, req_nodes, req_dist, insert_stamp, phase
+            )
+            phase += 1
+            if frontier.current_is_empty():
+                break
+            if len(current) < frontier.count_in_frontier:
+                current = np.empty(2 * frontier.count_in_frontier, dtype=np.int64)
+            drained = frontier.drain_current(current)
+        req_nodes, req_dist = _relax_phase(
+            removed, num_removed, True, distances, indices, indptr, data, light_end,
+            frontier, req_nodes, req_dist, insert_stamp, phase
+        )
+        phase += 1
+    return distances
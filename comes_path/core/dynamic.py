@@ -0,0 +1,142 @@
+"""
+Vecture Laboratories // Dynamic Topology Repair
+
+Operational Directive:
+Absorb live edge-weight changes by repairing only the affected region of
+each tracked shortest-path tree.
+"""
+
+import numpy as np
+from numba import njit
+from .structures import IndexedHeap
+
+@njit(cache=True)
+def find_edges(indptr, indices, u, v):
+    """CSR position of each edge u[k] -> v[k], or -1 where absent."""
+    positions = np.full(len(u), -1, dtype=np.int64)
+    for k in range(len(u)):
+        for e in range(indptr[u[k]], indptr[u[k] + 1]):
+            if indices[e] == v[k]:
+                positions[k] = e
+                break
+    return positions
+
+def in_edges(indptr, indices):
+    """
+    Weight-independent incoming adjacency: (in_indptr, in_edge, in_src),
+    where in_edge holds the forward CSR position of each incoming edge.
+    """
+    n = len(indptr) - 1
+    in_edge = np.argsort(indices, kind="stable")
+    in_src = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))[in_edge]
+    in_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n), out=in_indptr[1:])
+    return in_indptr, in_edge, in_src
+
+@njit(nogil=True, cache=True)
+def _propagate(distances, parent_edges, indices, indptr, data, heap):
+    """Label-correcting Dijkstra from the nodes queued in heap; returns pops."""
+    pops = 0
+    while not heap.is_empty():
+        x = heap.pop_min()
+        pops += 1
+        dx = distances[x]
+        for e in range(indptr[x], indptr[x + 1]):
+            y = indices[e]
+            nd = dx + data[e]
+            if nd < distances[y]:
+                distances[y] = nd
+                parent_edges[y] = e
+                heap.insert(y, nd)
+    return pops
+
+@njit(nogil=True, cache=True)
+def build_tree(source, distances, parent_edges, indices, indptr, data, heap):
+    distances[source] = 0.0
+    heap.insert(source, 0.0)
+    _propagate(distances, parent_edges, indices, indptr, data, heap)
+
+@njit(nogil=True, cache=True)
+def repair_tree(distances, parent_edges, indices, indptr, data, in_indptr, in_edge, in_src,
+                edges, edge_src, old_weights, heap, affected, stack):
+    """
+    Repair one shortest-path tree after data[edges] changed from old_weights.
+
+    Increases: every tree edge that got heavier detaches its subtree, found
+    by walking child edges (parent_edges[c] == e). Detached nodes are
+    re-seeded from their non-detached in-neighbours. Decreases: the head of
+    every edge that now offers a shorter path is queued. One label-correcting
+    sweep from the queued nodes then restores exact distances, touching only
+    the detached and improved region. Returns (detached, pops).
+    """
+    count = 0
+    for k in range(len(edges)):
+        e = edges[k]
+        v = indices[e]
+        if data[e] > old_weights[k] and parent_edges[v] == e and not affected[v]:
+            affected[v] = True
+            stack[count] = v
+            count += 1
+    i = 0
+    while i < count:
+        x = stack[i]
+        i += 1
+        for e in range(indptr[x], indptr[x + 1]):
+            c = indices[e]
+            if parent_edges[c] == e and not affected[c]:
+                affected[c] = True
+                stack[count] = c
+                count += 1
+    for i in range(count):
+        distances[stack[i]] = np.inf
+        parent_edges[stack[i]] = -1
+    for i in range(count):
+        x = stack[i]
+        for j in range(in_indptr[x], in_indptr[x + 1]):
+            p = in_src[j]
+            if not affected[p]:
+                nd = distances[p] + data[in_edge[j]]
+                if nd < distances[x]:
+                    distances[x] = nd
+                    parent_edges[x] = in_edge[j]
+        if distances[x] < np.inf:
+            heap.insert(x, distances[x])
+    for i in range(count):
+        affected[stack[i]] = False
+
+    for k in range(len(edges)):
+        e = edges[k]
+        if data[e] < old_weights[k]:
+            v = indices[e]
+            nd = distances[edge_src[k]] + data[e]
+            if nd < distances[v]:
+                distances[v] = nd
+                parent_edges[v] = e
+                heap.insert(v, nd)
+    return count, _propagate(distances, parent_edges, indices, indptr, data, heap)
+
+class ShortestPathTree:
+    """
+    Single-source distances plus the CSR edge that reaches each node
+    (parent_edges, -1 for the source and unreachable nodes), kept exact by
+    ComesSolver.update_weights. Scratch buffers are allocated once, so a
+    repair costs only the region it touches. last_repair holds the
+    (detached, pops) counts of the most recent repair.
+
+    On a reordered solver, rank maps original to internal ids: distances
+    is then reported in original id order, while parent_edges stays
+    indexed by internal id and points into the solver's permuted CSR.
+    """
+    def __init__(self, source, num_nodes, rank=None):
+        self.source = source
+        self._rank = rank
+        self._distances = np.full(num_nodes, np.inf, dtype=np.float64)
+        self.parent_edges = np.full(num_nodes, -1, dtype=np.int64)
+        self.last_repair = (0, 0)
+        self._heap = IndexedHeap(num_nodes)
+        self._affected = np.zeros(num_nodes, dtype=np.bool_)
+        self._stack = np.empty(num_nodes, dtype=np.int64)
+
+    @property
+    def distances(self):
+        return self._distances if self._rank is None else self._distances[self._rank]
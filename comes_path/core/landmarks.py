@@ -0,0 +1,121 @@
+"""
+Vecture Laboratories // Landmark Triangulation (ALT)
+
+Operational Directive:
+Bound remaining distance through landmark tables and steer target queries.
+"""
+
+import os
+import numpy as np
+from numba import njit
+
+class LandmarkIndex:
+    """
+    Landmark distance tables for goal-directed (A*) target queries.
+
+    from_landmarks[v, i] = d(L_i, v) and to_landmarks[v, i] = d(v, L_i),
+    stored node-major so one node's bounds share a cache line. By the
+    triangle inequality, max_i max(d(L_i, t) - d(L_i, v), d(v, L_i) - d(t, L_i))
+    never overestimates d(v, t).
+
+    Tables persist as plain .npy files and load memory-mapped, so one
+    page-cache copy serves every worker process.
+    """
+    def __init__(self, landmarks, from_landmarks, to_landmarks):
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+
+    @property
+    def symmetric(self):
+        return self.to_landmarks is self.from_landmarks
+
+    def save(self, path):
+        """Write the tables as .npy files under directory path."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "landmarks.npy"), self.landmarks)
+        np.save(os.path.join(path, "from_landmarks.npy"), self.from_landmarks)
+        if not self.symmetric:
+            np.save(os.path.join(path, "to_landmarks.npy"), self.to_landmarks)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Open tables written by save(), memory-mapped by default."""
+        landmarks = np.load(os.path.join(path, "landmarks.npy"))
+        from_landmarks = np.load(os.path.join(path, "from_landmarks.npy"), mmap_mode=mmap_mode)
+        to_path = os.path.join(path, "to_landmarks.npy")
+        if os.path.exists(to_path):
+            to_landmarks = np.load(to_path, mmap_mode=mmap_mode)
+        else:
+            to_landmarks = from_landmarks
+        return cls(landmarks, from_landmarks, to_landmarks)
+
+def select_landmarks(forward_sssp, num_nodes, k, seed=0):
+    """
+    Farthest-point landmark selection.
+
+    Starting from a random node, each new landmark is the reachable node
+    farthest from all landmarks chosen so far. Returns the landmark ids and
+    their forward distance rows.
+    """
+    rng = np.random.default_rng(seed)
+    start = int(rng.integers(num_nodes))
+    nearest = forward_sssp(start)
+    landmarks = []
+    rows = []
+    for _ in range(min(k, num_nodes)):
+        candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+        if landmarks:
+            candidates[landmarks] = -1.0
+        landmark = int(np.argmax(candidates))
+        if candidates[landmark] < 0.0:
+            # Everything reachable is covered; restart in an unseen component.
+            unseen = np.flatnonzero(np.isinf(nearest))
+            if len(unseen) == 0:
+                break
+            landmark = int(rng.choice(unseen))
+        row = forward_sssp(landmark)
+        landmarks.append(landmark)
+        rows.append(row)
+        nearest = row if len(landmarks) == 1 else np.minimum(nearest, row)
+    return np.array(landmarks, dtype=np.int64), rows
+
+@njit(nogil=True, cache=True)
+def alt_bound(v, target, from_landmarks, to_landmarks):
+    """Admissible lower bound on d(v, target) from the landmark tables."""
+    bound = 0.0
+    for i in range(from_landmarks.shape[1]):
+        lt = from_landmarks[target, i]
+        lv = from_landmarks[v, i]
+        if lt < np.inf and lv < np.inf and lt - lv > bound:
+            bound = lt - lv
+        vl = to_landmarks[v, i]
+        tl = to_landmarks[target, i]
+        if vl < np.inf and tl < np.inf and vl - tl > bound:
+            bound = vl - tl
+    return bound
+
+@njit(nogil=True, cache=True)
+def solve_astar(source, target, distances, settled, touched, touched_count, indices, indptr, data,
+                from_landmarks, to_landmarks, frontier):
+    """
+    A* over an exact-priority frontier keyed by g(v) + alt_bound(v).
+    The landmark bound is consistent, so settled labels are final.
+    """
+    frontier.insert(source, alt_bound(source, target, from_landmarks, to_landmarks))
+    while not frontier.is_empty():
+        u = frontier.pop_min()
+        if u == -1: break
+        if settled[u]: continue
+        settled[u] = True
+        touched[touched_count[0]] = u
+        touched_count[0] += 1
+        if u == target: break
+        du = distances[u]
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            nd = du + data[i]
+            if nd < distances[v]:
+                distances[v] = nd
+                frontier.insert(v, nd + alt_bound(v, target, from_landmarks, to_landmarks))
+    return distances[target]
@@ -5,15 +5,50 @@ Operational Directive:
 Calculate the Dial-Comes Invariant based on edge weight distribution.
 """
 
+from typing import TYPE_CHECKING
 import numpy as np
-from scipy.sparse import csr_matrix
 
-def partition_graph(adj_csr: csr_matrix):
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# Circular buffer ceiling; spans beyond it would wrap and mix distances.
+MAX_BUCKETS = 131072
+# Buckets a median edge may skip before empty-bucket scanning dominates.
+MAX_MEDIAN_SPAN = 256
+
+# Largest exact integer distance key; beyond it the dial engine is skipped.
+MAX_DIAL_DISTANCE = np.iinfo(np.int64).max // 2
+
+def integral_gcd(weights, num_nodes):
+    """
+    GCD of the weights if all are positive integers, node and edge ids fit
+    int32 and every simple-path distance fits the integer range in units of
+    the GCD, else 0.
+    """
+    if max(len(weights), num_nodes) >= np.iinfo(np.int32).max:
+        return 0
+    if len(weights) == 0 or np.min(weights) < 1 or np.max(weights) > 2.0 ** 53:
+        return 0
+    as_int = weights.astype(np.int64)
+    if not np.array_equal(as_int, weights):
+        return 0
+    gcd = int(np.gcd.reduce(as_int))
+    if (int(np.max(as_int)) // gcd) * max(1, num_nodes - 1) > MAX_DIAL_DISTANCE:
+        return 0
+    return gcd
+
+def partition_graph(adj_csr: "csr_matrix"):
     """
     Extract optimal bucket parameters from CSR topology.
     
     Ensures that bucket_width <= min_weight to maintain the integrity 
     of the settlement protocol.
+
+    Selects the "radix" engine when the weight histogram is too wide for
+    the circular buffer: either max_w / min_w exceeds MAX_BUCKETS, or the
+    median edge jumps across more than MAX_MEDIAN_SPAN empty buckets.
+    Otherwise integral weights (weight_gcd > 0) select the exact integer
+    "dial" engine, and everything else the float "bucket" engine.
     """
     weights = adj_csr.data
     min_w = np.min(weights)
@@ -25,10 +60,27 @@ def partition_graph(adj_csr: csr_matrix):
     # Scaling circular buffer capacity to graph diameter.
     min_buckets = int(max_w / recommended_width) + 2
     num_buckets = 1024
-    while num_buckets < min_buckets and num_buckets < 100000:
+    while num_buckets < min_buckets and num_buckets < MAX_BUCKETS:
         num_buckets *= 2
+
+    # Delta-stepping width: ~max_w / mean degree (Meyer & Sanders), kept at
+    # or above min_w and coarse enough for the ring to cover max_w.
+    mean_degree = max(1.0, len(weights) / max(1, adj_csr.shape[0]))
+    delta = max(recommended_width, max_w / mean_degree, max_w / (MAX_BUCKETS - 2))
+    delta_buckets = int(max_w / delta) + 2
+
+    median_span = np.median(weights) / recommended_width
+    weight_gcd = integral_gcd(weights, adj_csr.shape[0])
+    if min_buckets > MAX_BUCKETS or median_span > MAX_MEDIAN_SPAN:
+        engine = "radix"
+    else:
+        engine = "dial" if weight_gcd > 0 else "bucket"
         
     return {
         "bucket_width": recommended_width,
-        "num_buckets": num_buckets
-    }
\ No newline at end of file
+        "num_buckets": num_buckets,
+        "engine": engine,
+        "delta": delta,
+        "delta_buckets": delta_buckets,
+        "weight_gcd": weight_gcd
+    }
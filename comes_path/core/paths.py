@@ -0,0 +1,42 @@
+"""
+Vecture Laboratories // Path Extraction
+
+Operational Directive:
+Unwind recorded shortest-path trees into flat path arrays, many targets
+per call, without Python-level lists.
+"""
+
+import numpy as np
+from numba import njit
+
+@njit(nogil=True, cache=True)
+def extract_paths(predecessors, parent_edges, targets, reached):
+    """
+    Paths to every targets[i] (with reached[i]) in one flat layout: path i
+    is nodes[offsets[i]:offsets[i + 1]], source first; unreached targets
+    get an empty slice. edges is aligned with nodes and holds the edge
+    entering each node (-1 at the source). predecessors must be -1 at the
+    source of the search.
+    """
+    m = len(targets)
+    offsets = np.zeros(m + 1, dtype=np.int64)
+    for i in range(m):
+        length = 0
+        if reached[i]:
+            v = targets[i]
+            while v != -1:
+                length += 1
+                v = predecessors[v]
+        offsets[i + 1] = offsets[i] + length
+    nodes = np.empty(offsets[m], dtype=np.int64)
+    edges = np.empty(offsets[m], dtype=np.int64)
+    for i in range(m):
+        pos = offsets[i + 1] - 1
+        if reached[i]:
+            v = targets[i]
+            while v != -1:
+                nodes[pos] = v
+                edges[pos] = parent_edges[v]
+                pos -= 1
+                v = predecessors[v]
+    return offsets, nodes, edges
@@ -7,8 +7,9 @@ Execute look-ahead relaxations to bypass linear graph crawling.
 
 import numpy as np
 from numba import njit, int64, float64
+from .stats import RELAXATIONS, DECREASES, PIVOT_EXPANSIONS
 
-@njit(fastmath=True, cache=True)
+@njit(fastmath=True, nogil=True, cache=True)
 def relax_pivots(
     u, 
     distances, 
@@ -17,30 +18,52 @@ def relax_pivots(
     data, 
     pivots, 
     frontier,
-    lookahead_depth=1 # Default to 1 for stability
+    lookahead_depth=1, # Default to 1 for stability
+    stats=None,
+    predecessors=None,
+    parent_edges=None
 ):
     """
     Perform multi-hop topological jumps via iterative relaxation.
+    stats: None, or a counter array (see core.stats) to accumulate into.
+    predecessors/parent_edges: None, or arrays that receive the node and
+    CSR edge behind every distance written, look-ahead writes included.
     """
     for i in range(indptr[u], indptr[u + 1]):
         v = indices[i]
         weight = data[i]
         new_dist = distances[u] + weight
+        if stats is not None:
+            stats[RELAXATIONS] += 1
         
         if new_dist < distances[v]:
             distances[v] = new_dist
-            frontier.insert(v, new_dist)
+            if predecessors is not None:
+                predecessors[v] = u
+                parent_edges[v] = i
+            frontier.insert(v, new_dist, stats)
+            if stats is not None:
+                stats[DECREASES] += 1
             
             # Limited iterative look-ahead for pivots to avoid stack overflow
             if pivots[v]:
+                if stats is not None:
+                    stats[PIVOT_EXPANSIONS] += 1
                 # Single-level look-ahead expansion
                 for j in range(indptr[v], indptr[v+1]):
                     nv = indices[j]
                     nw = data[j]
                     nd = new_dist + nw
+                    if stats is not None:
+                        stats[RELAXATIONS] += 1
                     if nd < distances[nv]:
                         distances[nv] = nd
-                        frontier.insert(nv, nd)
+                        if predecessors is not None:
+                            predecessors[nv] = v
+                            parent_edges[nv] = j
+                        frontier.insert(nv, nd, stats)
+                        if stats is not None:
+                            stats[DECREASES] += 1
 
 @njit(cache=True)
 def identify_pivots(indptr, threshold=None):
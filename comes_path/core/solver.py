@@ -5,12 +5,26 @@ Operational Directive:
 Govern the transition between Comes Partitioning and Hybrid Fallback protocols.
 """
 
+import asyncio
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from .structures import FrontierBucket
+from .structures import FrontierBucket, PooledFrontierBucket, DialFrontier, RadixFrontier, IndexedHeap
 from .relaxation import relax_pivots, identify_pivots
 from .partitioning import partition_graph
-from numba import njit
-import heapq
+from .workspace import QueryWorkspace
+from .delta_stepping import delta_stepping, split_light_heavy, update_light_heavy
+from .landmarks import LandmarkIndex, select_landmarks, solve_astar
+from .contraction import ContractionHierarchy
+from .stats import POPS, STALE_POPS, new_stats, stats_to_dict
+from .dynamic import ShortestPathTree, build_tree, repair_tree, find_edges, in_edges
+from .reordering import node_order, permute_csr
+from .paths import extract_paths
+from numba import njit, prange, get_num_threads, config
+
+ENGINES = ("heap", "bucket", "dial", "radix", "delta")
 
 class ComesSolver:
     """
@@ -18,84 +32,1040 @@ class ComesSolver:
     
     Orchestrates CSR-based traversal utilizing the Comes breakthrough.
     Maintains clinical precision through the Dial-Comes Invariant.
+
+    frontier_layout selects the bucket storage: "pooled" (linked slots in a
+    shared arena, O(V + live entries)) or "dense" (one 2D bucket matrix).
+    Graphs whose weight range defeats the circular buffer are routed to the
+    radix engine by partition_graph instead.
+
+    engine overrides the automatic choice: "heap", "bucket", "dial",
+    "radix", or "delta" (parallel delta-stepping for very large
+    single-source queries). "dial" is chosen automatically for positive
+    integral weights: distances become exact integers in units of the
+    weight GCD, held as int32 where the longest possible path fits, over
+    int32 indices/indptr. Results are still reported as float64. A forced
+    "bucket" or "dial" engine raises ValueError when its ring cannot
+    settle the weights exactly (zero weights, or a max/min ratio beyond
+    MAX_BUCKETS), here or in update_weights.
+
+    reorder/coordinates/autotune are forwarded to set_graph.
+
+    Queries are thread-safe: calls without an explicit workspace use one
+    default workspace per thread, and the search kernels release the GIL,
+    so threads sharing one solver (and one in-memory graph) run on
+    separate cores. ashortest_path offloads to a thread pool of
+    query_threads workers (default: numba's thread count); close() shuts
+    it down. Graph mutations (set_graph, update_weights, build_*/load_*)
+    must not overlap queries, and concurrent parallel kernels (the delta
+    engine, shortest_paths) need numba's "tbb" or "omp" threading layer.
     """
-    def __init__(self, adjacency_matrix_csr=None):
+    def __init__(self, adjacency_matrix_csr=None, frontier_layout="pooled", engine=None, reorder=None,
+                 coordinates=None, query_threads=None, autotune=False):
+        if frontier_layout not in ("pooled", "dense"):
+            raise ValueError(f"Unknown frontier layout: {frontier_layout}")
+        if engine is not None and engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.frontier_layout = frontier_layout
+        self.requested_engine = engine
+        self.engine = None
         self.indices = None
         self.indptr = None
         self.data = None
         self.pivots = None
         self.params = None
         self.is_sparse_fallback = False
+        self.query_threads = query_threads
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._workspaces = threading.local()
+        # Tokens of the engine configuration and the hierarchy that
+        # workspaces (and their hierarchy companions) were built for.
+        self._generation = object()
+        self._hierarchy_token = object()
+        self._light_heavy = None
+        self._reverse = None
+        self._reverse_positions = None
+        self.landmark_index = None
+        self.hierarchy = None
+        self._in_edges = None
+        self._trees = weakref.WeakSet()
+        self._dial = None
+        self._reverse_dial = None
+        self.permutation = None
+        self._rank = None
         if adjacency_matrix_csr is not None:
-            self.set_graph(adjacency_matrix_csr)
+            self.set_graph(adjacency_matrix_csr, reorder=reorder, coordinates=coordinates, autotune=autotune)
+
+    def set_graph(self, csr_matrix, params=None, pivots=None, reorder=None, coordinates=None, autotune=False):
+        """
+        Ingest CSR topology and determine operational mode.
+
+        Any CSR-like object with indptr, indices, data and shape is
+        accepted, e.g. a scipy csr_matrix, a GraphFile from load_graph or a
+        SharedGraph; the latter two serve queries without importing scipy.
+
+        params/pivots accept precomputed partition_graph output and pivot
+        mask (as stored in .comes archives), skipping both edge passes.
 
-    def set_graph(self, csr_matrix):
-        """Ingest CSR topology and determine operational mode."""
-        self.indices = csr_matrix.indices
-        self.indptr = csr_matrix.indptr
-        self.data = csr_matrix.data
+        reorder relabels nodes for cache locality before anything else runs:
+        "rcm" (reverse Cuthill-McKee), "degree" or "hilbert" (needs (lat, lon)
+        coordinates, e.g. GraphFile.coordinates). The CSR is permuted once
+        into private arrays and permutation[internal_id] = original_id is
+        kept; every public method takes and returns original node ids.
+        Landmark and hierarchy artefacts use internal ids, so they only
+        transfer between solvers with the same reordering.
+
+        Without an explicit engine, graphs with m < 2n take the heap engine
+        and the rest partition_graph's choice. autotune=True instead times
+        every engine and parameter set on this graph (see
+        autotune.autotune_engine) and keeps the fastest; the decision lands
+        in self.params, so passing tuned params adopts it without tuning
+        again. A GraphFile from an archive written with autotune=True
+        carries them: without explicit params/pivots they are adopted. An
+        update_weights that recalibrates reverts to the untuned choice
+        (engine and default pivots).
+        """
+        self.permutation = None
+        self._rank = None
+        stored = getattr(csr_matrix, "params", None)
+        if params is None and pivots is None and stored is not None and stored.get("tuned", False):
+            params, pivots = stored, csr_matrix.pivots
+        indptr, indices, data = csr_matrix.indptr, csr_matrix.indices, csr_matrix.data
+        if reorder is not None:
+            order = node_order(csr_matrix, reorder, coordinates)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            indptr, indices, data = permute_csr(indptr, indices, data, order, rank)
+            if pivots is not None:
+                pivots = np.asarray(pivots)[order]
+            self.permutation = order
+            self._rank = rank
+        self.indices = indices
+        self.indptr = indptr
+        self.data = data
+        self._workspaces = threading.local()
+        self._generation = object()
+        self._hierarchy_token = object()
+        self._light_heavy = None
+        self._reverse = None
+        self._reverse_positions = None
+        self.landmark_index = None
+        self.hierarchy = None
+        self._in_edges = None
+        self._trees = weakref.WeakSet()
         n = len(self.indptr) - 1
         m = len(self.indices)
         
-        if m < 2 * n:
-            self.is_sparse_fallback = True
+        engine = self.requested_engine
+        tuned = engine is None and params is not None and params.get("tuned", False)
+        if engine is None and autotune and not tuned and m > 0:
+            from .autotune import autotune_engine
+            params, _ = autotune_engine(self.indptr, self.indices, self.data, self.frontier_layout)
+            pivots = None
+            tuned = True
+        if tuned:
+            engine = params["engine"]
+        elif engine is None and m < 2 * n:
+            engine = "heap"
+        self.is_sparse_fallback = engine == "heap"
+        if self.is_sparse_fallback:
+            # Heap fallback: plain Dijkstra, no pivot look-ahead.
+            self.params = params
+            self.pivots = np.zeros(n, dtype=np.bool_)
+        else:
+            # Weights and size are invariant under reordering.
+            self.params = partition_graph(csr_matrix) if params is None else params
+            # Untuned params carry no threshold: the 99th-percentile degree.
+            self.pivots = identify_pivots(self.indptr, self.params.get("pivot_threshold")) if pivots is None else pivots
+            if engine is None:
+                engine = self.params["engine"]
+        if engine in ("bucket", "dial") and not _ring_covers(engine, self.params, self.data):
+            if self.requested_engine is not None:
+                raise ValueError(f"The {engine} engine's bucket ring cannot cover this weight range; use radix.")
+            engine = "radix"
+        if engine == "delta":
+            self._light_heavy = split_light_heavy(self.indices, self.indptr, self.data, self.params["delta"])
+        self.engine = engine
+        # A prebuilt (indices, indptr, weights) triple, e.g. SharedGraph.compact,
+        # describes the graph only in its original numbering.
+        self._configure_dial(getattr(csr_matrix, "compact", None) if reorder is None else None)
+
+    def _configure_dial(self, compact=None):
+        """
+        Build the dial engine's compact integer arrays (weights in units of
+        weight_gcd), or adopt a prebuilt (indices, indptr, weights) triple.
+        """
+        self._dial = None
+        self._reverse_dial = None
+        if self.engine != "dial":
+            return
+        gcd = self.params.get("weight_gcd", 0)
+        if not gcd:
+            raise ValueError("The dial engine requires positive integral weights.")
+        if compact is not None:
+            self._dial = (*compact, gcd)
         else:
-            self.is_sparse_fallback = False
-            self.params = partition_graph(csr_matrix)
-            self.pivots = identify_pivots(self.indptr)
+            self._dial = _compact_arrays(self.indices, self.indptr, self.data, gcd)
 
-    def shortest_path(self, source, target=None):
+    def shortest_path(self, source, target=None, workspace=None, bidirectional=False, use_landmarks=True,
+                      use_hierarchy=True, stats=False, cutoff=None, targets=None, k=None, predecessors=False):
         """
         Derive shortest distance from source node.
         Returns full distance array or single scalar if target is specified.
+
+        Queries run inside a QueryWorkspace that is reset sparsely afterwards,
+        so target queries cost only the region they explore. Pass an explicit
+        workspace (see create_workspace) to manage buffers per caller.
+
+        bidirectional=True grows a second search backwards from the target
+        over the reverse graph and stops once the two frontiers can no
+        longer improve the best meeting point.
+
+        Once a landmark index is attached (build_landmarks/load_landmarks),
+        target queries run as A* unless use_landmarks=False. An attached
+        contraction hierarchy (build_hierarchy/load_hierarchy) takes
+        precedence for target queries unless use_hierarchy=False.
+
+        stats=True returns (result, counters): a dict of pops, stale pops,
+        relaxations, decreases, pivot expansions, empty buckets scanned,
+        bitmask word skips, wrap-arounds and resize events/bytes copied.
+        Counters cover the frontier engines (heap, bucket, dial, radix); queries
+        without stats run a separately compiled, counter-free specialization.
+
+        cutoff and targets switch to a bounded query returning compact
+        (node_ids, distances) arrays sorted by distance: every node within
+        cutoff, and/or the k nearest members of targets (all of them when k
+        is None). The search stops once the frontier floor passes the bound,
+        so the query costs only the region it explores.
+
+        predecessors=True (full queries, frontier engines) returns
+        (distances, predecessors): the tree recorded while relaxing, as the
+        previous node on a shortest path to each node, -1 at the source and
+        at unreachable nodes. routes() turns recorded trees into paths.
         """
-        num_nodes = len(self.indptr) - 1
-        distances = np.full(num_nodes, np.inf, dtype=np.float64)
-        settled = np.zeros(num_nodes, dtype=np.bool_)
-        distances[source] = 0.0
+        if predecessors and (target is not None or bidirectional or self.engine == "delta"
+                             or cutoff is not None or targets is not None or k is not None):
+            raise ValueError("Predecessors are recorded by full frontier-engine queries; use routes() for targets.")
+        source = self._internal(source, "Source")
+        if target is not None:
+            target = self._internal(target, "Target")
+        if cutoff is not None or targets is not None or k is not None:
+            if target is not None or bidirectional:
+                raise ValueError("Bounded queries cannot be combined with a single target.")
+            return self._bounded(source, cutoff, targets, k, workspace, stats)
+        if stats and (bidirectional or self.engine == "delta" or (target is not None and (
+                (use_hierarchy and self.hierarchy is not None)
+                or (use_landmarks and self.landmark_index is not None)))):
+            raise ValueError("Stats are gathered by the heap, bucket, dial and radix engines only.")
+        if bidirectional:
+            if target is None:
+                raise ValueError("Bidirectional search requires a target.")
+            return self._bidirectional(source, target, workspace)
+        if target is not None and use_hierarchy and self.hierarchy is not None:
+            return self._hierarchy_query(source, target, workspace, unpack=False)
+        if target is not None and use_landmarks and self.landmark_index is not None:
+            return self._goal_directed(source, target, workspace)
+        if self.engine == "delta":
+            distances = self._delta_stepping(source, target)
+            if target is not None:
+                return distances[target]
+            return distances if self._rank is None else distances[self._rank]
+        workspace = self._workspace(workspace)
         
-        if self.is_sparse_fallback:
-            res = self._dijkstra_fallback(source, target, distances, settled)
-            return res[target] if target is not None else res
+        distances = workspace.distances
+        frontier = workspace.frontier
+        counters = new_stats() if stats else None
+        indices, indptr, weights = self._search_arrays()
+        parents = parent_edges = None
+        if predecessors:
+            parents, parent_edges = workspace.tree_buffers()
+            parents[source] = -1
+        distances[source] = 0
+        frontier.insert(source, distances[source], counters)
+        try:
+            _solve(
+                source, target, distances, workspace.settled, workspace.touched, workspace.touched_count,
+                indices, indptr, weights, self.pivots, frontier, counters,
+                predecessors=parents, parent_edges=parent_edges
+            )
+            result = self._export(distances, [target])[0] if target is not None else self._export(distances)
+            if predecessors:
+                result = (result, self._export_tree(distances != workspace.unreached, parents))
+            return (result, stats_to_dict(counters)) if stats else result
+        finally:
+            workspace.reset()
+
+    async def ashortest_path(self, source, target=None, **kwargs):
+        """
+        shortest_path run on the solver's query thread pool, so an asyncio
+        loop stays responsive and concurrent awaits spread over cores.
+        Accepts the same arguments as shortest_path except workspace: every
+        pool thread uses its own default workspace.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._query_executor(), functools.partial(self.shortest_path, source, target, **kwargs)
+        )
+
+    def _query_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.query_threads or config.NUMBA_NUM_THREADS, thread_name_prefix="comes-query"
+                )
+            return self._executor
+
+    def close(self):
+        """Shut down the ashortest_path thread pool (recreated on next use)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _bounded(self, source, cutoff, targets, k, workspace, stats):
+        if k is not None and targets is None:
+            raise ValueError("k requires a target set.")
+        workspace = self._workspace(workspace)
+        mask = None
+        if targets is not None:
+            targets = self._internal(np.unique(np.asarray(targets, dtype=np.int64)), "Target")
+            k = len(targets) if k is None else int(k)
+            if k < 1:
+                raise ValueError("k must be at least 1.")
+            mask = workspace.target_mask
+            mask[targets] = True
+        bound = None
+        if cutoff is not None:
+            cutoff = float(cutoff)
+            bound = cutoff / self._dial[3] if self._dial is not None else cutoff
+
+        distances = workspace.distances
+        frontier = workspace.frontier
+        counters = new_stats() if stats else None
+        indices, indptr, weights = self._search_arrays()
+        distances[source] = 0
+        frontier.insert(source, distances[source], counters)
+        try:
+            _solve(
+                source, None, distances, workspace.settled, workspace.touched, workspace.touched_count,
+                indices, indptr, weights, self.pivots, frontier, counters, bound, mask, k or 0
+            )
+            nodes = workspace.touched[:workspace.touched_count[0]]
+            if mask is not None:
+                nodes = nodes[mask[nodes]]
+            reached = self._export(distances, nodes)
+            if cutoff is not None:
+                keep = reached <= cutoff
+                nodes, reached = nodes[keep], reached[keep]
+            order = np.argsort(reached, kind="stable")
+            if mask is not None:
+                order = order[:k]
+            result = (self._original(nodes[order]), reached[order])
+            return (result, stats_to_dict(counters)) if stats else result
+        finally:
+            if mask is not None:
+                mask[targets] = False
+            workspace.reset()
+
+    def _export_tree(self, reached, predecessors):
+        """Predecessor array in original ids and order, -1 where unreached."""
+        tree = np.where(reached, predecessors, -1)
+        if self._rank is None:
+            return tree
+        tree = tree[self._rank]
+        return np.where(tree >= 0, self.permutation[np.maximum(tree, 0)], -1)
+
+    def routes(self, source, targets, workspace=None):
+        """
+        Shortest paths from source to every node of targets, from one search
+        that records predecessors while relaxing and stops once all targets
+        have settled. Returns (distances, offsets, nodes, edges): path i is
+        nodes[offsets[i]:offsets[i + 1]] (original ids, source first), empty
+        with distance inf when targets[i] is unreachable. edges is aligned
+        with nodes: the CSR position of the edge entering each node (into
+        the solver's indices/data, i.e. the permuted CSR of a reordered
+        solver), -1 at the source.
+        """
+        if self.engine == "delta":
+            raise ValueError("Routes are recorded by the heap, bucket, dial and radix engines only.")
+        source = self._internal(source, "Source")
+        targets = self._internal(np.asarray(targets, dtype=np.int64).reshape(-1), "Target")
+        workspace = self._workspace(workspace)
+        parents, parent_edges = workspace.tree_buffers()
+        unique = np.unique(targets)
+        mask = workspace.target_mask
+        mask[unique] = True
+        distances = workspace.distances
+        indices, indptr, weights = self._search_arrays()
+        parents[source] = -1
+        distances[source] = 0
+        workspace.frontier.insert(source, distances[source])
+        try:
+            _solve(
+                source, None, distances, workspace.settled, workspace.touched, workspace.touched_count,
+                indices, indptr, weights, self.pivots, workspace.frontier, None, None, mask, len(unique),
+                parents, parent_edges
+            )
+            reached = workspace.settled[targets]
+            offsets, nodes, edges = extract_paths(parents, parent_edges, targets, reached)
+            return self._export(distances, targets), offsets, self._original(nodes), edges
+        finally:
+            mask[unique] = False
+            workspace.reset()
+
+    def _search_arrays(self):
+        """(indices, indptr, weights) the frontier engines relax over."""
+        if self._dial is not None:
+            return self._dial[:3]
+        return self.indices, self.indptr, self.data
+
+    def _internal(self, nodes, kind="Node"):
+        """
+        Original node ids -> the ids of the (possibly reordered) CSR. Ids
+        outside [0, n) raise IndexError before any workspace is touched: a
+        negative id would otherwise wrap around inside the kernels.
+        """
+        ids = np.asarray(nodes)
+        if ids.size:
+            n = self.indptr.shape[0] - 1
+            bad = (ids < 0) | (ids >= n)
+            if np.any(bad):
+                raise IndexError(f"{kind} {ids[bad].flat[0]} out of range for {n} nodes.")
+        return nodes if self._rank is None else self._rank[nodes]
+
+    def _original(self, nodes):
+        """Internal node ids -> original node ids."""
+        return nodes if self.permutation is None else self.permutation[nodes]
+
+    def _export(self, distances, nodes=None):
+        """
+        Float64 copy of distances in the graph's weight units: of the given
+        internal nodes, or of every node in original id order.
+        """
+        if nodes is None:
+            nodes = self._rank
+        values = distances if nodes is None else distances[nodes]
+        if self._dial is None:
+            return values.copy() if nodes is None else values
+        out = values.astype(np.float64)
+        out[values == np.iinfo(values.dtype).max] = np.inf
+        out *= self._dial[3]
+        return out
+
+    def track(self, source):
+        """
+        Solve from source and keep the result as a ShortestPathTree that
+        update_weights repairs incrementally for as long as it is referenced.
+        """
+        tree = ShortestPathTree(source, len(self.indptr) - 1, self._rank)
+        build_tree(self._internal(source, "Source"), tree._distances, tree.parent_edges, self.indices, self.indptr, self.data,
+                   tree._heap)
+        self._trees.add(tree)
+        return tree
+
+    def update_weights(self, u, v, weights):
+        """
+        Set the weights of existing edges u[k] -> v[k] in place (the CSR data
+        array is shared with the matrix given to set_graph, unless it was
+        reordered) and repair every tracked ShortestPathTree.
+
+        Repairs cost the region whose distances change, not the graph; the
+        transposed CSR, the dial weights and the delta engine's light/heavy
+        rows are patched at the updated edges. The partition params are
+        recomputed here, before any later query, and only when a new weight
+        falls outside the calibrated bucket range; explicit workspaces from
+        before such a recalibration are then rejected. The pivot mask
+        depends on degrees alone and is kept. Landmark tables and
+        contraction hierarchies are dropped, because their bounds would be
+        stale.
+        """
+        u = np.atleast_1d(np.asarray(u, dtype=np.int64))
+        v = np.atleast_1d(np.asarray(v, dtype=np.int64))
+        weights = np.atleast_1d(np.asarray(weights, dtype=np.float64))
+        if not (u.shape == v.shape == weights.shape):
+            raise ValueError("u, v and weights must have the same length.")
+        if np.any(~(weights >= 0)):
+            raise ValueError("Edge weights must be non-negative.")
+        if self.requested_engine == "dial" and np.any((weights < 1) | (weights != np.floor(weights))):
+            raise ValueError("The dial engine requires positive integral weights.")
+        positions = find_edges(self.indptr, self.indices, self._internal(u), self._internal(v))
+        if np.any(positions < 0):
+            k = int(np.argmax(positions < 0))
+            raise ValueError(f"Edge ({u[k]}, {v[k]}) is not in the graph; only existing weights can change.")
+        # The last update of an edge in the batch wins.
+        positions, last = np.unique(positions[::-1], return_index=True)
+        weights = weights[::-1][last]
+        sources = self._internal(u[::-1][last])
+
+        if not self.data.flags.writeable:
+            self.data = self.data.copy()
+        old_weights = self.data[positions].copy()
+        self.data[positions] = weights
+
+        stale = False
+        if self.params is not None and len(weights):
+            if self.engine in ("bucket", "dial"):
+                width = self.params["bucket_width"]
+                span = (self.params["num_buckets"] - 2) * width
+            elif self.engine == "delta":
+                width = 0.0
+                span = (self.params["delta_buckets"] - 2) * self.params["delta"]
+            else:
+                width, span = 0.0, np.inf
+            if weights.min() < width or weights.max() > span:
+                stale = True
+            elif self._dial is not None:
+                gcd = self._dial[3]
+                limit = np.iinfo(self._dial[2].dtype).max // max(1, len(self.indptr) - 2)
+                stale = not (np.all(weights % gcd == 0) and weights.max() // gcd <= limit)
+        if stale:
+            try:
+                self._recalibrate()
+            except ValueError:
+                self.data[positions] = old_weights
+                raise
+        elif self._dial is not None:
+            self._dial[2][positions] = weights // self._dial[3]
+        elif self._light_heavy is not None:
+            update_light_heavy(*self._light_heavy, self.indptr, sources, positions, weights, self.params["delta"])
+        if self._reverse is not None:
+            self._patch_reverse(positions, weights)
+        self.landmark_index = None
+        if self.hierarchy is not None:
+            self.hierarchy = None
+            self._hierarchy_token = object()
+
+        if len(self._trees):
+            if self._in_edges is None:
+                self._in_edges = in_edges(self.indptr, self.indices)
+            in_indptr, in_edge, in_src = self._in_edges
+            for tree in list(self._trees):
+                tree.last_repair = repair_tree(
+                    tree._distances, tree.parent_edges, self.indices, self.indptr, self.data,
+                    in_indptr, in_edge, in_src, positions, sources, old_weights,
+                    tree._heap, tree._affected, tree._stack
+                )
+
+    def _recalibrate(self):
+        """
+        Recompute partition params after update_weights left the calibrated
+        range and reselect the engine as set_graph does without tuned params:
+        a tuned engine, ring and pivot threshold do not survive the new
+        weight range. Params, engine, pivots and search arrays are built
+        first and then published together, so no query sees half of a
+        recalibration.
+        """
+        from scipy.sparse import csr_matrix
+        n = len(self.indptr) - 1
+        params = partition_graph(csr_matrix((self.data, self.indices, self.indptr), shape=(n, n)))
+        engine = self.requested_engine
+        if engine is None:
+            engine = "heap" if len(self.indices) < 2 * n else params["engine"]
+        if engine in ("bucket", "dial") and not _ring_covers(engine, params, self.data):
+            if self.requested_engine is not None:
+                raise ValueError(f"The {engine} engine's bucket ring cannot cover the new weights.")
+            engine = "radix"
+        if engine == "dial" and not params["weight_gcd"]:
+            raise ValueError("The dial engine requires positive integral weights.")
+        dial = None
+        if engine == "dial":
+            dial = _compact_arrays(self.indices, self.indptr, self.data, params["weight_gcd"])
+        light_heavy = None
+        if engine == "delta":
+            light_heavy = split_light_heavy(self.indices, self.indptr, self.data, params["delta"])
+        pivots = self.pivots
+        if engine == "heap":
+            pivots = np.zeros(n, dtype=np.bool_)
+        elif self.is_sparse_fallback or self.params.get("pivot_threshold") is not None:
+            pivots = identify_pivots(self.indptr)
+        # Workspaces survive unless their frontier or distance dtype changes.
+        generation = self._generation
+        workspaces = self._workspaces
+        if _frontier_key(engine, params, dial) != _frontier_key(self.engine, self.params, self._dial):
+            generation = object()
+            workspaces = threading.local()
+        (self.params, self.engine, self.is_sparse_fallback, self.pivots, self._dial, self._reverse_dial,
+         self._light_heavy, self._generation, self._workspaces) = (
+            params, engine, engine == "heap", pivots, dial, None, light_heavy, generation, workspaces
+        )
+
+    def _bidirectional(self, source, target, workspace):
+        workspace = self._workspace(workspace)
+        if workspace.reverse is None:
+            workspace.reverse = self.create_workspace()
+        backward = workspace.reverse
+        indices, indptr, weights = self._search_arrays()
+        rev_indices, rev_indptr, rev_weights = self._reverse_search_arrays()
         
-        frontier = FrontierBucket(
+        workspace.distances[source] = 0
+        workspace.frontier.insert(source, workspace.distances[source])
+        backward.distances[target] = 0
+        backward.frontier.insert(target, backward.distances[target])
+        try:
+            best = _solve_bidirectional(
+                workspace.distances, workspace.settled, workspace.touched, workspace.touched_count,
+                workspace.frontier, indices, indptr, weights,
+                backward.distances, backward.settled, backward.touched, backward.touched_count,
+                backward.frontier, rev_indices, rev_indptr, rev_weights, workspace.unreached
+            )
+            if best >= workspace.unreached:
+                return np.inf
+            return best * self._dial[3] if self._dial is not None else best
+        finally:
+            workspace.reset()
+            backward.reset()
+
+    def route(self, source, target, workspace=None):
+        """
+        Derive (distance, path) from source to target, where path is the
+        array of original node ids (None if unreachable). An attached
+        contraction hierarchy answers it with shortcuts unpacked
+        recursively; otherwise it is a single-target routes() query.
+        """
+        if self.hierarchy is None:
+            distances, offsets, nodes, _ = self.routes(source, [target], workspace)
+            return distances[0], (nodes if offsets[1] > 0 else None)
+        distance, path = self._hierarchy_query(self._internal(source, "Source"), self._internal(target, "Target"),
+                                              workspace, unpack=True)
+        return distance, (None if path is None else self._original(path))
+
+    def _hierarchy_query(self, source, target, workspace, unpack):
+        workspace = self._workspace(workspace)
+        if workspace.hierarchy is None or workspace.hierarchy_token is not self._hierarchy_token:
+            workspace.hierarchy = self.hierarchy.create_workspace()
+            workspace.hierarchy_token = self._hierarchy_token
+        return self.hierarchy.query(source, target, workspace.hierarchy, unpack=unpack)
+
+    def build_hierarchy(self, settle_limit=64):
+        """
+        Contract the current graph (static topologies such as load_osm road
+        networks) and attach the resulting ContractionHierarchy.
+        settle_limit bounds every witness search.
+        """
+        self.hierarchy = ContractionHierarchy.build(self.indptr, self.indices, self.data, settle_limit)
+        self._hierarchy_token = object()
+        return self.hierarchy
+
+    def load_hierarchy(self, path, mmap_mode="r"):
+        """Attach a ContractionHierarchy saved with ContractionHierarchy.save()."""
+        hierarchy = ContractionHierarchy.load(path, mmap_mode=mmap_mode)
+        if hierarchy.num_nodes != len(self.indptr) - 1:
+            raise ValueError("Contraction hierarchy does not match the current graph.")
+        self.hierarchy = hierarchy
+        self._hierarchy_token = object()
+        return hierarchy
+
+    def _goal_directed(self, source, target, workspace):
+        workspace = self._workspace(workspace)
+        if workspace.goal_directed is None:
+            num_nodes = len(self.indptr) - 1
+            workspace.goal_directed = QueryWorkspace(num_nodes, IndexedHeap(num_nodes))
+        astar = workspace.goal_directed
+        index = self.landmark_index
+        
+        astar.distances[source] = 0.0
+        try:
+            return solve_astar(
+                source, target, astar.distances, astar.settled, astar.touched, astar.touched_count,
+                self.indices, self.indptr, self.data, index.from_landmarks, index.to_landmarks, astar.frontier
+            )
+        finally:
+            astar.reset()
+
+    def build_landmarks(self, k=16, seed=0):
+        """
+        Select k landmarks by farthest-point sampling and tabulate their
+        distances with this solver. Attaches and returns the LandmarkIndex.
+        """
+        num_nodes = len(self.indptr) - 1
+        landmarks, rows = select_landmarks(
+            lambda s: self.shortest_path(s, use_landmarks=False), num_nodes, k, seed
+        )
+        # Selection ran on original ids; the tables are indexed internally.
+        landmarks = self._internal(np.asarray(landmarks))
+        from_landmarks = np.column_stack(rows)
+        if self.permutation is not None:
+            from_landmarks = from_landmarks[self.permutation]
+        from_landmarks = np.ascontiguousarray(from_landmarks)
+        rev_indices, rev_indptr, rev_data = self._reverse_graph()
+        if rev_indices is self.indices:
+            to_landmarks = from_landmarks
+        else:
+            from scipy.sparse import csr_matrix
+            reverse = ComesSolver(
+                csr_matrix((rev_data, rev_indices, rev_indptr), shape=(num_nodes, num_nodes)),
+                frontier_layout=self.frontier_layout, engine=self.requested_engine
+            )
+            to_landmarks = np.ascontiguousarray(reverse.shortest_paths(landmarks).T)
+        self.landmark_index = LandmarkIndex(landmarks, from_landmarks, to_landmarks)
+        return self.landmark_index
+
+    def load_landmarks(self, path, mmap_mode="r"):
+        """Attach a LandmarkIndex saved with LandmarkIndex.save()."""
+        index = LandmarkIndex.load(path, mmap_mode=mmap_mode)
+        if index.from_landmarks.shape[0] != len(self.indptr) - 1:
+            raise ValueError("Landmark tables do not match the current graph.")
+        self.landmark_index = index
+        return index
+
+    def _reverse_graph(self):
+        """
+        Transposed CSR, built once per graph; symmetric inputs reuse the
+        forward arrays. _reverse_positions maps every forward CSR position
+        to its slot in the transpose, so updates patch it in place.
+        """
+        if self._reverse is None:
+            from scipy.sparse import csr_matrix
+            n = len(self.indptr) - 1
+            m = len(self.indices)
+            # Transpose the edge ids; the weights follow through them.
+            transposed = csr_matrix((np.arange(m, dtype=np.int64), self.indices, self.indptr), shape=(n, n)).T.tocsr()
+            data = self.data[transposed.data]
+            positions = np.empty(m, dtype=np.int64)
+            positions[transposed.data] = np.arange(m)
+            self._reverse_positions = positions
+            if (np.array_equal(transposed.indptr, self.indptr) and np.array_equal(transposed.indices, self.indices)
+                    and np.array_equal(data, self.data)):
+                self._reverse = (self.indices, self.indptr, self.data)
+            else:
+                self._reverse = (transposed.indices, transposed.indptr, data)
+        return self._reverse
+
+    def _patch_reverse(self, positions, weights):
+        """Carry update_weights into the transposed CSR (and its dial weights)."""
+        slots = self._reverse_positions[positions]
+        rev_indices, rev_indptr, rev_data = self._reverse
+        if rev_data is self.data:
+            # Shared arrays stay valid while every updated edge's mirror carries its weight.
+            if np.array_equal(self.data[slots], weights):
+                return
+            rev_data = np.empty_like(self.data)
+            rev_data[self._reverse_positions] = self.data
+            self._reverse = (self.indices.copy(), self.indptr.copy(), rev_data)
+            self._reverse_dial = None
+            return
+        rev_data[slots] = weights
+        if self._reverse_dial is not None:
+            self._reverse_dial[2][slots] = weights // self._reverse_dial[3]
+
+    def _reverse_search_arrays(self):
+        """_search_arrays of the transposed graph."""
+        reverse = self._reverse_graph()
+        if self._dial is None:
+            return reverse
+        if reverse[0] is self.indices:
+            return self._dial[:3]
+        if self._reverse_dial is None:
+            self._reverse_dial = _compact_arrays(*reverse, self._dial[3])
+        return self._reverse_dial[:3]
+
+    def _workspace(self, workspace):
+        """The caller's workspace, checked against the current engine, or the thread's default."""
+        if workspace is None:
+            return self._default_workspace()
+        if workspace.generation is not self._generation:
+            raise ValueError("The workspace predates a graph or engine change; allocate one with create_workspace().")
+        return workspace
+
+    def _default_workspace(self):
+        """
+        The calling thread's workspace, created on first use and rebuilt
+        only after a recalibration changed the engine or its frontier.
+        """
+        workspace = getattr(self._workspaces, "workspace", None)
+        if workspace is None or workspace.generation is not self._generation:
+            workspace = self._workspaces.workspace = self.create_workspace()
+        return workspace
+
+    def create_workspace(self):
+        """
+        Allocate a reusable QueryWorkspace sized for the current graph and
+        engine. Queries reject it with ValueError after set_graph, or after
+        an update_weights whose recalibration changed the engine or ring.
+        """
+        dtype = self._dial[2].dtype if self._dial is not None else np.float64
+        return QueryWorkspace(len(self.indptr) - 1, self._make_frontier(), dtype, self._generation)
+
+    def warmup(self, batch=False):
+        """
+        Compile the kernels this solver's engine and array dtypes use, or
+        load them from numba's on-disk cache, without solving anything large:
+        full queries are specialised on an empty frontier, and target and
+        bounded queries stop at the source. batch=True also prepares the
+        parallel shortest_paths kernels. Call once per process before
+        serving, so the first real query pays no compilation.
+        """
+        if self.indptr is None or len(self.indptr) == 1:
+            return
+        self.shortest_path(0, target=0)
+        if self.engine == "delta":
+            self._delta_stepping(0, 0)
+        else:
+            self.shortest_path(0, target=0, use_landmarks=False, use_hierarchy=False)
+            self.shortest_path(0, cutoff=0.0)
+            self.shortest_path(0, targets=[0], k=1)
+            workspace = self._default_workspace()
+            indices, indptr, weights = self._search_arrays()
+            _solve(
+                0, None, workspace.distances, workspace.settled, workspace.touched, workspace.touched_count,
+                indices, indptr, weights, self.pivots, workspace.frontier
+            )
+        if batch:
+            self._solve_rows(np.empty(0, dtype=np.int64))
+
+    def shortest_paths(self, sources, block_size=None):
+        """
+        Derive shortest distances from many source nodes in parallel.
+        Returns a (len(sources), n) distance matrix, or an iterator over
+        (row_offset, block) pairs of at most block_size rows if given.
+        """
+        sources = np.ascontiguousarray(self._internal(np.asarray(sources, dtype=np.int64), "Source"))
+        if block_size is not None:
+            return self._iter_shortest_paths(sources, block_size)
+        return self._solve_batch(sources)
+
+    def _iter_shortest_paths(self, sources, block_size):
+        for start in range(0, len(sources), block_size):
+            yield start, self._solve_batch(sources[start:start + block_size])
+
+    def _solve_batch(self, sources):
+        """Distance rows of internal sources, columns in original id order."""
+        out = self._solve_rows(sources)
+        return out if self._rank is None else out[:, self._rank]
+
+    def _solve_rows(self, sources):
+        num_nodes = len(self.indptr) - 1
+        out = np.empty((len(sources), num_nodes), dtype=np.float64)
+        # Resolved here: reading the thread count inside a kernel defeats its disk cache.
+        num_chunks = min(len(sources), get_num_threads())
+        if self.engine == "delta":
+            # Each query is already parallel internally.
+            for i, source in enumerate(sources):
+                out[i] = self._delta_stepping(source, None)
+            return out
+        if self._dial is not None:
+            indices, indptr, weights, gcd = self._dial
+            _solve_many_dial(sources, indices, indptr, weights, self.pivots, self._make_frontier(), out,
+                             num_chunks, weights.dtype.type(np.iinfo(weights.dtype).max), float(gcd))
+            return out
+        _solve_many(
+            sources, self.indices, self.indptr, self.data, self.pivots, self._make_frontier(), out, num_chunks
+        )
+        return out
+
+    def _delta_stepping(self, source, target):
+        if self._light_heavy is None:
+            self._light_heavy = split_light_heavy(self.indices, self.indptr, self.data, self.params["delta"])
+        indices, data, light_end, _ = self._light_heavy
+        return delta_stepping(
+            source, -1 if target is None else target, indices, self.indptr, data, light_end,
+            self.params["delta"], self.params["delta_buckets"]
+        )
+
+    def _make_frontier(self):
+        if self.is_sparse_fallback:
+            return IndexedHeap(len(self.indptr) - 1)
+        if self.engine == "radix":
+            return RadixFrontier()
+        if self.engine == "dial":
+            return DialFrontier(self.params["num_buckets"], int(self.params["bucket_width"]) // self._dial[3])
+        if self.frontier_layout == "pooled":
+            return PooledFrontierBucket(
+                num_buckets=self.params["num_buckets"],
+                bucket_width=self.params["bucket_width"]
+            )
+        return FrontierBucket(
             num_buckets=self.params["num_buckets"], 
             bucket_width=self.params["bucket_width"]
         )
-        frontier.insert(source, 0.0)
+
+@njit(nogil=True, cache=True)
+def _solve(source, target, distances, settled, touched, touched_count, indices, indptr, data, pivots, frontier,
+           stats=None, cutoff=None, target_mask=None, k=0, predecessors=None, parent_edges=None):
+    """
+    Settle nodes in frontier order. With a cutoff, or once k nodes flagged
+    in target_mask have settled, the search stops as soon as the frontier
+    floor passes the bound; every node within it has been settled by then.
+    predecessors/parent_edges, when given, record the shortest-path tree.
+    """
+    bound = np.inf
+    if cutoff is not None:
+        bound = cutoff
+    reach = 0.0
+    found = 0
+    while not frontier.is_empty():
+        if cutoff is not None or target_mask is not None:
+            if frontier.lower_bound(stats) > bound: break
+        u = frontier.pop_min(stats)
+        if u == -1: break
+        if stats is not None:
+            stats[POPS] += 1
+        if settled[u]:
+            if stats is not None:
+                stats[STALE_POPS] += 1
+            continue
+        settled[u] = True
+        touched[touched_count[0]] = u
+        touched_count[0] += 1
+        if target is not None and u == target: break
+        if target_mask is not None and target_mask[u]:
+            # Bucket engines settle a bucket in arbitrary order, so the k-th
+            # settled target only bounds the k nearest; drain up to its distance.
+            found += 1
+            reach = max(reach, distances[u])
+            if found == k:
+                bound = min(bound, reach)
         
-        res = self._solve(
-            source, target, distances, settled, self.indices, self.indptr, self.data, self.pivots, frontier
-        )
-        return res[target] if target is not None else res
-
-    def _dijkstra_fallback(self, source, target, distances, settled):
-        pq = [(0.0, source)]
-        while pq:
-            d, u = heapq.heappop(pq)
-            if settled[u]: continue
-            settled[u] = True
-            if target is not None and u == target: break
-            for i in range(self.indptr[u], self.indptr[u+1]):
-                v = self.indices[i]
-                weight = self.data[i]
-                if distances[u] + weight < distances[v]:
-                    distances[v] = distances[u] + weight
-                    heapq.heappush(pq, (distances[v], v))
-        return distances
-
-    @staticmethod
-    @njit
-    def _solve(source, target, distances, settled, indices, indptr, data, pivots, frontier):
-        while not frontier.is_empty():
-            u = frontier.pop_min()
-            if u == -1: break
-            if settled[u]: continue
-            settled[u] = True
-            if target is not None and u == target: break
-            
-            relax_pivots(u, distances, indices, indptr, data, pivots, frontier, lookahead_depth=2)
-        return distances
+        relax_pivots(u, distances, indices, indptr, data, pivots, frontier, 2, stats, predecessors, parent_edges)
+    return distances
+
+@njit(nogil=True, cache=True)
+def _settle_bidirectional(distances, settled, touched, touched_count, frontier, indices, indptr, data,
+                          other_distances, best, unreached):
+    """
+    Settle one node of one search direction; returns the improved meeting
+    distance. Nodes the other direction has not reached (unreached, the
+    integer dtype maximum under the dial engine) never form a meeting.
+    """
+    u = frontier.pop_min()
+    if u == -1 or settled[u]:
+        return best
+    settled[u] = True
+    touched[touched_count[0]] = u
+    touched_count[0] += 1
+    du = distances[u]
+    if other_distances[u] != unreached and du + other_distances[u] < best:
+        best = du + other_distances[u]
+    for i in range(indptr[u], indptr[u + 1]):
+        v = indices[i]
+        nd = du + data[i]
+        if nd < distances[v]:
+            distances[v] = nd
+            frontier.insert(v, nd)
+        if other_distances[v] != unreached:
+            meet = nd + other_distances[v]
+            if meet < best:
+                best = meet
+    return best
+
+@njit(nogil=True, cache=True)
+def _solve_bidirectional(dist_f, settled_f, touched_f, count_f, frontier_f, indices_f, indptr_f, data_f,
+                         dist_b, settled_b, touched_b, count_b, frontier_b, indices_b, indptr_b, data_b,
+                         unreached):
+    """
+    Alternate forward and backward settlements until the frontier floors
+    sum to at least the best meeting distance found so far.
+    """
+    best = np.inf
+    forward = True
+    while not frontier_f.is_empty() and not frontier_b.is_empty():
+        if frontier_f.lower_bound() + frontier_b.lower_bound() >= best:
+            break
+        if forward:
+            best = _settle_bidirectional(dist_f, settled_f, touched_f, count_f, frontier_f,
+                                         indices_f, indptr_f, data_f, dist_b, best, unreached)
+        else:
+            best = _settle_bidirectional(dist_b, settled_b, touched_b, count_b, frontier_b,
+                                         indices_b, indptr_b, data_b, dist_f, best, unreached)
+        forward = not forward
+    return best
+
+@njit(parallel=True, nogil=True, cache=True)
+def _solve_many(sources, indices, indptr, data, pivots, prototype, out, num_chunks):
+    """
+    Fan sources out over num_chunks worker chunks. Each chunk owns one
+    frontier (spawned from the prototype) and settled array, reused across
+    its sources.
+    """
+    for c in prange(num_chunks):
+        _solve_chunk(c, num_chunks, sources, indices, indptr, data, pivots, prototype, out)
+
+@njit(nogil=True, cache=True)
+def _solve_chunk(chunk, num_chunks, sources, indices, indptr, data, pivots, prototype, out):
+    num_nodes = out.shape[1]
+    frontier = prototype.spawn()
+    settled = np.zeros(num_nodes, dtype=np.bool_)
+    touched = np.empty(num_nodes, dtype=np.int64)
+    touched_count = np.zeros(1, dtype=np.int64)
+    for i in range(chunk, len(sources), num_chunks):
+        source = sources[i]
+        distances = out[i]
+        distances[:] = np.inf
+        distances[source] = 0.0
+        frontier.insert(source, 0.0)
+        _solve(source, None, distances, settled, touched, touched_count, indices, indptr, data, pivots, frontier)
+        # Rows are handed out as results; only the settlement marks are reused.
+        for k in range(touched_count[0]):
+            settled[touched[k]] = False
+        touched_count[0] = 0
+        frontier.reset()
+
+@njit(parallel=True, nogil=True, cache=True)
+def _solve_many_dial(sources, indices, indptr, weights, pivots, prototype, out, num_chunks, unreached, unit):
+    """_solve_many over integer distances; rows are written back as float64 multiples of unit."""
+    for c in prange(num_chunks):
+        _solve_chunk_dial(c, num_chunks, sources, indices, indptr, weights, pivots, prototype, out,
+                          unreached, unit)
+
+@njit(nogil=True, cache=True)
+def _solve_chunk_dial(chunk, num_chunks, sources, indices, indptr, weights, pivots, prototype, out,
+                      unreached, unit):
+    num_nodes = out.shape[1]
+    frontier = prototype.spawn()
+    distances = np.full(num_nodes, unreached, dtype=weights.dtype)
+    settled = np.zeros(num_nodes, dtype=np.bool_)
+    touched = np.empty(num_nodes, dtype=np.int64)
+    touched_count = np.zeros(1, dtype=np.int64)
+    for i in range(chunk, len(sources), num_chunks):
+        source = sources[i]
+        distances[source] = 0
+        frontier.insert(source, distances[source])
+        _solve(source, None, distances, settled, touched, touched_count, indices, indptr, weights, pivots, frontier)
+        row = out[i]
+        row[:] = np.inf
+        # A full solve drains the frontier, so every reached node was settled.
+        for k in range(touched_count[0]):
+            u = touched[k]
+            row[u] = distances[u] * unit
+            distances[u] = unreached
+            settled[u] = False
+        touched_count[0] = 0
+        frontier.reset()
+
+def _frontier_key(engine, params, dial):
+    """What a workspace's frontier and distance buffers depend on."""
+    dtype = None if dial is None else dial[2].dtype
+    return engine, params["bucket_width"], params["num_buckets"], dtype
+
+def _ring_covers(engine, params, data):
+    """
+    Whether a bucket or dial ring with these params settles data exactly:
+    nodes sharing a bucket settle in arbitrary order, so the width may not
+    exceed the lightest edge, and the ring must span the heaviest one.
+    """
+    width = params["bucket_width"]
+    if engine == "dial":
+        gcd = params.get("weight_gcd", 0)
+        if not gcd:
+            # Left to _configure_dial, which rejects it.
+            return True
+        width = (int(width) // gcd) * gcd
+    if len(data) == 0:
+        return True
+    return 0 < width <= np.min(data) and int(np.max(data) / width) + 2 <= params["num_buckets"]
+
+def _compact_arrays(indices, indptr, data, gcd):
+    """
+    (indices, indptr, weights, gcd) for the dial engine: int32 adjacency and
+    weights divided by gcd, as int32 when the longest simple path fits.
+    """
+    weights = data // gcd
+    longest = int(weights.max(initial=0)) * max(1, len(indptr) - 2)
+    dtype = np.int32 if longest < np.iinfo(np.int32).max else np.int64
+    return (
+        np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32),
+        weights.astype(dtype), gcd
+    )
 
 def shortest_path(G, source, target=None):
     """Protocol Entry Point: Standard interface for ComesSolver."""
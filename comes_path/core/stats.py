@@ -0,0 +1,44 @@
+"""
+Vecture Laboratories // Hot-Path Instrumentation
+
+Operational Directive:
+Count frontier and relaxation events inside the compiled solve loop.
+
+Kernels take a `stats` argument that is either None or an int64 array
+indexed by the constants below. Numba compiles the None case as its own
+specialization with every counter branch pruned, so uninstrumented queries
+run the exact code they ran before.
+"""
+
+import numpy as np
+
+POPS = 0
+STALE_POPS = 1
+RELAXATIONS = 2
+DECREASES = 3
+PIVOT_EXPANSIONS = 4
+EMPTY_BUCKETS_SCANNED = 5
+BITMASK_WORD_SKIPS = 6
+WRAPAROUNDS = 7
+RESIZE_EVENTS = 8
+RESIZE_BYTES_COPIED = 9
+
+STAT_NAMES = (
+    "pops",
+    "stale_pops",
+    "relaxations",
+    "decreases",
+    "pivot_expansions",
+    "empty_buckets_scanned",
+    "bitmask_word_skips",
+    "wraparounds",
+    "resize_events",
+    "resize_bytes_copied",
+)
+
+def new_stats():
+    """Zeroed counter array for one instrumented query."""
+    return np.zeros(len(STAT_NAMES), dtype=np.int64)
+
+def stats_to_dict(stats):
+    return {name: int(value) for name, value in zip(STAT_NAMES, stats)}
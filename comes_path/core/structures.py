@@ -3,40 +3,153 @@ Vecture Laboratories // Frontier Partitioning Structures
 
 Operational Directive:
 Maintain sub-logarithmic overhead via quantized distance mapping.
+
+Frontiers are numba StructRefs rather than jitclasses: kernels that take
+them as arguments can then be cached on disk (cache=True), so a fresh
+process loads compiled code instead of recompiling it. Each frontier is
+declared as a field spec, a constructor and a namespace class of methods;
+the methods are bound with overload_method and keep jitclass call syntax
+inside compiled code. From Python, the proxy classes construct frontiers
+and expose the common interface (insert, pop_min, is_empty, lower_bound,
+reset, spawn, peak_bytes).
 """
 
+import functools
+import inspect
 import numpy as np
-from numba import int64, float64, uint64, njit
-from numba.experimental import jitclass
+from numba import int32, int64, float64, uint64, njit, types
+from numba.core.extending import overload, overload_method
+from numba.experimental import structref
+from .stats import (
+    EMPTY_BUCKETS_SCANNED, BITMASK_WORD_SKIPS, WRAPAROUNDS, RESIZE_EVENTS, RESIZE_BYTES_COPIED,
+)
+
+class FrontierType(types.StructRef):
+    def preprocess_fields(self, fields):
+        return tuple((name, types.unliteral(typ)) for name, typ in fields)
+
+class Frontier(structref.StructRefProxy):
+    """Python-side handle on a compiled frontier."""
+    def insert(self, node_id, distance, stats=None):
+        _frontier_insert(self, node_id, distance, stats)
+
+    def pop_min(self, stats=None):
+        return _frontier_pop_min(self, stats)
+
+    def is_empty(self):
+        return _frontier_is_empty(self)
+
+    def lower_bound(self, stats=None):
+        return _frontier_lower_bound(self, stats)
+
+    def reset(self):
+        _frontier_reset(self)
+
+    def spawn(self):
+        return _frontier_spawn(self)
+
+    @property
+    def peak_bytes(self):
+        return _frontier_peak_bytes(self)
+
+def _implementation(func):
+    """Typing stub returning func, with func's signature (as overloads require)."""
+    def typer(*args, **kwargs):
+        return func
+    return functools.update_wrapper(typer, func)
+
+def constructor(struct_type, proxy):
+    """
+    Box struct_type instances as proxy and make func their constructor,
+    callable as proxy(...) from Python and from compiled code alike.
+    """
+    structref.define_boxing(struct_type, proxy)
+    def register(func):
+        overload(proxy)(_implementation(func))
+        compiled = njit(cache=True)(func)
+        proxy.__new__ = staticmethod(lambda cls, *args, **kwargs: compiled(*args, **kwargs))
+        return func
+    return register
+
+def methods(struct_type):
+    """Bind every function of a namespace class as a method of struct_type."""
+    def register(namespace):
+        for name, func in vars(namespace).items():
+            if inspect.isfunction(func):
+                overload_method(struct_type, name)(_implementation(func))
+        return namespace
+    return register
+
+@njit(cache=True)
+def _frontier_insert(frontier, node_id, distance, stats=None):
+    frontier.insert(node_id, distance, stats)
+
+@njit(cache=True)
+def _frontier_pop_min(frontier, stats=None):
+    return frontier.pop_min(stats)
+
+@njit(cache=True)
+def _frontier_is_empty(frontier):
+    return frontier.is_empty()
+
+@njit(cache=True)
+def _frontier_lower_bound(frontier, stats=None):
+    return frontier.lower_bound(stats)
+
+@njit(cache=True)
+def _frontier_reset(frontier):
+    frontier.reset()
+
+@njit(cache=True)
+def _frontier_spawn(frontier):
+    return frontier.spawn()
+
+@njit(cache=True)
+def _frontier_peak_bytes(frontier):
+    return frontier.peak_bytes
 
 spec = [
-    ('buckets', int64[:, :]),
-    ('bucket_counts', int64[:]),
+    ('buckets', int64[:, ::1]),
+    ('bucket_counts', int64[::1]),
     ('bucket_width', float64),
     ('num_buckets', int64),
     ('current_index', int64),
     ('count_in_frontier', int64),
-    ('bitmask', uint64[:]),
+    ('bitmask', uint64[::1]),
+    ('peak_bytes', int64),
 ]
 
-@jitclass(spec)
-class FrontierBucket:
-    def __init__(self, num_buckets, bucket_width, initial_capacity=4096):
-        self.num_buckets = ((num_buckets + 63) // 64) * 64
-        self.bucket_width = bucket_width
-        self.buckets = np.full((self.num_buckets, initial_capacity), -1, dtype=np.int64)
-        self.bucket_counts = np.zeros(self.num_buckets, dtype=np.int64)
-        self.current_index = 0
-        self.count_in_frontier = 0
-        self.bitmask = np.zeros(self.num_buckets // 64, dtype=np.uint64)
+@structref.register
+class FrontierBucketType(FrontierType):
+    pass
+
+frontier_bucket_type = FrontierBucketType(spec)
 
+class FrontierBucket(Frontier):
+    """Circular bucket frontier over one dense (buckets, capacity) matrix."""
+
+@constructor(FrontierBucketType, FrontierBucket)
+def _new_frontier_bucket(num_buckets, bucket_width, initial_capacity=4096):
+    self = structref.new(frontier_bucket_type)
+    self.num_buckets = ((num_buckets + 63) // 64) * 64
+    self.bucket_width = bucket_width
+    self.buckets = np.full((self.num_buckets, initial_capacity), -1, dtype=np.int64)
+    self.bucket_counts = np.zeros(self.num_buckets, dtype=np.int64)
+    self.current_index = 0
+    self.count_in_frontier = 0
+    self.bitmask = np.zeros(self.num_buckets // 64, dtype=np.uint64)
+    self.peak_bytes = self.buckets.nbytes + self.bucket_counts.nbytes + self.bitmask.nbytes
+    return self
+
+@methods(FrontierBucketType)
+class _FrontierBucketMethods:
     def _set_bit(self, idx):
         self.bitmask[idx >> 6] |= (uint64(1) << (uint64(idx) & uint64(63)))
 
     def _clear_bit(self, idx):
         self.bitmask[idx >> 6] &= ~(uint64(1) << (uint64(idx) & uint64(63)))
 
-    def insert(self, node_id, distance):
+    def insert(self, node_id, distance, stats=None):
         idx = int(distance / self.bucket_width) % self.num_buckets
         count = self.bucket_counts[idx]
         
@@ -48,16 +161,19 @@ class FrontierBucket:
             for i in range(self.num_buckets):
                 if self.bucket_counts[i] > 0:
                     new_buckets[i, :self.bucket_counts[i]] = self.buckets[i, :self.bucket_counts[i]]
+            if stats is not None:
+                stats[RESIZE_EVENTS] += 1
+                stats[RESIZE_BYTES_COPIED] += self.count_in_frontier * 8
             self.buckets = new_buckets
+            self.peak_bytes = self.buckets.nbytes + self.bucket_counts.nbytes + self.bitmask.nbytes
             
         self.buckets[idx, count] = node_id
         self.bucket_counts[idx] = count + 1
         self.count_in_frontier += 1
         self._set_bit(idx)
 
-    def pop_min(self):
-        if self.count_in_frontier == 0:
-            return -1
+    def _seek(self, stats=None):
+        start = self.current_index
         while True:
             idx = self.current_index % self.num_buckets
             if self.bucket_counts[idx] > 0:
@@ -65,8 +181,20 @@ class FrontierBucket:
             mask_idx = idx >> 6
             if self.bitmask[mask_idx] == 0:
                 self.current_index = (self.current_index + 64) & ~63
+                if stats is not None:
+                    stats[BITMASK_WORD_SKIPS] += 1
             else:
                 self.current_index += 1
+                if stats is not None:
+                    stats[EMPTY_BUCKETS_SCANNED] += 1
+        if stats is not None:
+            stats[WRAPAROUNDS] += self.current_index // self.num_buckets - start // self.num_buckets
+        return idx
+
+    def pop_min(self, stats=None):
+        if self.count_in_frontier == 0:
+            return -1
+        self._seek(stats)
         actual_idx = self.current_index % self.num_buckets
         self.bucket_counts[actual_idx] -= 1
         node_id = self.buckets[actual_idx, self.bucket_counts[actual_idx]]
@@ -76,4 +204,560 @@ class FrontierBucket:
         return node_id
 
     def is_empty(self):
-        return self.count_in_frontier == 0
\ No newline at end of file
+        return self.count_in_frontier == 0
+
+    def lower_bound(self, stats=None):
+        """Distance floor of the lowest non-empty bucket."""
+        if self.count_in_frontier == 0:
+            return np.inf
+        self._seek(stats)
+        return self.current_index * self.bucket_width
+
+    def reset(self):
+        """Rewind the scan cursor. Expects a drained frontier."""
+        self.current_index = 0
+
+    def spawn(self):
+        return FrontierBucket(self.num_buckets, self.bucket_width, 4096)
+
+pooled_spec = [
+    ('heads', int64[::1]),
+    ('slots', int64[:, ::1]),
+    ('free_slot', int64),
+    ('pool_top', int64),
+    ('bucket_width', float64),
+    ('num_buckets', int64),
+    ('current_index', int64),
+    ('count_in_frontier', int64),
+    ('bitmask', uint64[::1]),
+    ('peak_bytes', int64),
+]
+
+@structref.register
+class PooledFrontierBucketType(FrontierType):
+    pass
+
+pooled_frontier_bucket_type = PooledFrontierBucketType(pooled_spec)
+
+class PooledFrontierBucket(Frontier):
+    """
+    Circular bucket frontier over a pooled, array-backed linked list.
+
+    Each bucket is a singly linked stack threaded through one shared arena
+    of (node, next) slots; popped slots return to a free list. Memory is O(buckets + peak
+    live entries) and only the arena grows, by doubling, on exhaustion.
+    """
+
+@constructor(PooledFrontierBucketType, PooledFrontierBucket)
+def _new_pooled_frontier_bucket(num_buckets, bucket_width, initial_capacity=4096):
+    self = structref.new(pooled_frontier_bucket_type)
+    self.num_buckets = ((num_buckets + 63) // 64) * 64
+    self.bucket_width = bucket_width
+    self.heads = np.full(self.num_buckets, -1, dtype=np.int64)
+    self.slots = np.empty((initial_capacity, 2), dtype=np.int64)
+    self.free_slot = -1
+    self.pool_top = 0
+    self.current_index = 0
+    self.count_in_frontier = 0
+    self.bitmask = np.zeros(self.num_buckets // 64, dtype=np.uint64)
+    self.peak_bytes = self._footprint()
+    return self
+
+@methods(PooledFrontierBucketType)
+class _PooledFrontierBucketMethods:
+    def _footprint(self):
+        return self.heads.nbytes + self.slots.nbytes + self.bitmask.nbytes
+
+    def _set_bit(self, idx):
+        self.bitmask[idx >> 6] |= (uint64(1) << (uint64(idx) & uint64(63)))
+
+    def _clear_bit(self, idx):
+        self.bitmask[idx >> 6] &= ~(uint64(1) << (uint64(idx) & uint64(63)))
+
+    def _grow(self, stats=None):
+        slots = np.empty((self.slots.shape[0] * 2, 2), dtype=np.int64)
+        slots[:self.pool_top] = self.slots[:self.pool_top]
+        if stats is not None:
+            stats[RESIZE_EVENTS] += 1
+            stats[RESIZE_BYTES_COPIED] += self.pool_top * 16
+        self.slots = slots
+        self.peak_bytes = max(self.peak_bytes, self._footprint())
+
+    def insert(self, node_id, distance, stats=None):
+        idx = int(distance / self.bucket_width) % self.num_buckets
+        slot = self.free_slot
+        if slot != -1:
+            self.free_slot = self.slots[slot, 1]
+        else:
+            if self.pool_top == self.slots.shape[0]:
+                self._grow(stats)
+            slot = self.pool_top
+            self.pool_top += 1
+        self.slots[slot, 0] = node_id
+        self.slots[slot, 1] = self.heads[idx]
+        self.heads[idx] = slot
+        self.count_in_frontier += 1
+        self._set_bit(idx)
+
+    def _seek(self, stats=None):
+        start = self.current_index
+        while True:
+            idx = self.current_index % self.num_buckets
+            if self.heads[idx] != -1:
+                break
+            mask_idx = idx >> 6
+            if self.bitmask[mask_idx] == 0:
+                self.current_index = (self.current_index + 64) & ~63
+                if stats is not None:
+                    stats[BITMASK_WORD_SKIPS] += 1
+            else:
+                self.current_index += 1
+                if stats is not None:
+                    stats[EMPTY_BUCKETS_SCANNED] += 1
+        if stats is not None:
+            stats[WRAPAROUNDS] += self.current_index // self.num_buckets - start // self.num_buckets
+        return idx
+
+    def _unlink(self, idx):
+        slot = self.heads[idx]
+        self.heads[idx] = self.slots[slot, 1]
+        node_id = self.slots[slot, 0]
+        self.slots[slot, 1] = self.free_slot
+        self.free_slot = slot
+        self.count_in_frontier -= 1
+        return node_id
+
+    def pop_min(self, stats=None):
+        if self.count_in_frontier == 0:
+            return -1
+        idx = self._seek(stats)
+        node_id = self._unlink(idx)
+        if self.heads[idx] == -1:
+            self._clear_bit(idx)
+        return node_id
+
+    def drain_current(self, out):
+        """
+        Pop every entry of the lowest non-empty bucket into out.
+        Returns the entry count; current_index then names the bucket.
+        out must hold at least count_in_frontier entries.
+        """
+        if self.count_in_frontier == 0:
+            return 0
+        idx = self._seek()
+        count = 0
+        while self.heads[idx] != -1:
+            out[count] = self._unlink(idx)
+            count += 1
+        self._clear_bit(idx)
+        return count
+
+    def current_is_empty(self):
+        return self.heads[self.current_index % self.num_buckets] == -1
+
+    def is_empty(self):
+        return self.count_in_frontier == 0
+
+    def lower_bound(self, stats=None):
+        """Distance floor of the lowest non-empty bucket."""
+        if self.count_in_frontier == 0:
+            return np.inf
+        self._seek(stats)
+        return self.current_index * self.bucket_width
+
+    def reset(self):
+        """Rewind the scan cursor. Expects a drained frontier."""
+        self.current_index = 0
+
+    def spawn(self):
+        return PooledFrontierBucket(self.num_buckets, self.bucket_width, 4096)
+
+dial_spec = [
+    ('heads', int32[::1]),
+    ('slots', int32[:, ::1]),
+    ('free_slot', int32),
+    ('pool_top', int64),
+    ('bucket_width', int64),
+    ('num_buckets', int64),
+    ('current_index', int64),
+    ('count_in_frontier', int64),
+    ('bitmask', uint64[::1]),
+    ('peak_bytes', int64),
+]
+
+@structref.register
+class DialFrontierType(FrontierType):
+    pass
+
+dial_frontier_type = DialFrontierType(dial_spec)
+
+class DialFrontier(Frontier):
+    """
+    Dial's algorithm over integer distances: the pooled circular layout of
+    PooledFrontierBucket with an integer bucket width and int32 node/slot
+    links. Bucket indices come from exact integer division, so no float
+    rounding can misplace an entry, and each slot is half the size.
+    """
+
+@constructor(DialFrontierType, DialFrontier)
+def _new_dial_frontier(num_buckets, bucket_width, initial_capacity=4096):
+    self = structref.new(dial_frontier_type)
+    self.num_buckets = ((num_buckets + 63) // 64) * 64
+    self.bucket_width = bucket_width
+    self.heads = np.full(self.num_buckets, -1, dtype=np.int32)
+    self.slots = np.empty((initial_capacity, 2), dtype=np.int32)
+    self.free_slot = -1
+    self.pool_top = 0
+    self.current_index = 0
+    self.count_in_frontier = 0
+    self.bitmask = np.zeros(self.num_buckets // 64, dtype=np.uint64)
+    self.peak_bytes = self._footprint()
+    return self
+
+@methods(DialFrontierType)
+class _DialFrontierMethods:
+    def _footprint(self):
+        return self.heads.nbytes + self.slots.nbytes + self.bitmask.nbytes
+
+    def _set_bit(self, idx):
+        self.bitmask[idx >> 6] |= (uint64(1) << (uint64(idx) & uint64(63)))
+
+    def _clear_bit(self, idx):
+        self.bitmask[idx >> 6] &= ~(uint64(1) << (uint64(idx) & uint64(63)))
+
+    def _grow(self, stats=None):
+        slots = np.empty((self.slots.shape[0] * 2, 2), dtype=np.int32)
+        slots[:self.pool_top] = self.slots[:self.pool_top]
+        if stats is not None:
+            stats[RESIZE_EVENTS] += 1
+            stats[RESIZE_BYTES_COPIED] += self.pool_top * 8
+        self.slots = slots
+        self.peak_bytes = max(self.peak_bytes, self._footprint())
+
+    def insert(self, node_id, distance, stats=None):
+        idx = (int64(distance) // self.bucket_width) % self.num_buckets
+        slot = self.free_slot
+        if slot != -1:
+            self.free_slot = self.slots[slot, 1]
+        else:
+            if self.pool_top == self.slots.shape[0]:
+                self._grow(stats)
+            slot = self.pool_top
+            self.pool_top += 1
+        self.slots[slot, 0] = node_id
+        self.slots[slot, 1] = self.heads[idx]
+        self.heads[idx] = slot
+        self.count_in_frontier += 1
+        self._set_bit(idx)
+
+    def _seek(self, stats=None):
+        start = self.current_index
+        while True:
+            idx = self.current_index % self.num_buckets
+            if self.heads[idx] != -1:
+                break
+            mask_idx = idx >> 6
+            if self.bitmask[mask_idx] == 0:
+                self.current_index = (self.current_index + 64) & ~63
+                if stats is not None:
+                    stats[BITMASK_WORD_SKIPS] += 1
+            else:
+                self.current_index += 1
+                if stats is not None:
+                    stats[EMPTY_BUCKETS_SCANNED] += 1
+        if stats is not None:
+            stats[WRAPAROUNDS] += self.current_index // self.num_buckets - start // self.num_buckets
+        return idx
+
+    def pop_min(self, stats=None):
+        if self.count_in_frontier == 0:
+            return -1
+        idx = self._seek(stats)
+        slot = self.heads[idx]
+        self.heads[idx] = self.slots[slot, 1]
+        node_id = self.slots[slot, 0]
+        self.slots[slot, 1] = self.free_slot
+        self.free_slot = slot
+        self.count_in_frontier -= 1
+        if self.heads[idx] == -1:
+            self._clear_bit(idx)
+        return node_id
+
+    def is_empty(self):
+        return self.count_in_frontier == 0
+
+    def lower_bound(self, stats=None):
+        """Distance floor of the lowest non-empty bucket, in integer units."""
+        if self.count_in_frontier == 0:
+            return np.inf
+        self._seek(stats)
+        return self.current_index * self.bucket_width
+
+    def reset(self):
+        """Rewind the scan cursor. Expects a drained frontier."""
+        self.current_index = 0
+
+    def spawn(self):
+        return DialFrontier(self.num_buckets, self.bucket_width, 4096)
+
+radix_spec = [
+    ('heads', int64[::1]),
+    ('slots', int64[:, ::1]),
+    ('slot_keys', uint64[::1]),
+    ('free_slot', int64),
+    ('pool_top', int64),
+    ('last_key', uint64),
+    ('count_in_frontier', int64),
+    ('key_scratch', float64[::1]),
+    ('key_bits', uint64[::1]),
+    ('peak_bytes', int64),
+]
+
+@structref.register
+class RadixFrontierType(FrontierType):
+    pass
+
+radix_frontier_type = RadixFrontierType(radix_spec)
+
+class RadixFrontier(Frontier):
+    """
+    Monotone radix heap over the IEEE-754 bit patterns of distances.
+
+    Non-negative doubles order like their unsigned bit patterns, so entries
+    are filed by the highest bit in which they differ from the last popped
+    key. Each entry descends at most 64 buckets over its lifetime, making
+    insert O(1) and pop_min amortized O(64) regardless of max_w / min_w.
+    Entries share a pooled (node, next) slot arena as in PooledFrontierBucket.
+    """
+
+@constructor(RadixFrontierType, RadixFrontier)
+def _new_radix_frontier(initial_capacity=4096):
+    self = structref.new(radix_frontier_type)
+    self.heads = np.full(65, -1, dtype=np.int64)
+    self.slots = np.empty((initial_capacity, 2), dtype=np.int64)
+    self.slot_keys = np.empty(initial_capacity, dtype=np.uint64)
+    self.free_slot = -1
+    self.pool_top = 0
+    self.last_key = uint64(0)
+    self.count_in_frontier = 0
+    self.key_scratch = np.zeros(1, dtype=np.float64)
+    self.key_bits = self.key_scratch.view(np.uint64)
+    self.peak_bytes = self._footprint()
+    return self
+
+@methods(RadixFrontierType)
+class _RadixFrontierMethods:
+    def _footprint(self):
+        return self.heads.nbytes + self.slots.nbytes + self.slot_keys.nbytes
+
+    def _grow(self, stats=None):
+        new_cap = self.slots.shape[0] * 2
+        slots = np.empty((new_cap, 2), dtype=np.int64)
+        slot_keys = np.empty(new_cap, dtype=np.uint64)
+        slots[:self.pool_top] = self.slots[:self.pool_top]
+        slot_keys[:self.pool_top] = self.slot_keys[:self.pool_top]
+        if stats is not None:
+            stats[RESIZE_EVENTS] += 1
+            stats[RESIZE_BYTES_COPIED] += self.pool_top * 24
+        self.slots = slots
+        self.slot_keys = slot_keys
+        self.peak_bytes = max(self.peak_bytes, self._footprint())
+
+    def _bucket_of(self, key):
+        diff = key ^ self.last_key
+        if diff == 0:
+            return 0
+        idx = 1
+        for shift in (32, 16, 8, 4, 2, 1):
+            if diff >> uint64(shift):
+                diff >>= uint64(shift)
+                idx += shift
+        return idx
+
+    def _link(self, slot, key):
+        idx = self._bucket_of(key)
+        self.slots[slot, 1] = self.heads[idx]
+        self.heads[idx] = slot
+
+    def insert(self, node_id, distance, stats=None):
+        self.key_scratch[0] = distance
+        key = self.key_bits[0]
+        if key < self.last_key:
+            # Rounding below the last popped key; file it with the minimum.
+            key = self.last_key
+        slot = self.free_slot
+        if slot != -1:
+            self.free_slot = self.slots[slot, 1]
+        else:
+            if self.pool_top == self.slots.shape[0]:
+                self._grow(stats)
+            slot = self.pool_top
+            self.pool_top += 1
+        self.slots[slot, 0] = node_id
+        self.slot_keys[slot] = key
+        self._link(slot, key)
+        self.count_in_frontier += 1
+
+    def _refill(self, stats=None):
+        """Redistribute the lowest non-empty bucket around its minimum key."""
+        if self.heads[0] != -1:
+            return
+        idx = 1
+        while self.heads[idx] == -1:
+            idx += 1
+        if stats is not None:
+            stats[EMPTY_BUCKETS_SCANNED] += idx - 1
+        slot = self.heads[idx]
+        min_key = self.slot_keys[slot]
+        while slot != -1:
+            if self.slot_keys[slot] < min_key:
+                min_key = self.slot_keys[slot]
+            slot = self.slots[slot, 1]
+        self.last_key = min_key
+        slot = self.heads[idx]
+        self.heads[idx] = -1
+        while slot != -1:
+            nxt = self.slots[slot, 1]
+            self._link(slot, self.slot_keys[slot])
+            slot = nxt
+
+    def pop_min(self, stats=None):
+        if self.count_in_frontier == 0:
+            return -1
+        self._refill(stats)
+        slot = self.heads[0]
+        self.heads[0] = self.slots[slot, 1]
+        node_id = self.slots[slot, 0]
+        self.slots[slot, 1] = self.free_slot
+        self.free_slot = slot
+        self.count_in_frontier -= 1
+        return node_id
+
+    def is_empty(self):
+        return self.count_in_frontier == 0
+
+    def lower_bound(self, stats=None):
+        """Exact minimum key, made current by redistribution."""
+        if self.count_in_frontier == 0:
+            return np.inf
+        self._refill(stats)
+        self.key_bits[0] = self.last_key
+        return self.key_scratch[0]
+
+    def reset(self):
+        """Rewind the monotone key floor. Expects a drained frontier."""
+        self.last_key = uint64(0)
+
+    def spawn(self):
+        return RadixFrontier(4096)
+
+heap_spec = [
+    ('heap_nodes', int64[::1]),
+    ('heap_keys', float64[::1]),
+    ('positions', int64[::1]),
+    ('size', int64),
+    ('peak_bytes', int64),
+]
+
+@structref.register
+class IndexedHeapType(FrontierType):
+    pass
+
+indexed_heap_type = IndexedHeapType(heap_spec)
+
+class IndexedHeap(Frontier):
+    """
+    Binary heap with decrease-key over a position index.
+    Every node occupies at most one slot, bounding the frontier at O(V).
+    Preallocated, so it has no bucket or resize events to count.
+    """
+
+@constructor(IndexedHeapType, IndexedHeap)
+def _new_indexed_heap(num_nodes):
+    self = structref.new(indexed_heap_type)
+    self.heap_nodes = np.empty(num_nodes, dtype=np.int64)
+    self.heap_keys = np.empty(num_nodes, dtype=np.float64)
+    self.positions = np.full(num_nodes, -1, dtype=np.int64)
+    self.size = 0
+    self.peak_bytes = self.heap_nodes.nbytes + self.heap_keys.nbytes + self.positions.nbytes
+    return self
+
+@methods(IndexedHeapType)
+class _IndexedHeapMethods:
+    def _place(self, slot, node_id, distance):
+        self.heap_nodes[slot] = node_id
+        self.heap_keys[slot] = distance
+        self.positions[node_id] = slot
+
+    def _sift_up(self, slot):
+        node_id = self.heap_nodes[slot]
+        distance = self.heap_keys[slot]
+        while slot > 0:
+            parent = (slot - 1) >> 1
+            if self.heap_keys[parent] <= distance:
+                break
+            self._place(slot, self.heap_nodes[parent], self.heap_keys[parent])
+            slot = parent
+        self._place(slot, node_id, distance)
+
+    def _sift_down(self, slot):
+        node_id = self.heap_nodes[slot]
+        distance = self.heap_keys[slot]
+        while True:
+            child = 2 * slot + 1
+            if child >= self.size:
+                break
+            if child + 1 < self.size and self.heap_keys[child + 1] < self.heap_keys[child]:
+                child += 1
+            if self.heap_keys[child] >= distance:
+                break
+            self._place(slot, self.heap_nodes[child], self.heap_keys[child])
+            slot = child
+        self._place(slot, node_id, distance)
+
+    def insert(self, node_id, distance, stats=None):
+        slot = self.positions[node_id]
+        if slot == -1:
+            slot = self.size
+            self.size += 1
+            self._place(slot, node_id, distance)
+        elif distance < self.heap_keys[slot]:
+            self.heap_keys[slot] = distance
+        else:
+            return
+        self._sift_up(slot)
+
+    def update(self, node_id, distance):
+        """Set a key in either direction, unlike insert which only decreases."""
+        slot = self.positions[node_id]
+        if slot == -1 or distance <= self.heap_keys[slot]:
+            self.insert(node_id, distance)
+            return
+        self.heap_keys[slot] = distance
+        self._sift_down(slot)
+
+    def pop_min(self, stats=None):
+        if self.size == 0:
+            return -1
+        node_id = self.heap_nodes[0]
+        self.positions[node_id] = -1
+        self.size -= 1
+        if self.size > 0:
+            self._place(0, self.heap_nodes[self.size], self.heap_keys[self.size])
+            self._sift_down(0)
+        return node_id
+
+    def is_empty(self):
+        return self.size == 0
+
+    def lower_bound(self, stats=None):
+        if self.size == 0:
+            return np.inf
+        return self.heap_keys[0]
+
+    def reset(self):
+        """Positions are cleared by pop_min; nothing to rewind."""
+        pass
+
+    def spawn(self):
+        return IndexedHeap(self.positions.shape[0])
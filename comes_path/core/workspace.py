@@ -0,0 +1,76 @@
+"""
+Vecture Laboratories // Query Workspaces
+
+Operational Directive:
+Retain per-query buffers between derivations and restore them sparsely.
+"""
+
+import numpy as np
+from numba import njit
+
+class QueryWorkspace:
+    """
+    Reusable distance, settlement and frontier buffers for one query stream.
+
+    Every settled node is recorded in `touched`; every reached but unsettled
+    node is still held by the frontier. Resetting therefore visits only the
+    explored region, never the full O(n + buckets) state.
+
+    settled_count reports how many nodes the previous query settled. A
+    bidirectional query keeps its backward half in `reverse`; landmark (A*)
+    queries run in the exact-priority `goal_directed` companion and
+    contraction-hierarchy queries in the `hierarchy` companion. k-nearest
+    queries flag their target set in `target_mask` and clear it afterwards.
+    Path queries record their shortest-path tree in `predecessors` and
+    `parent_edges` (see tree_buffers); entries are only meaningful for
+    nodes the latest such query reached, so they are never reset.
+
+    dtype selects the distance type; integer workspaces (the dial engine)
+    mark unreached nodes with the dtype's maximum instead of inf.
+    generation tags the solver configuration the buffers were built for;
+    hierarchy_token the ContractionHierarchy behind the `hierarchy`
+    companion.
+    """
+    def __init__(self, num_nodes, frontier, dtype=np.float64, generation=None):
+        dtype = np.dtype(dtype)
+        self.unreached = np.iinfo(dtype).max if dtype.kind in "iu" else np.inf
+        self.distances = np.full(num_nodes, self.unreached, dtype=dtype)
+        self.settled = np.zeros(num_nodes, dtype=np.bool_)
+        self.touched = np.empty(num_nodes, dtype=np.int64)
+        self.touched_count = np.zeros(1, dtype=np.int64)
+        self.target_mask = np.zeros(num_nodes, dtype=np.bool_)
+        self.frontier = frontier
+        self.settled_count = 0
+        self.reverse = None
+        self.goal_directed = None
+        self.hierarchy = None
+        self.hierarchy_token = None
+        self.generation = generation
+        self.predecessors = None
+        self.parent_edges = None
+
+    def tree_buffers(self):
+        """(predecessors, parent_edges), allocated on first use."""
+        if self.predecessors is None:
+            self.predecessors = np.full(len(self.distances), -1, dtype=np.int64)
+            self.parent_edges = np.full(len(self.distances), -1, dtype=np.int64)
+        return self.predecessors, self.parent_edges
+
+    def reset(self):
+        """Restore the pristine state touched by the previous query."""
+        self.settled_count = int(self.touched_count[0])
+        reset_workspace(self.distances, self.settled, self.touched, self.touched_count, self.frontier,
+                        self.distances.dtype.type(self.unreached))
+
+@njit(nogil=True, cache=True)
+def reset_workspace(distances, settled, touched, touched_count, frontier, unreached):
+    for i in range(touched_count[0]):
+        u = touched[i]
+        distances[u] = unreached
+        settled[u] = False
+    touched_count[0] = 0
+    while not frontier.is_empty():
+        v = frontier.pop_min()
+        if v == -1: break
+        distances[v] = unreached
+    frontier.reset()
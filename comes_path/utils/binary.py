@@ -0,0 +1,163 @@
+"""
+Vecture Laboratories // Native Topology Archive (.comes)
+
+Operational Directive:
+Persist CSR topology as raw arrays and map it back without parsing or copying.
+
+Layout: an 8-byte magic, a little-endian uint32 version, a uint32 header
+length, then a JSON header naming every section's dtype, shape and byte
+offset. Sections follow as raw arrays, each aligned to ALIGNMENT bytes.
+"""
+
+import os
+import json
+import struct
+import numpy as np
+from ..core.partitioning import partition_graph
+from ..core.relaxation import identify_pivots
+from ..core.autotune import autotune_engine
+
+MAGIC = b"COMESCSR"
+VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+class GraphFile:
+    """
+    A .comes archive opened memory-mapped.
+
+    indptr/indices/data are the mapped CSR arrays, so every process opening
+    the same file shares one page-cache copy, and the GraphFile itself can
+    be passed to ComesSolver.set_graph. adjacency wraps them in a scipy
+    csr_matrix on first access; scipy is not imported before that. node_ids,
+    coordinates, params and pivots are None when the archive lacks them.
+    """
+    def __init__(self, indptr, indices, data, node_ids=None, coordinates=None, params=None, pivots=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.node_ids = node_ids
+        self.coordinates = coordinates
+        self.params = params
+        self.pivots = pivots
+        self._adjacency = None
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def shape(self):
+        return (self.num_nodes, self.num_nodes)
+
+    @property
+    def adjacency(self):
+        if self._adjacency is None:
+            from scipy.sparse import csr_matrix
+            self._adjacency = csr_matrix((self.data, self.indices, self.indptr), shape=self.shape, copy=False)
+        return self._adjacency
+
+def _index_dtype(adj):
+    """The index dtype scipy would pick, so wrapping the mapped arrays never casts."""
+    if max(adj.shape[0], adj.nnz) <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+def save_graph(path, adj, node_ids=None, coordinates=None, precompute=True, autotune=False):
+    """
+    Write adj (and optional node-id map / coordinates) as a .comes archive.
+    With precompute, partition_graph params and the pivot mask are stored
+    too, so loading skips both passes over the edge arrays. autotune stores
+    the engine, ring and pivot threshold measured fastest on adj instead;
+    set_graph adopts tuned params without tuning again.
+    """
+    from scipy.sparse import csr_matrix
+    adj = csr_matrix(adj)
+    index_dtype = _index_dtype(adj)
+    sections = {
+        "indptr": np.ascontiguousarray(adj.indptr, dtype=index_dtype),
+        "indices": np.ascontiguousarray(adj.indices, dtype=index_dtype),
+        "data": np.ascontiguousarray(adj.data, dtype=np.float64),
+    }
+    if node_ids is not None:
+        sections["node_ids"] = np.ascontiguousarray(node_ids)
+    if coordinates is not None:
+        sections["coordinates"] = np.ascontiguousarray(coordinates, dtype=np.float64)
+    params = None
+    if autotune and adj.nnz > 0:
+        params, _ = autotune_engine(sections["indptr"], sections["indices"], sections["data"])
+        sections["pivots"] = identify_pivots(sections["indptr"], params["pivot_threshold"])
+    elif precompute and adj.nnz > 0:
+        params = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in partition_graph(adj).items()}
+        sections["pivots"] = identify_pivots(sections["indptr"])
+
+    layout = {}
+    offset = 0
+    for name, array in sections.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({"num_nodes": adj.shape[0], "params": params, "sections": layout}).encode()
+    data_start = -(-(_PREAMBLE.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, array in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+def load_graph(path, mmap_mode="r"):
+    """
+    Open a .comes archive. Arrays are np.memmap views (mmap_mode=None reads
+    them into memory instead); nothing is parsed or copied.
+    """
+    with open(path, "rb") as f:
+        magic, version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a .comes graph archive: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported .comes archive version: {version}")
+        header = json.loads(f.read(header_len))
+    data_start = -(-(_PREAMBLE.size + header_len) // ALIGNMENT) * ALIGNMENT
+
+    arrays = {}
+    for name, spec in header["sections"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        offset = data_start + spec["offset"]
+        if mmap_mode is None:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+        elif np.prod(shape) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape)
+
+    return GraphFile(
+        arrays["indptr"], arrays["indices"], arrays["data"],
+        node_ids=arrays.get("node_ids"),
+        coordinates=arrays.get("coordinates"),
+        params=header["params"],
+        pivots=arrays.get("pivots"),
+    )
+
+def convert_graph(source_path, target_path, precompute=True, autotune=False):
+    """
+    Convert an .adj/.txt edge list, .graphml or .osm file into a .comes
+    archive, keeping GraphML/OSM node ids and OSM (lat, lon) coordinates.
+    """
+    from .loaders import load_adj, _parse_graphml, _parse_osm
+    ext = os.path.splitext(source_path)[1].lower()
+    node_ids = coordinates = None
+    if ext in (".graphml", ".xml"):
+        adj, node_ids = _parse_graphml(source_path)
+    elif ext == ".osm":
+        adj, node_ids, coordinates = _parse_osm(source_path)
+    elif ext in (".adj", ".txt", ".edges"):
+        adj = load_adj(source_path)
+    else:
+        raise ValueError(f"Unknown graph format: {ext}")
+    save_graph(target_path, adj, node_ids=node_ids, coordinates=coordinates, precompute=precompute,
+               autotune=autotune)
@@ -5,68 +5,511 @@ Operational Directive:
 Translate raw topological data (OSM, GraphML, ADJ) into CSR format.
 """
 
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 import numpy as np
+from numba import njit
 from scipy.sparse import csr_matrix
 import xml.etree.ElementTree as ET
 
-def load_adj(file_path):
-    """Ingest adjacency lists into CSR format."""
-    data = np.loadtxt(file_path)
-    u = data[:, 0].astype(np.int64)
-    v = data[:, 1].astype(np.int64)
-    weights = data[:, 2]
-    n = max(u.max(), v.max()) + 1
-    return csr_matrix((weights, (u, v)), shape=(n, n))
-
-def load_graphml(file_path):
-    """Parse GraphML XML structures into CSR format."""
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-    ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
+# Bytes read per block by the chunked edge-list parser.
+BLOCK_SIZE = 1 << 20
+_POW10 = np.array([10.0 ** k for k in range(23)])
+_NEWLINE = 10
+
+@njit(cache=True)
+def _is_separator(c):
+    # space, tab, comma, carriage return
+    return c == 32 or c == 9 or c == 44 or c == 13
+
+@njit(cache=True)
+def _parse_number(buf, i):
+    """Decimal number at buf[i:]; returns (value, next index, ok)."""
+    n = len(buf)
+    negative = False
+    if i < n and (buf[i] == 45 or buf[i] == 43):
+        negative = buf[i] == 45
+        i += 1
+    mantissa = 0
+    digits = 0
+    exponent = 0
+    seen = False
+    while i < n and 48 <= buf[i] <= 57:
+        if digits < 18:
+            mantissa = mantissa * 10 + (buf[i] - 48)
+            if mantissa > 0:
+                digits += 1
+        else:
+            exponent += 1
+        seen = True
+        i += 1
+    if i < n and buf[i] == 46:
+        i += 1
+        while i < n and 48 <= buf[i] <= 57:
+            if digits < 18:
+                mantissa = mantissa * 10 + (buf[i] - 48)
+                if mantissa > 0:
+                    digits += 1
+                exponent -= 1
+            seen = True
+            i += 1
+    if seen and i < n and (buf[i] == 101 or buf[i] == 69):
+        i += 1
+        exp_negative = False
+        if i < n and (buf[i] == 45 or buf[i] == 43):
+            exp_negative = buf[i] == 45
+            i += 1
+        e = 0
+        while i < n and 48 <= buf[i] <= 57:
+            e = e * 10 + (buf[i] - 48)
+            i += 1
+        exponent += -e if exp_negative else e
+    # Exact while the mantissa fits 53 bits and |exponent| <= 22 (Clinger's
+    # fast path); longer inputs may differ from strtod in the last ulp.
+    value = float(mantissa)
+    exact = mantissa <= 9007199254740992
+    if exponent == 0:
+        pass
+    elif exact and 0 < exponent <= 22:
+        value *= _POW10[exponent]
+    elif exact and -22 <= exponent < 0:
+        value /= _POW10[-exponent]
+    else:
+        value *= 10.0 ** exponent
+    return -value if negative else value, i, seen
+
+@njit(cache=True)
+def _push_digit(value, digit, ok):
+    """value * 10 + digit, with ok cleared instead of overflowing int64."""
+    if value > (9223372036854775807 - digit) // 10:
+        return value, False
+    return value * 10 + digit, ok
+
+@njit(cache=True)
+def _parse_id(buf, i):
+    """
+    Node id at buf[i:] as an exact int64; returns (value, next index, ok).
+    Float spellings of integers ("3.0", "1.5e+01" as np.savetxt writes
+    them) are evaluated in integer arithmetic, so ids above 2**53 keep
+    every digit. Negative, fractional and beyond-int64 ids are not ok.
+    """
+    n = len(buf)
+    value = 0
+    ok = True
+    seen = False
+    if i < n and buf[i] == 43:
+        i += 1
+    while i < n and 48 <= buf[i] <= 57:
+        value, ok = _push_digit(value, buf[i] - 48, ok)
+        seen = True
+        i += 1
+    # Fraction digits; trailing zeros are held back and never scale the value.
+    scale = 0
+    zeros = 0
+    if i < n and buf[i] == 46:
+        i += 1
+        while i < n and 48 <= buf[i] <= 57:
+            digit = buf[i] - 48
+            if digit == 0:
+                zeros += 1
+            else:
+                for _ in range(zeros):
+                    value, ok = _push_digit(value, 0, ok)
+                value, ok = _push_digit(value, digit, ok)
+                scale += zeros + 1
+                zeros = 0
+            seen = True
+            i += 1
+    exponent = 0
+    if seen and i < n and (buf[i] == 101 or buf[i] == 69):
+        i += 1
+        exp_negative = False
+        if i < n and (buf[i] == 45 or buf[i] == 43):
+            exp_negative = buf[i] == 45
+            i += 1
+        while i < n and 48 <= buf[i] <= 57:
+            if exponent < 1000:
+                exponent = exponent * 10 + (buf[i] - 48)
+            i += 1
+        if exp_negative:
+            exponent = -exponent
+    shift = exponent - scale
+    if value != 0:
+        for _ in range(min(shift, 20)):
+            value, ok = _push_digit(value, 0, ok)
+        for _ in range(min(-shift, 20)):
+            if value % 10 != 0:
+                ok = False
+            value //= 10
+    if i < n and not (buf[i] == _NEWLINE or _is_separator(buf[i])):
+        ok = False
+    return value, i, ok and seen
+
+@njit(cache=True, nogil=True)
+def _parse_edge_block(buf, u, v, w):
+    """
+    Parse whitespace/comma separated "u v [w]" lines from a byte block into
+    u, v, w; a missing weight is 1.0, lines starting with # or % are skipped.
+    Ids are parsed as integers (see _parse_id), weights as decimals.
+    Returns the number of edges, or -(line index + 1) on a malformed line.
+    """
+    n = len(buf)
+    i = 0
+    count = 0
+    line = 0
+    while i < n:
+        c = buf[i]
+        if c == _NEWLINE:
+            line += 1
+            i += 1
+            continue
+        if _is_separator(c):
+            i += 1
+            continue
+        if c == 35 or c == 37:
+            while i < n and buf[i] != _NEWLINE:
+                i += 1
+            continue
+        a, i, ok_a = _parse_id(buf, i)
+        while i < n and _is_separator(buf[i]):
+            i += 1
+        b, i, ok_b = _parse_id(buf, i)
+        while i < n and _is_separator(buf[i]):
+            i += 1
+        weight = 1.0
+        ok_w = True
+        if i < n and buf[i] != _NEWLINE:
+            weight, i, ok_w = _parse_number(buf, i)
+        while i < n and _is_separator(buf[i]):
+            i += 1
+        if not (ok_a and ok_b and ok_w) or (i < n and buf[i] != _NEWLINE):
+            return -(line + 1)
+        u[count] = a
+        v[count] = b
+        w[count] = weight
+        count += 1
+    return count
+
+def _line_number(file_path, offset, block_size=BLOCK_SIZE):
+    """1-based number of the line holding byte offset of file_path."""
+    newlines = 0
+    with open(file_path, "rb") as f:
+        while offset > 0:
+            raw = np.frombuffer(f.read(min(block_size, offset)), dtype=np.uint8)
+            if len(raw) == 0:
+                break
+            newlines += int(np.count_nonzero(raw == _NEWLINE))
+            offset -= len(raw)
+    return newlines + 1
+
+def _parse_block(file_path, block, offset):
+    """COO arrays (u, v, w) of a block of whole lines starting at byte offset of file_path."""
+    newlines = np.flatnonzero(block == _NEWLINE)
+    capacity = len(newlines) + 1
+    u = np.empty(capacity, dtype=np.int64)
+    v = np.empty(capacity, dtype=np.int64)
+    w = np.empty(capacity, dtype=np.float64)
+    count = _parse_edge_block(block, u, v, w)
+    if count < 0:
+        # Errors name the absolute line and byte, whichever worker's span held them.
+        line = -count - 1
+        start = offset + (int(newlines[line - 1]) + 1 if line else 0)
+        raise ValueError(f"Malformed edge-list line {_line_number(file_path, start)} (byte {start})")
+    return u[:count], v[:count], w[:count]
+
+def _parse_span(file_path, start, end, block_size=BLOCK_SIZE):
+    """
+    Parse the edge-list lines whose first byte lies in [start, end),
+    block_size bytes at a time; returns COO arrays (u, v, w).
+    """
+    parts = []
+    with open(file_path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        carry = np.empty(0, dtype=np.uint8)
+        while True:
+            raw = np.frombuffer(f.read(block_size), dtype=np.uint8)
+            chunk_start = position - len(carry)
+            position += len(raw)
+            chunk = np.concatenate([carry, raw]) if len(carry) else raw
+            if chunk_start >= end or len(chunk) == 0:
+                break
+            last = len(raw) == 0
+            cut = len(chunk)
+            if not last:
+                newlines = np.flatnonzero(chunk == _NEWLINE)
+                if len(newlines) == 0:
+                    carry = chunk
+                    continue
+                cut = newlines[-1] + 1
+                if chunk_start + cut > end:
+                    # Finish the line holding byte end - 1 and stop there.
+                    cut = newlines[np.searchsorted(newlines, end - 1 - chunk_start)] + 1
+                    last = True
+            parts.append(_parse_block(file_path, chunk[:cut], chunk_start))
+            if last:
+                break
+            carry = chunk[cut:]
+    if not parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64)
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+@njit(cache=True)
+def _build_csr(u, v, w, n):
+    """
+    CSR arrays (indptr, indices, data) from COO triples in one counting-sort
+    pass; columns come out sorted and parallel edges keep their min weight.
+    """
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for k in range(len(u)):
+        indptr[u[k] + 1] += 1
+    for r in range(n):
+        indptr[r + 1] += indptr[r]
+    fill = indptr[:-1].copy()
+    cols = np.empty(len(u), dtype=np.int64)
+    vals = np.empty(len(u), dtype=np.float64)
+    for k in range(len(u)):
+        p = fill[u[k]]
+        cols[p] = v[k]
+        vals[p] = w[k]
+        fill[u[k]] += 1
+
+    out_ptr = np.zeros(n + 1, dtype=np.int64)
+    out = 0
+    for r in range(n):
+        start = indptr[r]
+        end = indptr[r + 1]
+        row_cols = cols[start:end].copy()
+        row_vals = vals[start:end].copy()
+        last = -1
+        for j in np.argsort(row_cols):
+            col = row_cols[j]
+            val = row_vals[j]
+            if col == last:
+                if val < vals[out - 1]:
+                    vals[out - 1] = val
+            else:
+                cols[out] = col
+                vals[out] = val
+                out += 1
+                last = col
+        out_ptr[r + 1] = out
+    return out_ptr, cols[:out].copy(), vals[:out].copy()
+
+def coo_to_csr(u, v, w, n):
+    """Square csr_matrix from COO triples, parallel edges collapsed to their minimum."""
+    indptr, indices, data = _build_csr(u, v, w, n)
+    if max(n, len(indices)) <= np.iinfo(np.int32).max:
+        indptr, indices = indptr.astype(np.int32), indices.astype(np.int32)
+    adj = csr_matrix((data, indices, indptr), shape=(n, n), copy=False)
+    adj.has_sorted_indices = True
+    return adj
+
+def load_adj(file_path, workers=1, block_size=BLOCK_SIZE):
+    """
+    Ingest "u v [w]" edge lists into CSR format.
+
+    The file is parsed block_size bytes at a time by a compiled kernel;
+    workers > 1 splits it into byte ranges parsed in separate processes.
+    """
+    size = os.path.getsize(file_path)
+    if workers > 1 and size > block_size:
+        bounds = np.linspace(0, size, workers + 1).astype(np.int64)
+        # forkserver: forking a process that already runs numba worker threads can deadlock.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("forkserver")) as pool:
+            spans = list(pool.map(_parse_span, [file_path] * workers, bounds[:-1], bounds[1:],
+                                  [block_size] * workers))
+        u, v, w = (np.concatenate(column) for column in zip(*spans))
+    else:
+        u, v, w = _parse_span(file_path, 0, size, block_size)
+    n = int(max(u.max(), v.max())) + 1 if len(u) else 0
+    return coo_to_csr(u, v, w, n)
+
+def load_graphml(file_path, weight_key=None):
+    """
+    Parse GraphML XML structures into CSR format.
+
+    weight_key names the edge <data> key (its id or attr.name) holding the
+    weight; by default a key named "weight", else the first <data> child.
+    Edges without it weigh 1.0.
+    """
+    return _parse_graphml(file_path, weight_key)[0]
+
+def _local(tag):
+    return tag.rpartition("}")[2]
+
+def _parse_graphml(file_path, weight_key=None):
+    """
+    Streaming GraphML parse returning (csr, node_ids) with node_ids in row
+    order: declaration order, then undeclared edge endpoints.
+    """
     node_map = {}
-    current_idx = 0
-    edges = []
-    for edge in root.findall('.//g:edge', ns):
-        source = edge.get('source')
-        target = edge.get('target')
-        if source not in node_map:
-            node_map[source] = current_idx
-            current_idx += 1
-        if target not in node_map:
-            node_map[target] = current_idx
-            current_idx += 1
-        weight_data = edge.find('.//g:data', ns)
-        weight = float(weight_data.text) if weight_data is not None else 1.0
-        edges.append((node_map[source], node_map[target], weight))
-    edges = np.array(edges)
-    u = edges[:, 0].astype(np.int64)
-    v = edges[:, 1].astype(np.int64)
-    w = edges[:, 2]
-    return csr_matrix((w, (u, v)), shape=(current_idx, current_idx))
+    u, v, w = array("q"), array("q"), array("d")
+    key_id = None
+    default_weight = 1.0
+    context = ET.iterparse(file_path, events=("start", "end"))
+    _, container = next(context)
+    for event, elem in context:
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == "graph":
+                container = elem
+            continue
+        if tag == "key":
+            if elem.get("for") in ("edge", "all", None) and key_id is None and (
+                    elem.get("id") == weight_key or elem.get("attr.name") == (weight_key or "weight")):
+                key_id = elem.get("id")
+                default = next((child.text for child in elem if _local(child.tag) == "default"), None)
+                default_weight = float(default) if default is not None else 1.0
+        elif tag == "node":
+            node_map.setdefault(elem.get("id"), len(node_map))
+            container.clear()
+        elif tag == "edge":
+            weight = default_weight
+            for data in elem:
+                if _local(data.tag) == "data" and (data.get("key") == key_id or (key_id is None and weight_key is None)):
+                    weight = float(data.text)
+                    break
+            u.append(node_map.setdefault(elem.get("source"), len(node_map)))
+            v.append(node_map.setdefault(elem.get("target"), len(node_map)))
+            w.append(weight)
+            container.clear()
+    if weight_key is not None and key_id is None:
+        raise ValueError(f"GraphML has no edge data key {weight_key!r}")
+    u = np.frombuffer(u, dtype=np.int64)
+    v = np.frombuffer(v, dtype=np.int64)
+    w = np.frombuffer(w, dtype=np.float64)
+    return coo_to_csr(u, v, w, len(node_map)), np.array(list(node_map))
+
+# Mean Earth radius (IUGG), metres.
+EARTH_RADIUS = 6371008.8
+# Node records buffered before each vectorized membership filter.
+NODE_CHUNK = 1 << 16
+ONEWAY_FORWARD = ("yes", "true", "1")
+ONEWAY_REVERSE = ("-1", "reverse")
 
 def load_osm(file_path):
     """
     Extract topological data from OpenStreetMap (XML).
-    Converts spatial coordinates into Euclidean edge weights.
-    """
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-    nodes = {}
-    for node in root.findall('node'):
-        nodes[node.get('id')] = (float(node.get('lat')), float(node.get('lon')))
-    edges = []
-    node_id_map = {old_id: i for i, old_id in enumerate(nodes.keys())}
-    for way in root.findall('way'):
-        is_highway = any(tag.get('k') == 'highway' for tag in way.findall('tag'))
-        if not is_highway: continue
-        way_nodes = [nd.get('ref') for nd in way.findall('nd')]
-        for i in range(len(way_nodes) - 1):
-            u_id, v_id = way_nodes[i], way_nodes[i+1]
-            if u_id in nodes and v_id in nodes:
-                u_lat, u_lon = nodes[u_id]
-                v_lat, v_lon = nodes[v_id]
-                dist = np.sqrt((u_lat - v_lat)**2 + (u_lon - v_lon)**2)
-                edges.append((node_id_map[u_id], node_id_map[v_id], dist))
-    if not edges: return csr_matrix((0,0))
-    edges = np.array(edges)
-    return csr_matrix((edges[:, 2], (edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64))), shape=(len(nodes), len(nodes)))
+    Edge weights are great-circle lengths in metres; oneway tags are honoured.
+    """
+    return _parse_osm(file_path)[0]
+
+def _iter_elements(file_path, tags):
+    """Stream top-level OSM elements named in tags, freeing each after use."""
+    context = ET.iterparse(file_path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event == "end" and elem.tag in ("node", "way", "relation"):
+            if elem.tag in tags:
+                yield elem
+            root.clear()
+
+def _collect_highways(file_path):
+    """
+    First pass: node refs of every highway way, flat, with per-way lengths
+    and direction (0 both ways, 1 forward only, -1 reverse only).
+    """
+    refs = array("q")
+    way_lengths = array("q")
+    directions = array("b")
+    for way in _iter_elements(file_path, ("way",)):
+        tags = {tag.get("k"): tag.get("v") for tag in way.iter("tag")}
+        if "highway" not in tags:
+            continue
+        way_refs = [int(nd.get("ref")) for nd in way.iter("nd")]
+        if len(way_refs) < 2:
+            continue
+        oneway = tags.get("oneway", "")
+        if oneway in ONEWAY_FORWARD or (tags.get("junction") == "roundabout" and oneway != "no"):
+            directions.append(1)
+        elif oneway in ONEWAY_REVERSE:
+            directions.append(-1)
+        else:
+            directions.append(0)
+        refs.extend(way_refs)
+        way_lengths.append(len(way_refs))
+    return (np.frombuffer(refs, dtype=np.int64), np.frombuffer(way_lengths, dtype=np.int64),
+            np.frombuffer(directions, dtype=np.int8))
+
+def _collect_nodes(file_path, wanted):
+    """
+    Second pass: (ids, coordinates) of the nodes in sorted id array wanted.
+    Records are buffered NODE_CHUNK at a time and filtered vectorized, so
+    unreferenced nodes never outlive their chunk.
+    """
+    ids = array("q")
+    coords = array("d")
+    kept_ids, kept_coords = [], []
+
+    def flush():
+        chunk_ids = np.array(ids, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(wanted, chunk_ids), len(wanted) - 1)
+        keep = wanted[pos] == chunk_ids
+        kept_ids.append(chunk_ids[keep])
+        kept_coords.append(np.array(coords, dtype=np.float64).reshape(-1, 2)[keep])
+        del ids[:], coords[:]
+
+    for elem in _iter_elements(file_path, ("node", "way")):
+        if elem.tag == "way":
+            # Nodes precede ways in OSM XML; nothing left to collect.
+            break
+        ids.append(int(elem.get("id")))
+        coords.append(float(elem.get("lat")))
+        coords.append(float(elem.get("lon")))
+        if len(ids) >= NODE_CHUNK:
+            flush()
+    flush()
+    node_ids = np.concatenate(kept_ids)
+    coordinates = np.concatenate(kept_coords)
+    order = np.argsort(node_ids, kind="stable")
+    return node_ids[order], coordinates[order]
+
+def great_circle(lat_u, lon_u, lat_v, lon_v):
+    """Haversine distance in metres between degree coordinate arrays."""
+    lat_u, lon_u, lat_v, lon_v = map(np.radians, (lat_u, lon_u, lat_v, lon_v))
+    a = np.sin((lat_v - lat_u) * 0.5) ** 2 + np.cos(lat_u) * np.cos(lat_v) * np.sin((lon_v - lon_u) * 0.5) ** 2
+    return 2.0 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def _parse_osm(file_path):
+    """
+    Streaming two-pass OSM parse returning (csr, node_ids, coordinates).
+
+    Pass one keeps only highway node refs, pass two only the coordinates of
+    referenced nodes, both in flat typed buffers; the element tree is freed
+    as it streams, so peak memory follows the output graph, not the XML.
+    Rows are ordered by OSM node id; coordinates are (lat, lon) rows.
+    """
+    refs, way_lengths, directions = _collect_highways(file_path)
+    if len(refs) == 0:
+        return csr_matrix((0, 0)), np.empty(0, dtype=np.int64), np.empty((0, 2))
+    node_ids, coordinates = _collect_nodes(file_path, np.unique(refs))
+    n = len(node_ids)
+    if n == 0:
+        return csr_matrix((0, 0)), node_ids, coordinates
+
+    # Consecutive refs within a way form a segment; way boundaries do not.
+    way_ends = np.cumsum(way_lengths)
+    is_segment = np.ones(len(refs) - 1, dtype=np.bool_)
+    is_segment[way_ends[:-1] - 1] = False
+    segment_direction = np.repeat(directions, way_lengths - 1)
+
+    rows = np.minimum(np.searchsorted(node_ids, refs), n - 1)
+    present = node_ids[rows] == refs
+    u, v = rows[:-1], rows[1:]
+    valid = is_segment.copy()
+    valid[is_segment] &= present[:-1][is_segment] & present[1:][is_segment]
+    valid &= u != v
+    u, v, segment_direction = u[valid], v[valid], segment_direction[valid[is_segment]]
+
+    lengths = great_circle(coordinates[u, 0], coordinates[u, 1], coordinates[v, 0], coordinates[v, 1])
+    forward = segment_direction >= 0
+    backward = segment_direction <= 0
+    src = np.concatenate([u[forward], v[backward]])
+    dst = np.concatenate([v[forward], u[backward]])
+    w = np.concatenate([lengths[forward], lengths[backward]])
+    return coo_to_csr(src, dst, w, n), node_ids, coordinates
@@ -0,0 +1,308 @@
+"""
+Vecture Laboratories // NetworkX Dispatch Backend
+
+Operational Directive:
+Answer NetworkX's weighted shortest-path API with ComesSolver, so existing
+nx code reaches the compiled engine without changes.
+
+Registered as the "comes" backend through the networkx.backends entry
+point. Enable it globally with nx.config.backend_priority = ["comes"] (or
+NETWORKX_BACKEND_PRIORITY=comes), or per call with backend="comes".
+Calls the backend cannot serve (weight functions, unweighted or
+single-target-only forms, negative weights) fall through to the next
+backend in the priority list, normally NetworkX itself.
+"""
+
+import inspect
+import itertools
+import numpy as np
+import networkx as nx
+from ..core.solver import ComesSolver
+
+BACKEND_NAME = "comes"
+# Key of this backend's conversions in G.__networkx_cache__.
+CACHE_KEY = "comes_path"
+
+class ComesGraph:
+    """
+    A NetworkX graph in CSR form: node i is labels[i]; undirected edges are
+    stored in both directions and parallel edges reduced to the lightest.
+    The ComesSolver (partition params, pivots) is built on first use and
+    lives as long as the converted graph.
+    """
+    __networkx_backend__ = BACKEND_NAME
+
+    def __init__(self, labels, indptr, indices, data, directed=True, graph=None, integral=False):
+        self.labels = np.empty(len(labels), dtype=object)
+        self.labels[:] = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.directed = directed
+        self.graph = {} if graph is None else graph
+        # Int-typed weights sum to ints in NetworkX; lengths are reported likewise.
+        self.integral = integral
+        self._solver = None
+
+    @property
+    def shape(self):
+        return (len(self.labels), len(self.labels))
+
+    def is_directed(self):
+        return self.directed
+
+    def is_multigraph(self):
+        return False
+
+    @property
+    def solver(self):
+        if self._solver is None:
+            self._solver = ComesSolver(self)
+        return self._solver
+
+    def lengths(self, distances):
+        """Distances as a list of Python numbers: ints for int-typed weights."""
+        if self.integral:
+            return np.rint(distances).astype(np.int64).tolist()
+        return distances.tolist()
+
+    def length(self, distance):
+        return self.lengths(np.asarray([distance]))[0]
+
+    def node_index(self, label, message="Node {} not found in graph"):
+        try:
+            return self.index[label]
+        except (KeyError, TypeError):
+            raise nx.NodeNotFound(message.format(label)) from None
+
+def graph_to_csr(G, weight="weight", default=1):
+    """
+    (labels, indptr, indices, data, integral) of any NetworkX graph, read in
+    one pass over G.edges into flat arrays; sorting and de-duplication run
+    in numpy. integral is True when every weight (the default included, for
+    edges without the attribute) is an int, so NetworkX would sum to ints.
+    """
+    labels = list(G)
+    index = {label: i for i, label in enumerate(labels)}
+    n = len(labels)
+    m = G.number_of_edges()
+    # Weight types are collected in the same pass (set.add returns None).
+    kinds = set()
+    flat = np.fromiter(
+        itertools.chain.from_iterable((index[u], index[v], w) for u, v, w in G.edges(data=weight, default=default)
+                                      if not kinds.add(type(w))),
+        dtype=np.float64, count=3 * m,
+    ).reshape(m, 3)
+    integral = all(issubclass(kind, (int, np.integer)) for kind in kinds)
+    src = flat[:, 0].astype(np.int64)
+    dst = flat[:, 1].astype(np.int64)
+    data = flat[:, 2].copy()
+    if not G.is_directed():
+        src, dst, data = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([data, data])
+    order = np.lexsort((data, dst, src))
+    src, dst, data = src[order], dst[order], data[order]
+    # Lightest of every parallel edge (and the mirrored copy of undirected self-loops).
+    keep = np.ones(len(src), dtype=np.bool_)
+    keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+    src, dst, data = src[keep], dst[keep], data[keep]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return labels, indptr, dst, data, integral
+
+def converted(G, weight="weight", default=1):
+    """
+    G as a ComesGraph, converted once per graph and weight attribute. The
+    conversion is cached on G.__networkx_cache__, which NetworkX clears on
+    every mutation through the graph API, and checked against the node
+    and edge counts. Editing edge data in place (G[u][v][weight] = ...)
+    bypasses both: callers doing so must clear G.__networkx_cache__, as
+    NetworkX itself requires for its own cached conversions.
+    """
+    cache = getattr(G, "__networkx_cache__", None)
+    key = (weight, default)
+    version = (G.number_of_nodes(), G.number_of_edges())
+    if cache is not None:
+        entry = cache.setdefault(CACHE_KEY, {}).get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+    labels, indptr, indices, data, integral = graph_to_csr(G, weight, default)
+    if len(data) and data.min() < 0:
+        raise NotImplementedError("Negative edge weights are not supported by the comes backend.")
+    graph = ComesGraph(labels, indptr, indices, data, G.is_directed(), dict(G.graph), integral)
+    if cache is not None:
+        cache[CACHE_KEY][key] = (version, graph)
+    return graph
+
+def _distances(G, source, cutoff=None):
+    """(node indices, distances) of every node reached from source, by increasing distance."""
+    if cutoff is not None:
+        return G.solver.shortest_path(source, cutoff=cutoff)
+    distances = G.solver.shortest_path(source)
+    nodes = np.flatnonzero(np.isfinite(distances))
+    order = np.argsort(distances[nodes], kind="stable")
+    return nodes[order], distances[nodes[order]]
+
+def _lengths(G, source, cutoff=None):
+    nodes, distances = _distances(G, source, cutoff)
+    return dict(zip(G.labels[nodes].tolist(), G.lengths(distances)))
+
+def _paths(G, source, cutoff=None):
+    """
+    (lengths, paths) dicts from one search that records its predecessor
+    tree. Each path extends its parent's, as NetworkX builds them, so the
+    cost is the output size rather than one walk per node.
+    """
+    if cutoff is not None:
+        nodes, distances = G.solver.shortest_path(source, cutoff=cutoff)
+        _, offsets, flat, _ = G.solver.routes(source, nodes)
+        flat = G.labels[flat].tolist()
+        bounds = offsets.tolist()
+        labels = G.labels[nodes].tolist()
+        paths = {label: flat[bounds[i]:bounds[i + 1]] for i, label in enumerate(labels)}
+        return dict(zip(labels, G.lengths(distances))), paths
+    distances, predecessors = G.solver.shortest_path(source, predecessors=True)
+    nodes = np.flatnonzero(np.isfinite(distances))
+    nodes = nodes[np.argsort(distances[nodes], kind="stable")]
+    labels = G.labels[nodes].tolist()
+    parents = predecessors[nodes].tolist()
+    built = {source: [G.labels[source]]}
+    for node, label, parent in zip(nodes.tolist(), labels, parents):
+        if node not in built:
+            if parent not in built:
+                # Zero-weight ties can order a child before its parent.
+                chain = []
+                while parent not in built:
+                    chain.append(parent)
+                    parent = int(predecessors[parent])
+                for ancestor in reversed(chain):
+                    built[ancestor] = built[int(predecessors[ancestor])] + [G.labels[ancestor]]
+                parent = int(predecessors[node])
+            built[node] = built[parent] + [label]
+    paths = dict(zip(labels, map(built.__getitem__, nodes.tolist())))
+    return dict(zip(labels, G.lengths(distances[nodes]))), paths
+
+def _route(G, source, target):
+    """(distance, path labels), or None if target is unreachable."""
+    distance, path = G.solver.route(source, target)
+    if path is None:
+        return None
+    return G.length(distance), G.labels[path].tolist()
+
+class BackendInterface:
+    """The object the networkx.backends entry point names."""
+
+    @staticmethod
+    def convert_from_nx(G, edge_attrs=None, node_attrs=None, preserve_edge_attrs=False,
+                        preserve_node_attrs=False, preserve_graph_attrs=False, name=None, graph_name=None):
+        weight, default = next(iter(edge_attrs.items())) if edge_attrs else ("weight", 1)
+        return converted(G, weight, 1 if default is None else default)
+
+    @staticmethod
+    def convert_to_nx(obj, *, name=None):
+        # Results are already plain dicts, lists and floats.
+        return obj
+
+    @staticmethod
+    def can_run(name, args, kwargs):
+        try:
+            bound = inspect.signature(getattr(BackendInterface, name)).bind(*args, **kwargs)
+        except TypeError:
+            return "unexpected arguments"
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if arguments["weight"] is None or callable(arguments["weight"]):
+            return "only edge-attribute weights are supported"
+        if name in ("shortest_path", "shortest_path_length"):
+            if arguments["source"] is None:
+                return "a source node is required"
+            if arguments["method"] != "dijkstra":
+                return "only method='dijkstra' is supported"
+        return True
+
+    @staticmethod
+    def single_source_dijkstra_path_length(G, source, cutoff=None, weight="weight"):
+        return _lengths(G, G.node_index(source), cutoff)
+
+    @staticmethod
+    def single_source_dijkstra_path(G, source, cutoff=None, weight="weight"):
+        return _paths(G, G.node_index(source), cutoff)[1]
+
+    @staticmethod
+    def single_source_dijkstra(G, source, target=None, cutoff=None, weight="weight"):
+        s = G.node_index(source)
+        if target is None:
+            return _paths(G, s, cutoff)
+        found = _route(G, s, G.node_index(target))
+        if found is None or (cutoff is not None and found[0] > cutoff):
+            raise nx.NetworkXNoPath(f"No path to {target}.")
+        return found
+
+    @staticmethod
+    def dijkstra_path_length(G, source, target, weight="weight"):
+        s = G.node_index(source)
+        distance = G.solver.shortest_path(s, target=G.node_index(target))
+        if np.isinf(distance):
+            raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+        return G.length(distance)
+
+    @staticmethod
+    def dijkstra_path(G, source, target, weight="weight"):
+        found = _route(G, G.node_index(source), G.node_index(target))
+        if found is None:
+            raise nx.NetworkXNoPath(f"No path to {target}.")
+        return found[1]
+
+    @staticmethod
+    def bidirectional_dijkstra(G, source, target, weight="weight"):
+        s = G.node_index(source, "Source {} is not in G")
+        found = _route(G, s, G.node_index(target, "Target {} is not in G"))
+        if found is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return found
+
+    @staticmethod
+    def all_pairs_dijkstra_path_length(G, cutoff=None, weight="weight"):
+        n = len(G.labels)
+        if cutoff is not None:
+            for source in range(n):
+                yield G.labels[source], _lengths(G, source, cutoff)
+            return
+        for offset, block in G.solver.shortest_paths(np.arange(n), block_size=64):
+            for i, row in enumerate(block):
+                nodes = np.flatnonzero(np.isfinite(row))
+                nodes = nodes[np.argsort(row[nodes], kind="stable")]
+                yield G.labels[offset + i], dict(zip(G.labels[nodes].tolist(), G.lengths(row[nodes])))
+
+    @staticmethod
+    def shortest_path(G, source=None, target=None, weight=None, method="dijkstra"):
+        if target is None:
+            return BackendInterface.single_source_dijkstra_path(G, source, weight=weight)
+        return BackendInterface.dijkstra_path(G, source, target, weight=weight)
+
+    @staticmethod
+    def shortest_path_length(G, source=None, target=None, weight=None, method="dijkstra"):
+        if target is None:
+            return BackendInterface.single_source_dijkstra_path_length(G, source, weight=weight)
+        return BackendInterface.dijkstra_path_length(G, source, target, weight=weight)
+
+FUNCTIONS = (
+    "single_source_dijkstra_path_length", "single_source_dijkstra_path", "single_source_dijkstra",
+    "dijkstra_path_length", "dijkstra_path", "bidirectional_dijkstra", "all_pairs_dijkstra_path_length",
+    "shortest_path", "shortest_path_length",
+)
+
+def get_info():
+    """Metadata for the networkx.backend_info entry point."""
+    return {
+        "backend_name": BACKEND_NAME,
+        "project": "comes-path",
+        "package": "comes_path",
+        "url": "https://www.vecture.de",
+        "short_summary": "Frontier-partitioned shortest paths compiled with numba.",
+        "functions": {
+            name: {"additional_docs": "Weighted (edge-attribute) single-source forms only."}
+            for name in FUNCTIONS
+        },
+        "default_config": {},
+    }
@@ -0,0 +1,363 @@
+"""
+Vecture Laboratories // Shared-Memory Query Server
+
+Operational Directive:
+Publish one graph in shared memory, attach worker processes to it without
+copying, and feed them batches of queued queries through an asyncio API.
+
+Usage:
+    async with QueryServer(load_graph("city.comes"), num_workers=4) as server:
+        dist = await server.shortest_path(0, target=42)
+        distances = await server.shortest_path(0)
+"""
+
+import queue
+import asyncio
+import threading
+import multiprocessing
+import concurrent.futures
+from multiprocessing import shared_memory
+import numpy as np
+import numba
+from ..core.solver import ComesSolver
+
+def _open_block(name):
+    """Attach to an existing block; only its creator unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: spawned workers report to the owner's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+class SharedGraph:
+    """
+    CSR arrays, pivot mask and partition params published once in
+    multiprocessing.shared_memory. For the dial engine the compact integer
+    arrays are published too (compact), so no process derives its own copy.
+
+    Created with SharedGraph.create in the owning process and reopened
+    elsewhere with SharedGraph.attach(handle); every attached array is a
+    view of the same pages. A SharedGraph is CSR-like, so it can be passed
+    straight to ComesSolver.set_graph together with its params and pivots.
+    Treat it as read-only: update_weights on any solver built from it would
+    rewrite the weights under every other process.
+    """
+    def __init__(self, arrays, params, engine, blocks, owner):
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.data = arrays["data"]
+        self.pivots = arrays.get("pivots")
+        self.compact = None
+        if "dial_indices" in arrays:
+            self.compact = (arrays["dial_indices"], arrays["dial_indptr"], arrays["dial_weights"])
+        self.params = params
+        self.engine = engine
+        self._arrays = arrays
+        self._blocks = blocks
+        self._owner = owner
+
+    @classmethod
+    def create(cls, graph, params=None, pivots=None):
+        """
+        Resolve engine, params and pivots for any CSR-like graph (as
+        ComesSolver.set_graph would) and copy the arrays into shared memory.
+        """
+        solver = ComesSolver()
+        solver.set_graph(graph, params=params, pivots=pivots)
+        sections = {
+            "indptr": solver.indptr,
+            "indices": solver.indices,
+            "data": solver.data,
+            "pivots": solver.pivots,
+        }
+        if solver._dial is not None:
+            sections["dial_indices"], sections["dial_indptr"], sections["dial_weights"] = solver._dial[:3]
+        arrays, blocks = {}, {}
+        try:
+            for name, source in sections.items():
+                source = np.ascontiguousarray(source)
+                block = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
+                blocks[name] = block
+                arrays[name] = np.ndarray(source.shape, dtype=source.dtype, buffer=block.buf)
+                arrays[name][...] = source
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        params = None if solver.params is None else {
+            k: (v.item() if isinstance(v, np.generic) else v) for k, v in solver.params.items()
+        }
+        return cls(arrays, params, solver.engine, blocks, owner=True)
+
+    @property
+    def handle(self):
+        """Picklable description that SharedGraph.attach reopens."""
+        layout = {
+            name: (self._blocks[name].name, array.dtype.str, array.shape)
+            for name, array in self._arrays.items()
+        }
+        return layout, self.params, self.engine
+
+    @classmethod
+    def attach(cls, handle):
+        layout, params, engine = handle
+        arrays, blocks = {}, {}
+        for name, (block_name, dtype, shape) in layout.items():
+            block = _open_block(block_name)
+            blocks[name] = block
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return cls(arrays, params, engine, blocks, owner=False)
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def shape(self):
+        return (self.num_nodes, self.num_nodes)
+
+    def solver(self):
+        """A ComesSolver over the shared arrays; nothing is copied."""
+        solver = ComesSolver(engine=self.engine)
+        solver.set_graph(self, params=self.params, pivots=self.pivots)
+        return solver
+
+    def close(self):
+        """Drop this process's mapping, and the blocks themselves if it owns them."""
+        self.indptr = self.indices = self.data = self.pivots = self.compact = None
+        self._arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
+
+def _answer(solver, batch):
+    """
+    Distances for one batch of (source, target) requests: all full queries
+    run as one multi-source shortest_paths call (duplicates solved once),
+    target queries individually with early termination.
+    """
+    results = [None] * len(batch)
+    full = [i for i, (_, target) in enumerate(batch) if target is None]
+    if full:
+        sources, inverse = np.unique(np.array([batch[i][0] for i in full], dtype=np.int64), return_inverse=True)
+        rows = solver.shortest_paths(sources)
+        for i, row in zip(full, inverse):
+            results[i] = rows[row]
+    for i, (source, target) in enumerate(batch):
+        if target is not None:
+            results[i] = float(solver.shortest_path(source, target=target))
+    return results
+
+def _serve(handle, conn, num_threads):
+    """Worker process: attach, warm up, then answer batches until told to stop."""
+    numba.set_num_threads(num_threads)
+    graph = SharedGraph.attach(handle)
+    solver = graph.solver()
+    solver.warmup(batch=True)
+    conn.send("ready")
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        try:
+            conn.send(("ok", _answer(solver, batch)))
+        except Exception as exc:
+            conn.send(("error", exc))
+    del solver
+    graph.close()
+    conn.close()
+
+class QueryServer:
+    """
+    Multi-process shortest-path server over one shared-memory graph.
+
+    Requests queue up in the parent; whenever a worker is idle the
+    dispatcher hands it everything queued (up to max_batch requests,
+    waiting at most max_delay seconds for the batch to fill), so load
+    turns into multi-source batches rather than more round trips. Each
+    worker uses threads_per_worker numba threads for its batch kernels
+    (default: the parent's thread count split evenly).
+
+    shortest_path / shortest_paths are coroutines; submit returns a
+    concurrent.futures.Future for synchronous callers. Workers are spawned
+    fresh, so they start from numba's on-disk cache after the first run.
+    """
+    def __init__(self, graph, num_workers=2, max_batch=64, max_delay=0.0005, params=None, pivots=None,
+                 threads_per_worker=None):
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1.")
+        self.graph = graph
+        self.num_workers = num_workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.threads_per_worker = threads_per_worker or max(1, numba.get_num_threads() // num_workers)
+        self._params = params
+        self._pivots = pivots
+        self.shared = None
+        self.batches = 0
+        self.requests = 0
+        self._pending = queue.Queue()
+        self._idle = queue.Queue()
+        self._inflight = {}
+        self._workers = []
+        self._threads = []
+        self._dispatcher = None
+        self._closed = True
+
+    def start(self):
+        """Publish the graph, spawn the workers and wait until every one is warm."""
+        self.shared = SharedGraph.create(self.graph, params=self._params, pivots=self._pivots)
+        self.num_nodes = self.shared.num_nodes
+        context = multiprocessing.get_context("spawn")
+        try:
+            for index in range(self.num_workers):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_serve, args=(self.shared.handle, child, self.threads_per_worker), daemon=True
+                )
+                process.start()
+                child.close()
+                self._workers.append((process, parent))
+            for index, (_, conn) in enumerate(self._workers):
+                if conn.recv() != "ready":
+                    raise RuntimeError(f"Worker {index} failed to start.")
+        except (EOFError, OSError) as exc:
+            self._stop_workers()
+            self.shared.close()
+            raise RuntimeError("A worker exited during startup.") from exc
+        self._closed = False
+        for index in range(self.num_workers):
+            self._idle.put(index)
+            receiver = threading.Thread(target=self._receive, args=(index,), daemon=True)
+            receiver.start()
+            self._threads.append(receiver)
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def submit(self, source, target=None):
+        """Queue one query; the Future resolves to a float (target) or distance array."""
+        if self._closed:
+            raise RuntimeError("QueryServer is not running.")
+        source = int(source)
+        if not 0 <= source < self.num_nodes:
+            raise IndexError(f"Source {source} out of range for {self.num_nodes} nodes.")
+        if target is not None:
+            target = int(target)
+            if not 0 <= target < self.num_nodes:
+                raise IndexError(f"Target {target} out of range for {self.num_nodes} nodes.")
+        future = concurrent.futures.Future()
+        self._pending.put((source, target, future))
+        return future
+
+    async def shortest_path(self, source, target=None):
+        return await asyncio.wrap_future(self.submit(source, target))
+
+    async def shortest_paths(self, sources):
+        """(len(sources), n) distance matrix, one queued request per source."""
+        rows = await asyncio.gather(*(self.shortest_path(source) for source in sources))
+        return np.array(rows).reshape(len(rows), self.num_nodes)
+
+    def _dispatch(self):
+        while True:
+            index = self._idle.get()
+            if index is None:
+                return
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            wait = self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._pending.get(timeout=wait) if wait > 0 else self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                # Only the first wait may block; afterwards drain what is already queued.
+                wait = 0
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if batch:
+                self._inflight[index] = [future for _, _, future in batch]
+                self.batches += 1
+                self.requests += len(batch)
+                self._workers[index][1].send([(source, target) for source, target, _ in batch])
+            else:
+                self._idle.put(index)
+            if stopping:
+                return
+
+    def _receive(self, index):
+        conn = self._workers[index][1]
+        while True:
+            try:
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                futures = self._inflight.pop(index, [])
+                for future in futures:
+                    future.set_exception(RuntimeError(f"Worker {index} exited."))
+                return
+            futures = self._inflight.pop(index)
+            for i, future in enumerate(futures):
+                if status == "ok":
+                    future.set_result(payload[i])
+                else:
+                    future.set_exception(payload)
+            self._idle.put(index)
+
+    def _stop_workers(self):
+        """Finish in-flight batches, then shut every worker down."""
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process, conn in self._workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        # Receivers drain the last results and stop at end-of-file.
+        for thread in self._threads:
+            thread.join()
+        for process, conn in self._workers:
+            conn.close()
+        self._workers = []
+        self._threads = []
+
+    def close(self):
+        """Cancel queued requests, stop the workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.put(None)
+        self._idle.put(None)
+        self._dispatcher.join()
+        while True:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[2].cancel()
+        self._stop_workers()
+        self.shared.close()
+        self.shared = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def __aenter__(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.start)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -1,7 +1,25 @@
+import os
+import sys
+import asyncio
+import tomllib
+import tempfile
+import threading
+import subprocess
 import unittest
+from unittest import mock
 import numpy as np
-from scipy.sparse import csr_matrix
+import networkx as nx
+from scipy.sparse import csr_matrix, random as sparse_random
+from scipy.sparse.csgraph import dijkstra
 from comes_path.core.solver import ComesSolver
+from comes_path.core.relaxation import identify_pivots
+from comes_path.utils.binary import load_graph, convert_graph, save_graph
+from comes_path.utils.loaders import load_osm, load_adj, load_graphml
+from comes_path.utils.serving import QueryServer, SharedGraph
+from comes_path.utils.nx_backend import BackendInterface
+from comes_path.benchmarking.generators import barabasi_albert_graph, chain_graph, geometric_graph, grid_graph
+from comes_path.benchmarking.suite import benchmark_graph, diff_runs
+from comes_path.benchmarking.reordering import shuffled
 
 class TestComesPath(unittest.TestCase):
     def test_simple_path(self):
@@ -49,5 +67,625 @@ class TestComesPath(unittest.TestCase):
         distances = solver.shortest_path(0)
         self.assertEqual(distances[5], 5.0)
 
+    def test_batched_sources(self):
+        # Dense (bucket engine) and sparse (fallback) topologies against SciPy.
+        for density in (0.05, 0.005):
+            adj = sparse_random(200, 200, density=density, random_state=7, format='csr')
+            adj.data += 0.1
+            sources = np.arange(0, 200, 9)
+
+            solver = ComesSolver(adj)
+            expected = dijkstra(adj, indices=sources)
+            np.testing.assert_allclose(solver.shortest_paths(sources), expected)
+
+            blocks = [block for _, block in solver.shortest_paths(sources, block_size=4)]
+            np.testing.assert_allclose(np.vstack(blocks), expected)
+
+    def test_workspace_reuse(self):
+        # Interleaved target and full queries must not leak state.
+        for density in (0.05, 0.005):
+            adj = sparse_random(150, 150, density=density, random_state=3, format='csr')
+            adj.data += 0.1
+            expected = dijkstra(adj)
+
+            solver = ComesSolver(adj)
+            workspace = solver.create_workspace()
+            for source in range(0, 150, 13):
+                target = (source * 7 + 1) % 150
+                self.assertAlmostEqual(solver.shortest_path(source, target=target), expected[source, target])
+                np.testing.assert_allclose(solver.shortest_path(source, workspace=workspace), expected[source])
+            # Out-of-range ids, negatives included, are rejected before the workspace is touched.
+            for call in (lambda: solver.shortest_path(-1, workspace=workspace),
+                         lambda: solver.shortest_path(0, target=-1, workspace=workspace),
+                         lambda: solver.shortest_path(150, workspace=workspace),
+                         lambda: solver.shortest_path(-1, cutoff=1.0, workspace=workspace),
+                         lambda: solver.shortest_path(0, targets=[1, -2], workspace=workspace),
+                         lambda: solver.routes(-1, [1], workspace=workspace),
+                         lambda: solver.route(0, 150, workspace=workspace)):
+                with self.assertRaises(IndexError):
+                    call()
+            self.assertTrue(np.isinf(workspace.distances).all())
+            self.assertFalse(workspace.settled.any())
+
+    def test_frontier_layouts(self):
+        adj = sparse_random(300, 300, density=0.05, random_state=11, format='csr')
+        adj.data += 0.1
+        expected = dijkstra(adj, indices=0)
+        for layout in ("dense", "pooled"):
+            solver = ComesSolver(adj, frontier_layout=layout)
+            workspace = solver.create_workspace()
+            np.testing.assert_allclose(solver.shortest_path(0, workspace=workspace), expected)
+            self.assertGreater(workspace.frontier.peak_bytes, 0)
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, frontier_layout="sparse")
+
+    def test_radix_engine_for_wide_weights(self):
+        # Weights spanning seven decades would wrap the circular buffer.
+        adj = sparse_random(300, 300, density=0.05, random_state=5, format='csr')
+        rng = np.random.default_rng(5)
+        adj.data = np.exp(rng.uniform(np.log(1e-3), np.log(1e4), adj.nnz))
+        adj.data[::17] = 0.0
+
+        solver = ComesSolver(adj)
+        self.assertEqual(solver.params["engine"], "radix")
+        expected = dijkstra(adj, indices=[0, 42])
+        np.testing.assert_allclose(solver.shortest_paths([0, 42]), expected)
+        self.assertAlmostEqual(solver.shortest_path(42, target=7), expected[1, 7])
+        # A forced bucket ring cannot settle zero weights or span the range.
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, engine="bucket")
+        adj.data[::17] = 1e-3
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, engine="bucket")
+        narrow = grid_graph(10)
+        bucket = ComesSolver(narrow, engine="bucket")
+        with self.assertRaises(ValueError):
+            bucket.update_weights([0], [1], [0.0])
+        np.testing.assert_allclose(bucket.shortest_path(0), dijkstra(narrow, indices=0))
+
+    def test_delta_stepping_engine(self):
+        adj = sparse_random(300, 300, density=0.05, random_state=9, format='csr')
+        rng = np.random.default_rng(9)
+        adj.data = np.exp(rng.uniform(np.log(1e-2), np.log(1e2), adj.nnz))
+
+        solver = ComesSolver(adj, engine="delta")
+        self.assertEqual(solver.engine, "delta")
+        expected = dijkstra(adj, indices=[0, 17])
+        np.testing.assert_allclose(solver.shortest_paths([0, 17]), expected)
+        self.assertAlmostEqual(solver.shortest_path(17, target=3), expected[1, 3])
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, engine="fibonacci")
+
+    def test_bidirectional_search(self):
+        # Directed topologies exercise the reverse CSR.
+        for density in (0.05, 0.005):
+            adj = sparse_random(200, 200, density=density, random_state=21, format='csr')
+            adj.data += 0.1
+            expected = dijkstra(adj)
+
+            solver = ComesSolver(adj)
+            for source in range(0, 200, 17):
+                for target in range(0, 200, 23):
+                    dist = solver.shortest_path(source, target=target, bidirectional=True)
+                    self.assertAlmostEqual(dist, expected[source, target])
+        with self.assertRaises(ValueError):
+            solver.shortest_path(0, bidirectional=True)
+
+    def test_landmark_queries(self):
+        adj = sparse_random(200, 200, density=0.03, random_state=13, format='csr')
+        adj.data += 0.1
+        expected = dijkstra(adj)
+
+        solver = ComesSolver(adj)
+        index = solver.build_landmarks(k=6)
+        with tempfile.TemporaryDirectory() as path:
+            index.save(path)
+            reloaded = ComesSolver(adj)
+            reloaded.load_landmarks(path)
+            self.assertIsInstance(reloaded.landmark_index.from_landmarks, np.memmap)
+            for source in range(0, 200, 19):
+                for target in range(0, 200, 29):
+                    self.assertAlmostEqual(solver.shortest_path(source, target=target), expected[source, target])
+                    self.assertAlmostEqual(reloaded.shortest_path(source, target=target), expected[source, target])
+
+    def test_contraction_hierarchy(self):
+        adj = sparse_random(150, 150, density=0.03, random_state=17, format='csr')
+        adj.data += 0.1
+        expected = dijkstra(adj)
+
+        solver = ComesSolver(adj)
+        hierarchy = solver.build_hierarchy()
+        with tempfile.TemporaryDirectory() as path:
+            hierarchy.save(path)
+            reloaded = ComesSolver(adj)
+            reloaded.load_hierarchy(path)
+            self.assertIsInstance(reloaded.hierarchy.edge_src, np.memmap)
+            for source in range(0, 150, 13):
+                for target in range(0, 150, 17):
+                    self.assertAlmostEqual(reloaded.shortest_path(source, target=target), expected[source, target])
+                    dist, path_nodes = solver.route(source, target)
+                    self.assertAlmostEqual(dist, expected[source, target])
+                    if np.isinf(dist):
+                        self.assertIsNone(path_nodes)
+                        continue
+                    self.assertEqual((path_nodes[0], path_nodes[-1]), (source, target))
+                    weight = sum(adj[a, b] for a, b in zip(path_nodes[:-1], path_nodes[1:]))
+                    self.assertAlmostEqual(weight, dist)
+
+    def test_binary_graph_archive(self):
+        adj = sparse_random(120, 120, density=0.05, random_state=19, format='csr')
+        adj.data += 0.1
+        with tempfile.TemporaryDirectory() as path:
+            edge_list = f"{path}/graph.adj"
+            coo = adj.tocoo()
+            np.savetxt(edge_list, np.column_stack([coo.row, coo.col, coo.data]))
+            convert_graph(edge_list, f"{path}/graph.comes")
+            graph = load_graph(f"{path}/graph.comes")
+            self.assertFalse(graph.adjacency.indices.flags.writeable)
+            self.assertIsNotNone(graph.params)
+
+            solver = ComesSolver()
+            solver.set_graph(graph.adjacency, params=graph.params, pivots=graph.pivots)
+            np.testing.assert_allclose(solver.shortest_path(0), dijkstra(adj, indices=0))
+
+    def test_streaming_osm(self):
+        osm = """<?xml version="1.0"?>
+<osm version="0.6">
+ <node id="10" lat="52.0" lon="13.0"/>
+ <node id="20" lat="52.001" lon="13.0"/>
+ <node id="30" lat="52.001" lon="13.001"/>
+ <node id="99" lat="50.0" lon="10.0"/>
+ <way id="1"><nd ref="10"/><nd ref="20"/><tag k="highway" v="residential"/></way>
+ <way id="2"><nd ref="20"/><nd ref="30"/><tag k="highway" v="primary"/><tag k="oneway" v="yes"/></way>
+ <way id="3"><nd ref="30"/><nd ref="404"/><nd ref="10"/><tag k="highway" v="service"/></way>
+ <way id="4"><nd ref="99"/><nd ref="10"/><tag k="building" v="yes"/></way>
+</osm>"""
+        with tempfile.TemporaryDirectory() as path:
+            with open(f"{path}/map.osm", "w") as f:
+                f.write(osm)
+            adj = load_osm(f"{path}/map.osm")
+        # Node 99 is not on a highway; the way through missing node 404 is cut.
+        self.assertEqual(adj.shape, (3, 3))
+        self.assertAlmostEqual(adj[0, 1], 111.19, places=1)
+        self.assertAlmostEqual(adj[1, 0], adj[0, 1])
+        self.assertGreater(adj[1, 2], 0)
+        self.assertEqual(adj[2, 1], 0)
+        self.assertEqual(adj[2, 0], 0)
+
+    def test_chunked_loaders(self):
+        edge_list = "# u v w\n0 1 2.5\n1,2,0.75\n0 1 1.5\n2 3\n\n3 0 1e-1\n"
+        graphml = """<?xml version="1.0"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+ <key id="d0" for="edge" attr.name="label" attr.type="string"/>
+ <key id="d1" for="edge" attr.name="length" attr.type="double"/>
+ <graph edgedefault="directed">
+  <node id="a"/><node id="b"/><node id="c"/>
+  <edge source="a" target="b"><data key="d0">x</data><data key="d1">4.0</data></edge>
+  <edge source="b" target="a"><data key="d1">2.0</data></edge>
+  <edge source="a" target="b"><data key="d1">3.0</data></edge>
+ </graph>
+</graphml>"""
+        with tempfile.TemporaryDirectory() as path:
+            with open(f"{path}/graph.adj", "w") as f:
+                f.write(edge_list)
+            with open(f"{path}/graph.graphml", "w") as f:
+                f.write(graphml)
+            expected = np.array([[0, 1.5, 0, 0], [0, 0, 0.75, 0], [0, 0, 0, 1.0], [0.1, 0, 0, 0]])
+            np.testing.assert_allclose(load_adj(f"{path}/graph.adj").toarray(), expected)
+            np.testing.assert_allclose(load_adj(f"{path}/graph.adj", workers=2, block_size=8).toarray(), expected)
+            # Ids are integers: fractional ids are rejected at their absolute line, whichever worker parses it.
+            lines = [f"{i} {i + 1} 1.0\n" for i in range(400)]
+            lines[300] = "7 8.5 1\n"
+            with open(f"{path}/fractional.adj", "w") as f:
+                f.write("".join(lines))
+            start = len("".join(lines[:300]))
+            for workers in (1, 2):
+                with self.assertRaisesRegex(ValueError, f"line 301 \\(byte {start}\\)"):
+                    load_adj(f"{path}/fractional.adj", workers=workers, block_size=256)
+            adj = load_graphml(f"{path}/graph.graphml", weight_key="length")
+        # Isolated node c is kept; parallel a->b edges collapse to the minimum.
+        np.testing.assert_allclose(adj.toarray(), [[0, 3.0, 0], [2.0, 0, 0], [0, 0, 0]])
+
+    def test_benchmark_suite(self):
+        for adj in (geometric_graph(300), barabasi_albert_graph(300), chain_graph(300)):
+            self.assertEqual((adj != adj.T).nnz, 0)
+        records = benchmark_graph(barabasi_albert_graph(500), num_sources=3, warmup=0)
+        self.assertEqual(set(records), {"comes", "numba_dijkstra", "scipy"})
+        self.assertTrue(all(record["valid"] for record in records.values()))
+
+        before = {"graphs": {"g": {"solvers": records}}}
+        slower = {name: dict(record, p50_seconds=record["p50_seconds"] * 2) for name, record in records.items()}
+        rows = diff_runs(before, {"graphs": {"g": {"solvers": slower}}})
+        self.assertTrue(all(row[-1] for row in rows))
+
+    def test_solver_stats(self):
+        # Star with 5000 unit spokes and a chain: one bucket outgrows its 4096 slots.
+        leaves = np.arange(1, 5001)
+        rows = np.concatenate([np.zeros(5000, dtype=np.int64), leaves])
+        cols = np.concatenate([leaves, leaves % 5000 + 1])
+        adj = csr_matrix((np.ones(10000), (rows, cols)), shape=(5001, 5001))
+
+        solver = ComesSolver(adj, frontier_layout="dense", engine="bucket")
+        distances, stats = solver.shortest_path(0, stats=True)
+        np.testing.assert_array_equal(distances, solver.shortest_path(0))
+        self.assertEqual(stats["pops"] - stats["stale_pops"], 5001)
+        self.assertGreaterEqual(stats["relaxations"], 10000)
+        self.assertGreaterEqual(stats["resize_events"], 1)
+        self.assertGreater(stats["resize_bytes_copied"], 0)
+        with self.assertRaises(ValueError):
+            solver.shortest_path(0, target=3, bidirectional=True, stats=True)
+
+    def test_incremental_weight_updates(self):
+        adj = sparse_random(300, 300, density=0.03, random_state=23, format='csr')
+        adj.data += 0.5
+        solver = ComesSolver(adj)
+        trees = [solver.track(source) for source in (0, 7, 150)]
+        coo = adj.tocoo()
+        rng = np.random.default_rng(3)
+        for step in range(10):
+            picked = rng.integers(len(coo.row), size=5)
+            # Alternate heavier batches with ones dropping below the calibrated width.
+            weights = rng.random(5) * 4 + (0.5 if step % 2 else 0.01)
+            solver.update_weights(coo.row[picked], coo.col[picked], weights)
+            expected = dijkstra(adj, indices=[tree.source for tree in trees])
+            for tree, row in zip(trees, expected):
+                np.testing.assert_allclose(tree.distances, row)
+            np.testing.assert_allclose(solver.shortest_path(7), expected[1])
+        with self.assertRaises(ValueError):
+            missing = np.flatnonzero(adj[0].toarray()[0] == 0)[1]
+            solver.update_weights([0], [missing], [1.0])
+
+        # The transpose and the delta engine's light/heavy rows are patched in place.
+        directed = sparse_random(200, 200, density=0.04, random_state=8, format='csr')
+        directed.data += 0.2
+        coo = directed.tocoo()
+        for engine in (None, "delta"):
+            adj = directed.copy()
+            solver = ComesSolver(adj, engine=engine)
+            solver.shortest_path(0, target=5, bidirectional=True)
+            reverse, light_heavy = solver._reverse, solver._light_heavy
+            for step in range(5):
+                picked = rng.integers(len(coo.row), size=4)
+                solver.update_weights(coo.row[picked], coo.col[picked], rng.random(4) * 0.5 + 0.25)
+                expected = dijkstra(adj, indices=[0, 9])
+                np.testing.assert_allclose(solver.shortest_path(0), expected[0])
+                self.assertAlmostEqual(solver.shortest_path(9, target=0, bidirectional=True), expected[1, 0])
+            self.assertIs(solver._reverse, reverse)
+            self.assertIs(solver._light_heavy, light_heavy)
+        # A one-sided update detaches a symmetric graph's shared transpose.
+        grid = grid_graph(12)
+        solver = ComesSolver(grid)
+        solver.shortest_path(0, target=143, bidirectional=True)
+        solver.update_weights([0, 1], [1, 0], [2.5, 2.5])
+        self.assertIs(solver._reverse[2], solver.data)
+        solver.update_weights([12], [13], [9.0])
+        self.assertIsNot(solver._reverse[2], solver.data)
+        self.assertAlmostEqual(solver.shortest_path(143, target=0, bidirectional=True), dijkstra(grid, indices=143)[0])
+
+        # Workspaces from before an engine change are rejected, not misread.
+        integral = grid_graph(10)
+        integral.data = np.round(integral.data * 10) + 1.0
+        solver = ComesSolver(integral)
+        workspace = solver.create_workspace()
+        solver.update_weights([0], [1], [1.5])
+        with self.assertRaises(ValueError):
+            solver.shortest_path(0, workspace=workspace)
+        integral[0, 1] = 1.5
+        np.testing.assert_allclose(solver.shortest_path(0, workspace=solver.create_workspace()),
+                                   dijkstra(integral, indices=0))
+
+    def test_bounded_queries(self):
+        adj = grid_graph(40)
+        expected = dijkstra(adj, indices=0)
+        depots = np.random.default_rng(5).choice(adj.shape[0], size=30, replace=False)
+        nearest = np.sort(expected[depots])
+        for engine in ("heap", "bucket", "radix"):
+            solver = ComesSolver(adj, engine=engine)
+            nodes, dist = solver.shortest_path(0, cutoff=6.0)
+            np.testing.assert_array_equal(np.sort(nodes), np.flatnonzero(expected <= 6.0))
+            np.testing.assert_allclose(dist, np.sort(expected[expected <= 6.0]))
+            nodes, dist = solver.shortest_path(0, targets=depots, k=4)
+            self.assertTrue(np.isin(nodes, depots).all())
+            np.testing.assert_allclose(dist, nearest[:4])
+            np.testing.assert_allclose(expected[nodes], dist)
+            _, dist = solver.shortest_path(0, targets=depots, k=4, cutoff=nearest[1])
+            np.testing.assert_allclose(dist, nearest[:2])
+            # The sparse reset must clear the target flags.
+            np.testing.assert_allclose(solver.shortest_path(0), expected)
+            # The bound check seeks the frontier floor; its scans must be counted.
+            (nodes, _), counters = solver.shortest_path(0, cutoff=6.0, stats=True)
+            self.assertEqual(counters["pops"] - counters["stale_pops"], len(nodes))
+            if engine != "heap":
+                self.assertGreater(counters["empty_buckets_scanned"], 0)
+        with self.assertRaises(ValueError):
+            solver.shortest_path(0, target=3, cutoff=1.0)
+
+    def test_integer_dial_engine(self):
+        adj = grid_graph(30)
+        adj.data = np.ceil(adj.data * 20) * 3
+        solver = ComesSolver(adj)
+        self.assertEqual(solver.engine, "dial")
+        self.assertEqual(solver.params["weight_gcd"] % 3, 0)
+        expected = dijkstra(adj, indices=[0, 17])
+        np.testing.assert_array_equal(solver.shortest_path(0), expected[0])
+        np.testing.assert_array_equal(solver.shortest_paths([0, 17]), expected)
+        self.assertEqual(solver.shortest_path(0, target=899, bidirectional=True), expected[0, 899])
+        nodes, dist = solver.shortest_path(0, cutoff=expected[0, 40])
+        np.testing.assert_array_equal(np.sort(nodes), np.flatnonzero(expected[0] <= expected[0, 40]))
+        # A fractional weight leaves the integer domain and falls back to float buckets.
+        solver.update_weights([0], [1], [2.5])
+        adj[0, 1] = 2.5
+        np.testing.assert_allclose(solver.shortest_path(0), dijkstra(adj, indices=0))
+        self.assertEqual(solver.engine, "bucket")
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, engine="dial")
+
+        # Two directed 3-cycles: the backward search's integer sentinel never meets.
+        cycles = csr_matrix(([2.0, 4.0, 6.0, 2.0, 4.0, 6.0], ([0, 1, 2, 3, 4, 5], [1, 2, 0, 4, 5, 3])), shape=(6, 6))
+        split = ComesSolver(cycles, engine="dial")
+        self.assertEqual(split.shortest_path(0, target=4, bidirectional=True), np.inf)
+        self.assertEqual(split.shortest_path(0, target=2, bidirectional=True), 6.0)
+        split.update_weights([3], [4], [8.0])
+        self.assertEqual(split.shortest_path(0, target=4, bidirectional=True), np.inf)
+
+    def test_locality_reordering(self):
+        coordinates = np.column_stack(np.divmod(np.arange(900), 30)).astype(np.float64)
+        adj, coordinates = shuffled(grid_graph(30), coordinates, seed=4)
+        expected = dijkstra(adj, indices=[11, 500])
+        for method in ("rcm", "degree", "hilbert"):
+            solver = ComesSolver(adj, reorder=method, coordinates=coordinates)
+            self.assertEqual(sorted(solver.permutation), list(range(900)))
+            np.testing.assert_allclose(solver.shortest_path(11), expected[0])
+            self.assertAlmostEqual(solver.shortest_path(11, target=500), expected[0, 500])
+            np.testing.assert_allclose(solver.shortest_paths([11, 500]), expected)
+            nodes, dist = solver.shortest_path(11, cutoff=4.0)
+            np.testing.assert_allclose(expected[0, nodes], dist)
+            np.testing.assert_allclose(solver.track(500).distances, expected[1])
+        with self.assertRaises(ValueError):
+            ComesSolver(adj, reorder="hilbert")
+
+    def test_warmup_and_graph_file(self):
+        adj = geometric_graph(2000, seed=5)
+        expected = dijkstra(adj, indices=[3, 40])
+        with tempfile.TemporaryDirectory() as tmp:
+            save_graph(f"{tmp}/g.comes", adj)
+            graph = load_graph(f"{tmp}/g.comes")
+            solver = ComesSolver()
+            solver.set_graph(graph, params=graph.params, pivots=graph.pivots)
+            solver.warmup(batch=True)
+            np.testing.assert_allclose(solver.shortest_path(3), expected[0])
+            self.assertAlmostEqual(solver.shortest_path(3, target=40), expected[0, 40])
+            np.testing.assert_allclose(solver.shortest_paths([3, 40]), expected)
+            del solver, graph
+        ComesSolver().warmup()
+
+    def test_shared_memory_server(self):
+        adj = grid_graph(20)
+        adj.data = np.round(adj.data * 10) + 1.0
+        expected = dijkstra(adj, indices=[0, 7])
+        shared = SharedGraph.create(adj)
+        attached = SharedGraph.attach(shared.handle)
+        solver = attached.solver()
+        self.assertEqual(solver.engine, "dial")
+        self.assertTrue(np.shares_memory(solver._dial[2], attached.compact[2]))
+        np.testing.assert_allclose(solver.shortest_path(7), expected[1])
+        del solver
+        attached.close()
+        shared.close()
+
+        async def queries(server):
+            rows = await server.shortest_paths([0, 7, 0])
+            dists = await asyncio.gather(*(server.shortest_path(7, target=t) for t in range(40)))
+            return rows, dists
+
+        with QueryServer(adj, num_workers=2, max_batch=8) as server:
+            rows, dists = asyncio.run(queries(server))
+            np.testing.assert_allclose(rows, expected[[0, 1, 0]])
+            np.testing.assert_allclose(dists, expected[1, :40])
+            self.assertEqual(server.requests, 43)
+            self.assertLess(server.batches, 43)
+            with self.assertRaises(IndexError):
+                server.submit(400)
+
+    def test_concurrent_queries(self):
+        from concurrent.futures import ThreadPoolExecutor
+        for adj in (geometric_graph(3000, seed=2), chain_graph(3000)):
+            solver = ComesSolver(adj, query_threads=4)
+            sources = list(range(0, 3000, 150))
+            expected = dijkstra(adj, indices=sources)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                rows = list(pool.map(solver.shortest_path, sources))
+                dists = list(pool.map(lambda s: solver.shortest_path(s, target=2999), sources))
+                barrier = threading.Barrier(4)
+
+                def workspace_id(_):
+                    barrier.wait()  # four threads at once, each with its own default workspace
+                    return id(solver._default_workspace())
+                workspaces = set(pool.map(workspace_id, range(4)))
+            np.testing.assert_allclose(rows, expected)
+            np.testing.assert_allclose(dists, expected[:, 2999])
+            self.assertEqual(len(workspaces), 4)
+
+            async def queries():
+                return await asyncio.gather(*(solver.ashortest_path(s, target=2999) for s in sources))
+            np.testing.assert_allclose(asyncio.run(queries()), expected[:, 2999])
+            solver.close()
+
+        # An update that switches engines is fully applied before the next query.
+        adj = grid_graph(20)
+        adj.data = np.round(adj.data * 10) + 1.0
+        solver = ComesSolver(adj)
+        self.assertEqual(solver.engine, "dial")
+        solver.update_weights([0], [1], [2.5])
+        adj[0, 1] = 2.5
+        self.assertEqual(solver.engine, "bucket")
+        self.assertIsNone(solver._dial)
+        sources = list(range(0, 400, 25))
+        expected = dijkstra(adj, indices=sources)
+        barrier = threading.Barrier(4)
+
+        def query(i):
+            barrier.wait()
+            if i % 2:
+                return solver.shortest_paths([sources[i]])[0]
+            return solver.shortest_path(sources[i])
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            rows = list(pool.map(query, range(len(sources))))
+        np.testing.assert_allclose(rows, expected)
+        # Updates inside the calibrated range keep every thread's workspace.
+        workspace = solver._default_workspace()
+        solver.update_weights([0], [1], [3.5])
+        adj[0, 1] = 3.5
+        self.assertIs(solver._default_workspace(), workspace)
+        np.testing.assert_allclose(solver.shortest_path(0), dijkstra(adj, indices=0))
+
+    def test_predecessors_and_routes(self):
+        sparse = sparse_random(200, 200, density=0.02, random_state=23, format='csr')
+        sparse.data += 0.1
+        integral = grid_graph(15)
+        integral.data = np.round(integral.data * 10) + 1.0
+        cases = [
+            (ComesSolver(sparse), sparse),
+            (ComesSolver(geometric_graph(1500, seed=3)), geometric_graph(1500, seed=3)),
+            (ComesSolver(integral), integral),
+            (ComesSolver(integral, reorder="rcm"), integral),
+        ]
+        for solver, adj in cases:
+            n = adj.shape[0]
+            expected = dijkstra(adj, indices=5)
+            dist, pred = solver.shortest_path(5, predecessors=True)
+            np.testing.assert_allclose(dist, expected)
+            reached = np.flatnonzero(np.isfinite(expected) & (np.arange(n) != 5))
+            self.assertEqual(pred[5], -1)
+            self.assertTrue(np.all(pred[np.isinf(expected)] == -1))
+            np.testing.assert_allclose(expected[pred[reached]] + np.asarray(adj[pred[reached], reached]).ravel(),
+                                       expected[reached])
+
+            targets = np.array([n - 1, 5, 7, n - 1, 40])
+            distances, offsets, nodes, edges = solver.routes(5, targets)
+            np.testing.assert_allclose(distances, expected[targets])
+            for i, target in enumerate(targets):
+                path, path_edges = nodes[offsets[i]:offsets[i + 1]], edges[offsets[i]:offsets[i + 1]]
+                if np.isinf(expected[target]):
+                    self.assertEqual(len(path), 0)
+                    continue
+                self.assertEqual((path[0], path[-1], path_edges[0]), (5, target, -1))
+                self.assertAlmostEqual(solver.data[path_edges[1:]].sum(), expected[target])
+            distance, path = solver.route(5, 40)
+            self.assertAlmostEqual(distance, expected[40])
+            if np.isinf(distance):
+                self.assertIsNone(path)
+        with self.assertRaises(ValueError):
+            cases[0][0].shortest_path(5, target=7, predecessors=True)
+
+    def test_networkx_backend(self):
+        G = nx.grid_2d_graph(12, 12)
+        rng = np.random.default_rng(29)
+        for u, v in G.edges:
+            G[u][v]["length"] = float(rng.integers(1, 9))
+        G.add_node("island")
+        graph = BackendInterface.convert_from_nx(G, edge_attrs={"length": 1})
+        self.assertIs(BackendInterface.convert_from_nx(G, edge_attrs={"length": 1}), graph)
+
+        expected = nx.single_source_dijkstra_path_length(G, (0, 0), weight="length")
+        lengths = BackendInterface.single_source_dijkstra_path_length(graph, (0, 0), weight="length")
+        self.assertEqual(list(lengths), sorted(lengths, key=lengths.get))
+        self.assertEqual(lengths.keys(), expected.keys())
+        for node, length in expected.items():
+            self.assertAlmostEqual(lengths[node], length)
+        lengths, paths = BackendInterface.single_source_dijkstra(graph, (0, 0), cutoff=12, weight="length")
+        self.assertEqual(lengths.keys(), {node for node, length in expected.items() if length <= 12})
+        for node, path in paths.items():
+            self.assertEqual((path[0], path[-1]), ((0, 0), node))
+            self.assertAlmostEqual(nx.path_weight(G, path, "length"), lengths[node])
+        with self.assertRaises(nx.NetworkXNoPath):
+            BackendInterface.dijkstra_path(graph, (0, 0), "island")
+        with self.assertRaises(nx.NodeNotFound):
+            BackendInterface.dijkstra_path_length(graph, "nowhere", (0, 0))
+        self.assertNotEqual(BackendInterface.can_run("single_source_dijkstra_path_length", (G, 0),
+                                                     {"weight": lambda u, v, d: 1}), True)
+        self.assertNotEqual(BackendInterface.can_run("shortest_path_length", (G, 0), {}), True)
+        # Lengths follow the attribute types: float weights of integral value stay floats.
+        self.assertIsInstance(BackendInterface.dijkstra_path_length(graph, (0, 0), (5, 5), weight="length"), float)
+        H = G.copy()
+        for u, v in H.edges:
+            H[u][v]["length"] = int(H[u][v]["length"])
+        ints = BackendInterface.convert_from_nx(H, edge_attrs={"length": 1})
+        self.assertIsInstance(BackendInterface.dijkstra_path_length(ints, (0, 0), (5, 5), weight="length"), int)
+        # In-place edge data edits bypass NetworkX's cache clearing; the caller clears it.
+        G[(0, 0)][(0, 1)]["length"] = 0.5
+        self.assertIs(BackendInterface.convert_from_nx(G, edge_attrs={"length": 1}), graph)
+        G.__networkx_cache__.clear()
+        edited = BackendInterface.convert_from_nx(G, edge_attrs={"length": 1})
+        self.assertIsNot(edited, graph)
+        self.assertEqual(BackendInterface.dijkstra_path_length(edited, (0, 0), (0, 1), weight="length"), 0.5)
+        G.add_edge((0, 0), "island", length=2.0)
+        self.assertIsNot(BackendInterface.convert_from_nx(G, edge_attrs={"length": 1}), edited)
+
+        # End to end through the entry points declared in pyproject.toml.
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(root, "pyproject.toml"), "rb") as f:
+            entry_points = tomllib.load(f)["project"]["entry-points"]
+        with tempfile.TemporaryDirectory() as tmp:
+            info = os.path.join(tmp, "comes_path-0.0.0.dist-info")
+            os.mkdir(info)
+            with open(os.path.join(info, "METADATA"), "w") as f:
+                f.write("Metadata-Version: 2.1\nName: comes-path\nVersion: 0.0.0\n")
+            with open(os.path.join(info, "entry_points.txt"), "w") as f:
+                for group, entries in entry_points.items():
+                    f.write(f"[{group}]\n" + "".join(f"{k} = {v}\n" for k, v in entries.items()))
+            script = (
+                "import networkx as nx\n"
+                "nx.config.backend_priority = ['comes']\n"
+                "print(repr(nx.single_source_dijkstra_path_length(nx.path_graph(4), 0)))\n"
+            )
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, tmp]))
+            out = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "{0: 0, 1: 1, 2: 2, 3: 3}")
+
+    def test_engine_autotune(self):
+        adj = geometric_graph(1500, seed=31)
+        expected = dijkstra(adj, indices=[2, 9])
+        solver = ComesSolver(adj, autotune=True)
+        self.assertTrue(solver.params["tuned"])
+        self.assertEqual(solver.engine, solver.params["engine"])
+        np.testing.assert_allclose(solver.shortest_paths([2, 9]), expected)
+        self.assertAlmostEqual(solver.shortest_path(2, target=9), expected[0, 9])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            save_graph(f"{tmp}/g.comes", adj, autotune=True)
+            graph = load_graph(f"{tmp}/g.comes")
+            self.assertTrue(graph.params["tuned"])
+            # A stored decision is adopted as is, straight from the loaded archive.
+            with mock.patch("comes_path.core.autotune.autotune_engine", side_effect=AssertionError):
+                loaded = ComesSolver(graph, autotune=True)
+            self.assertEqual(loaded.engine, graph.params["engine"])
+            self.assertIs(loaded.params, graph.params)
+            np.testing.assert_allclose(loaded.shortest_path(9), expected[1])
+            del loaded, graph
+
+        # Heap decisions and reordered graphs keep exact distances.
+        grid = grid_graph(15)
+        params = dict(solver.params, engine="heap")
+        heap = ComesSolver()
+        heap.set_graph(grid, params=params)
+        self.assertTrue(heap.is_sparse_fallback)
+        np.testing.assert_allclose(heap.shortest_path(0), dijkstra(grid, indices=0))
+        reordered = ComesSolver(grid, reorder="rcm", autotune=True)
+        np.testing.assert_allclose(reordered.shortest_path(7), dijkstra(grid, indices=7))
+
+        # Leaving the tuned range reselects the untuned engine and pivots.
+        tuned = dict(solver.params, engine="bucket", pivot_threshold=float(np.diff(adj.indptr).max() + 1))
+        solver = ComesSolver()
+        solver.set_graph(adj, params=tuned)
+        self.assertFalse(solver.pivots.any())
+        heavy = adj.data.max() * 1e6
+        solver.update_weights([2], [adj.indices[adj.indptr[2]]], [heavy])
+        adj.data[adj.indptr[2]] = heavy
+        self.assertNotIn("tuned", solver.params)
+        self.assertEqual(solver.engine, solver.params["engine"])
+        np.testing.assert_array_equal(solver.pivots, identify_pivots(adj.indptr))
+        np.testing.assert_allclose(solver.shortest_path(2), dijkstra(adj, indices=2))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file